@@ -2,18 +2,25 @@
 from flask import Flask, jsonify, request, Response
 from flask_cors import CORS
 from datetime import datetime
+import atexit
 import logging
 import os
 from dotenv import load_dotenv
 
 # Import the new modular scrapers
 from scrapers import ScraperManager, ScraperError, ValidationError
+from scrapers.skinsearch_scraper import summarize_market_prices
+from scrapers.price_cache import quote_cache, negative_cache, skinsnipe_cache
+from scrapers.browser_pool import browser_pool
+from scrapers.wait_engine import get_wait_stats
 
 # Import MongoDB database models
-from database import mongodb, card_model, steam_item_model, financial_asset_model
+from database import mongodb, card_model, steam_item_model, steam_snapshot_model, financial_asset_model
 
 # Import yfinance service
 from yfinance_service import yfinance_service
+from single_flight import get_single_flight_stats
+from resilience import get_upstream_status
 
 # Import authentication system
 from auth import user_model, auth_required, JWTManager
@@ -70,6 +77,11 @@ api_keys = {
 }
 scraper_manager = ScraperManager(api_keys=api_keys)
 
+# Shared Chrome pool for all Selenium scrapers; browsers are only started ahead of
+# the first scrape when BROWSER_POOL_WARM is set, and never block startup
+browser_pool.warm_up_async()
+atexit.register(browser_pool.shutdown)
+
 # Helper function to check MongoDB availability
 def mongodb_required():
     if card_model is None:
@@ -96,7 +108,11 @@ def get_scrapers_status():
             'status': 'success',
             'scrapers': status,
             'supported_assets': supported_assets,
-            'config_issues': config_issues
+            'config_issues': config_issues,
+            'request_coalescing': get_single_flight_stats(),
+            'upstreams': get_upstream_status(),
+            'browser_pool': browser_pool.get_stats(),
+            'waits': get_wait_stats()
         })
     except Exception as e:
         logger.error(f"Error getting scraper status: {e}")
@@ -1156,7 +1172,83 @@ def scrape_steam_inventory():
         
         # Get user ID
         user_id = request.current_user['user_id']
+        # refresh=True bypasses the on-disk inventory cache
+        use_cache = not data.get('refresh', False)
+        
+        # Skip classification and database work when the cached inventory matches the last import
+        steam_scraper = scraper_manager.get_scraper('steam')
+        normalized_id = steam_scraper._extract_steam_id_from_url(steam_id)
+        cached = steam_scraper.cached_inventory(normalized_id, app_id) if use_cache else None
+        if cached and steam_snapshot_model is not None and \
+                cached['content_hash'] == steam_snapshot_model.get_content_hash(user_id, normalized_id):
+            logger.info(f"Steam inventory {normalized_id} unchanged since last import, nothing to do")
+            return jsonify({
+                'status': 'success',
+                'message': 'Steam inventory unchanged since last import',
+                'data': {
+                    'scraped_items': [],
+                    'skipped_items': [],
+                    'failed_items': [],
+                    'total_scraped': 0,
+                    'total_skipped': len(cached['assets']),
+                    'total_failed': 0,
+                    'unchanged': True
+                }
+            })
         
+        # Save scraped items to MongoDB using steam_item_model
+        scraped_items = []
+        skipped_items = []
+        failed_items = []
+
+        def save_batch(batch):
+            """Persist a batch of processed items while later inventory pages are still downloading"""
+            # Prepare item data for MongoDB
+            batch_data = [{
+                'user_id': item_info.get('user_id', user_id),  # Use scraper's user_id or fallback to request user_id
+                'name': item_info['name'],
+                'rarity': item_info.get('rarity', 'Unknown'),
+                'condition': item_info.get('condition'),
+                'float_value': item_info.get('float_value'),
+                'paint_seed': item_info.get('paint_seed'),
+                'inspect_link': item_info.get('inspect_link'),
+                'current_price': 0.0,  # No pricing
+                'price_bought': 0.0,  # To be set by user later
+                'quantity': item_info.get('quantity', 1),
+                'game': item_info.get('game', 'Counter-Strike 2'),
+                'asset_id': item_info.get('asset_id'),
+                'classid': item_info.get('classid'),
+                'instanceid': item_info.get('instanceid'),
+                'image_url': item_info.get('image_url', ''),
+                'market_hash_name': item_info.get('market_hash_name', ''),
+                'item_category': item_info.get('item_category', 'unknown'),
+                'item_type': item_info.get('item_type', ''),
+                'steam_id': steam_id
+            } for item_info in batch]
+            
+            try:
+                # One unordered bulk upsert per batch; existing asset_ids are skipped by the unique index
+                result = steam_item_model.bulk_import_items(user_id, batch_data)
+            except Exception as e:
+                logger.error(f"Failed to save batch of {len(batch_data)} Steam items: {e}")
+                failed_items.extend({'name': item['name'], 'asset_id': item['asset_id'], 'error': str(e)}
+                                    for item in batch_data)
+                return
+            
+            scraped_items.extend(result['inserted'])
+            skipped_items.extend({
+                'name': item['name'],
+                'asset_id': item['asset_id'],
+                'message': 'Already exists in Steam inventory'
+            } for item in result['skipped'])
+            failed_items.extend({
+                'name': entry['item']['name'],
+                'asset_id': entry['item']['asset_id'],
+                'error': entry['error']
+            } for entry in result['failed'])
+            logger.info(f"Saved Steam batch: {result['inserted_count']} added, "
+                        f"{result['skipped_count']} skipped, {result['failed_count']} failed")
+
         # Call the scraper without pricing options, but with user_id for proper association
         scraped_items_data = scraper_manager.scrape_assets(
             'steam', 
@@ -1164,70 +1256,16 @@ def scrape_steam_inventory():
             app_id=app_id, 
             include_floats=include_floats,
             headless=headless,
-            user_id=user_id  # Pass user_id to scraper for proper association
+            user_id=user_id,  # Pass user_id to scraper for proper association
+            on_batch=save_batch,
+            use_cache=use_cache
         )
+        logger.info(f"Processed {len(scraped_items_data)} scraped items for user {user_id}")
         
-        # Save scraped items to MongoDB using steam_item_model
-        scraped_items = []
-        skipped_items = []
-        failed_items = []
-        
-        logger.info(f"Processing {len(scraped_items_data)} scraped items for user {user_id}")
-        
-        for i, item_info in enumerate(scraped_items_data):
-            try:
-                asset_id = item_info.get('asset_id')
-                item_name = item_info.get('name', '')
-                item_category = item_info.get('item_category', 'unknown')
-                
-                logger.info(f"Processing item {i+1}/{len(scraped_items_data)}: {item_name} ({item_category})")
-                
-                # Check if item already exists using asset_id
-                existing_item = steam_item_model.find_existing_item(user_id, asset_id)
-                
-                if existing_item:
-                    # Skip existing items
-                    skipped_items.append({
-                        'name': item_name,
-                        'asset_id': asset_id,
-                        'message': 'Already exists in Steam inventory'
-                    })
-                    logger.info(f"Skipping Steam item - already exists: {item_name}")
-                    continue
-            
-                # Prepare item data for MongoDB
-                item_data = {
-                    'user_id': item_info.get('user_id', user_id),  # Use scraper's user_id or fallback to request user_id
-                    'name': item_info['name'],
-                    'rarity': item_info.get('rarity', 'Unknown'),
-                    'condition': item_info.get('condition'),
-                    'float_value': item_info.get('float_value'),
-                    'current_price': 0.0,  # No pricing
-                    'price_bought': 0.0,  # To be set by user later
-                    'quantity': item_info.get('quantity', 1),
-                    'game': item_info.get('game', 'Counter-Strike 2'),
-                    'asset_id': asset_id,
-                    'image_url': item_info.get('image_url', ''),
-                    'market_hash_name': item_info.get('market_hash_name', ''),
-                    'item_category': item_info.get('item_category', 'unknown'),
-                    'item_type': item_info.get('item_type', ''),
-                    'steam_id': steam_id
-                }
-                
-                # Create Steam item
-                created_item = steam_item_model.create_item(item_data)
-                scraped_items.append(created_item)
-                
-                logger.info(f"Successfully added Steam item: {item_name} ({item_category})")
-                
-            except Exception as e:
-                logger.error(f"Failed to save Steam item {item_name}: {e}")
-                failed_items.append({
-                    'name': item_name,
-                    'asset_id': asset_id,
-                    'error': str(e)
-                })
-                continue
+        # Record what was imported so an unchanged inventory can be skipped next time
+        imported = steam_scraper.cached_inventory(normalized_id, app_id)
+        if imported and steam_snapshot_model is not None and not failed_items:
+            steam_snapshot_model.save_snapshot(user_id, normalized_id, app_id, imported['assets'], imported['content_hash'])
         
         # Prepare response message
         message = f"Successfully scraped {len(scraped_items)} new CS2 items from Steam inventory"
@@ -1327,6 +1365,31 @@ def update_steam_item(item_id):
         return jsonify({'status': 'error', 'message': 'Failed to update Steam item'}), 500
 
 
+@app.route('/api/steam/items/<item_id>/market-prices', methods=['GET'])
+@auth_required
+def get_steam_item_market_prices(item_id):
+    """Get the stored per-market price vector of a Steam item with cheapest and median market"""
+    try:
+        user_id = request.current_user['user_id']
+        
+        item = steam_item_model.get_item(item_id, user_id)
+        if not item:
+            return jsonify({'status': 'error', 'message': 'Steam item not found'}), 404
+        
+        market_prices = item.get('market_prices') or {}
+        
+        return jsonify({
+            'status': 'success',
+            'name': item.get('name'),
+            'market_prices': market_prices,
+            **summarize_market_prices(market_prices)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting Steam item market prices: {e}")
+        return jsonify({'status': 'error', 'message': 'Failed to get market prices'}), 500
+
+
 @app.route('/api/steam/items/<item_id>', methods=['DELETE'])
 @auth_required
 def delete_steam_item(item_id):
@@ -1337,6 +1400,9 @@ def delete_steam_item(item_id):
         success = steam_item_model.delete_item(item_id, user_id)
         
         if success:
+            # The next import must restore the item instead of reporting "unchanged"
+            if steam_snapshot_model is not None:
+                steam_snapshot_model.invalidate(user_id)
             return jsonify({
                 'status': 'success',
                 'message': 'Steam item deleted successfully'
@@ -1364,6 +1430,8 @@ def delete_all_steam_items():
         
         # Delete all Steam items for the default user
         deleted_count = steam_item_model.delete_all_items(user_id)
+        if steam_snapshot_model is not None:
+            steam_snapshot_model.invalidate(user_id)
         
         logger.info(f"Deleted all {deleted_count} Steam items for user '{user_id}'")
         
@@ -1410,7 +1478,7 @@ def get_steam_stats():
 @app.route('/api/steam/rescrape', methods=['POST'])
 @auth_required
 def rescrape_steam_inventory():
-    """Rescrape Steam inventory: add new items, remove sold items, skip existing."""
+    """Rescrape Steam inventory incrementally: add new items, refresh changed ones, remove sold items."""
     try:
         data = request.get_json()
         steam_id = data.get('steam_id')
@@ -1418,72 +1486,134 @@ def rescrape_steam_inventory():
             return jsonify({'status': 'error', 'message': 'Missing steam_id'}), 400
 
         user_id = request.current_user['user_id']
+        app_id = data.get('app_id', '730')
+        # full=True reclassifies every asset instead of trusting the stored description hashes
+        full = data.get('full', False)
+
+        scraper = scraper_manager.get_scraper('steam')
+        normalized_id = scraper._extract_steam_id_from_url(steam_id)
+        # refresh=True bypasses the on-disk inventory cache
+        use_cache = not data.get('refresh', False)
+
+        # A fresh cached inventory identical to the last sync means there is nothing to do
+        cached = scraper.cached_inventory(normalized_id, app_id) if use_cache and not full else None
+        if cached and steam_snapshot_model is not None and \
+                cached['content_hash'] == steam_snapshot_model.get_content_hash(user_id, normalized_id):
+            skipped = len(cached['assets'])
+            return jsonify({
+                'status': 'success',
+                'message': f'Rescrape complete. Inventory unchanged since last sync. Skipped: {skipped}',
+                'items': [],
+                'added': 0,
+                'updated': 0,
+                'removed': 0,
+                'skipped': skipped,
+                'failed': 0,
+                'unchanged': True
+            })
 
-        # Scrape current inventory (returns list of dicts)
-        scraped_items_data = scraper_manager.scrape_assets(
-            'steam',
-            steam_id=steam_id,
+        # Stored items decide what exists; the snapshot only tells which descriptions are unchanged
+        snapshot = {} if full or steam_snapshot_model is None else steam_snapshot_model.get_snapshot(user_id, normalized_id)
+        known_assets = {asset_id: ('' if full else snapshot.get(asset_id))
+                        for asset_id in steam_item_model.get_asset_ids(user_id)}
+
+        sync = scraper.sync_inventory(
+            normalized_id,
+            known_assets,
+            app_id=app_id,
+            include_floats=data.get('include_floats', False),
+            include_prices=data.get('include_prices', False),
             user_id=user_id,
-            headless=True
+            use_cache=use_cache
         )
 
-        # Get current items from DB
-        db_items = steam_item_model.get_items_by_user(user_id)
-        db_ids = {str(item.get('asset_id')) for item in db_items}
-        scraped_ids = {str(item.get('asset_id')) for item in scraped_items_data}
-
-        # Add new items
-        added = 0
-        for item in scraped_items_data:
-            if str(item.get('asset_id')) not in db_ids:
-                try:
-                    # Prepare item data for DB
-                    item_data = {
-                        'user_id': user_id,
-                        'name': item.get('name', ''),
-                        'rarity': item.get('rarity', 'Unknown'),
-                        'condition': item.get('condition'),
-                        'float_value': item.get('float_value'),
-                        'current_price': 0.0,
-                        'price_bought': 0.0,
-                        'quantity': item.get('quantity', 1),
-                        'game': item.get('game', 'Counter-Strike 2'),
-                        'asset_id': item.get('asset_id'),
-                        'image_url': item.get('image_url', ''),
-                        'market_hash_name': item.get('market_hash_name', ''),
-                        'item_category': item.get('item_category', 'unknown'),
-                        'item_type': item.get('item_type', ''),
-                        'steam_id': steam_id
-                    }
-                    steam_item_model.create_item(item_data)
-                    added += 1
-                except Exception as e:
-                    logger.error(f"Failed to add Steam item: {item.get('name', '')}: {e}")
-
-        # Remove sold items
-        removed = 0
-        for item in db_items:
-            if str(item.get('asset_id')) not in scraped_ids:
-                try:
-                    steam_item_model.delete_item(item['_id'], user_id)
-                    removed += 1
-                except Exception as e:
-                    logger.error(f"Failed to remove Steam item: {item.get('name', '')}: {e}")
-
-        skipped = len(scraped_items_data) - added
+        description_fields = ('name', 'rarity', 'condition', 'image_url', 'market_hash_name',
+                              'item_category', 'item_type', 'classid', 'instanceid', 'inspect_link')
+        added_items = [{
+            'name': item.get('name', ''),
+            'rarity': item.get('rarity', 'Unknown'),
+            'condition': item.get('condition'),
+            'float_value': item.get('float_value'),
+            'paint_seed': item.get('paint_seed'),
+            'inspect_link': item.get('inspect_link'),
+            'current_price': item.get('current_price', 0.0),
+            'price_bought': 0.0,
+            'quantity': item.get('quantity', 1),
+            'game': item.get('game', 'Counter-Strike 2'),
+            'asset_id': item.get('asset_id'),
+            'classid': item.get('classid'),
+            'instanceid': item.get('instanceid'),
+            'image_url': item.get('image_url', ''),
+            'market_hash_name': item.get('market_hash_name', ''),
+            'item_category': item.get('item_category', 'unknown'),
+            'item_type': item.get('item_type', ''),
+            'steam_id': steam_id,
+            **({'price_source': item['price_source'], 'market_prices': item['market_prices']}
+               if item.get('price_source') else {})
+        } for item in sync['added']]
+        changed_items = [{'asset_id': item.get('asset_id'), **{field: item.get(field) for field in description_fields}}
+                         for item in sync['changed']]
+
+        # Additions, refreshes and removals go to MongoDB in one bulk write
+        written = steam_item_model.apply_inventory_diff(user_id, added_items, changed_items, sync['removed'])
+        if steam_snapshot_model is not None:
+            steam_snapshot_model.save_snapshot(user_id, sync['steam_id'], app_id, sync['assets'], sync['content_hash'])
+
+        added = written['inserted']
+        removed = written['removed']
+        skipped = sync['unchanged']
 
         return jsonify({
             'status': 'success',
             'message': f'Rescrape complete. Added: {added}, Removed: {removed}, Skipped: {skipped}',
-            'items': scraped_items_data,
+            'items': sync['added'] + sync['changed'],
             'added': added,
+            'updated': written['updated'],
             'removed': removed,
-            'skipped': skipped
+            'skipped': skipped,
+            'failed': written['errors']
         })
     except Exception as e:
         logger.error(f"Error during Steam inventory rescrape: {e}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+# Price cache admin routes
+@app.route('/api/admin/negative-cache', methods=['GET'])
+@auth_required
+def get_negative_cache():
+    """Get items that recently returned no price and when they will be re-checked (admin endpoint)"""
+    try:
+        try:
+            limit = int(request.args.get('limit', 500))
+        except ValueError:
+            return jsonify({'status': 'error', 'message': 'limit must be an integer'}), 400
+        return jsonify({
+            'status': 'success',
+            'stats': negative_cache.stats(),
+            'quote_cache': quote_cache.stats(),
+            'skinsnipe_cache': skinsnipe_cache.stats(),
+            'entries': negative_cache.snapshot(limit=limit)
+        })
+    except Exception as e:
+        logger.error(f"Error getting negative cache: {e}")
+        return jsonify({'status': 'error', 'message': 'Failed to get negative cache'}), 500
+
+@app.route('/api/admin/negative-cache', methods=['DELETE'])
+@auth_required
+def clear_negative_cache():
+    """Clear the negative cache so every item is re-checked on the next refresh (admin endpoint)"""
+    try:
+        cleared = negative_cache.stats()['entries']
+        negative_cache.clear()
+        return jsonify({
+            'status': 'success',
+            'message': f'Cleared {cleared} negative cache entries',
+            'cleared': cleared
+        })
+    except Exception as e:
+        logger.error(f"Error clearing negative cache: {e}")
+        return jsonify({'status': 'error', 'message': 'Failed to clear negative cache'}), 500
+
 # Authentication Routes
 @app.route('/api/auth/register', methods=['POST'])
 def register():
@@ -1681,7 +1811,7 @@ def get_all_users():
 @app.route('/api/steam/update-floats', methods=['POST'])
 @auth_required
 def update_steam_floats():
-    """Update Steam item float values and paint seeds using CSFloat"""
+    """Update Steam item float values and paint seeds through the configured float resolver"""
     try:
         user_id = request.current_user['user_id']
         items = steam_item_model.get_items_by_user(user_id)
@@ -1698,57 +1828,50 @@ def update_steam_floats():
         failed_items = []
         skipped_items = []
         
-        # Import CSFloat scraper
-        try:
-            from scrapers.csfloat_scraper import CSFloatScraper
-            csfloat_scraper = CSFloatScraper(headless=True)
-        except ImportError:
-            return jsonify({
-                'status': 'error',
-                'message': 'CSFloat scraper not available'
-            }), 503
+        from scrapers.float_resolver import get_float_resolver
+        resolver = get_float_resolver(headless=True)
         
         try:
-            for i, item in enumerate(items):
+            # First pass: find the items that can be resolved
+            pending = []
+            for item in items:
+                item_name = item.get('name', 'Unknown')
+                
+                # Skip items that already have float data
+                if item.get('float_value') is not None:
+                    skipped_items.append({
+                        'name': item_name,
+                        'reason': 'Already has float data'
+                    })
+                    continue
+                
+                if item.get('item_category', '').lower() not in ['weapon', 'knife', 'glove', 'gloves']:
+                    skipped_items.append({
+                        'name': item_name,
+                        'reason': 'Item type does not support float values'
+                    })
+                    continue
+                
+                # Inspect links are stored when the inventory is scraped
+                inspect_link = item.get('inspect_link')
+                if not inspect_link:
+                    skipped_items.append({
+                        'name': item_name,
+                        'reason': 'No inspect link available'
+                    })
+                    continue
+                
+                pending.append((item, inspect_link))
+            
+            # Resolve all links in one batched call
+            logger.info(f"Resolving floats for {len(pending)} items via {resolver.name} backend")
+            results = resolver.resolve_many(link for _, link in pending) if pending else {}
+            
+            for item, inspect_link in pending:
                 try:
                     item_id = str(item['_id'])
                     item_name = item.get('name', 'Unknown')
-                    
-                    logger.info(f"Processing item {i+1}/{len(items)}: {item_name}")
-                    
-                    # Check if item has inspect link (only items with inspect links can have floats)
-                    # For now, we'll simulate this check - in real implementation, 
-                    # you'd need the inspect link from Steam inventory data
-                    
-                    # Skip items that already have float data
-                    if item.get('float_value') is not None:
-                        skipped_items.append({
-                            'name': item_name,
-                            'reason': 'Already has float data'
-                        })
-                        continue
-                    
-                    # For demo purposes, we'll skip items without weapon category
-                    # In real implementation, you'd use the inspect link
-                    if item.get('item_category', '').lower() not in ['weapon', 'knife', 'glove']:
-                        skipped_items.append({
-                            'name': item_name,
-                            'reason': 'Item type does not support float values'
-                        })
-                        continue
-                    
-                    # TODO: Get actual inspect link from Steam inventory data
-                    # For now, we'll simulate with a placeholder
-                    inspect_link = item.get('inspect_link')
-                    if not inspect_link:
-                        skipped_items.append({
-                            'name': item_name,
-                            'reason': 'No inspect link available'
-                        })
-                        continue
-                    
-                    # Get float data from CSFloat
-                    float_data = csfloat_scraper.get_float_data(inspect_link)
+                    float_data = results.get(inspect_link)
                     
                     if float_data and float_data.success:
                         # Update item in database
@@ -1772,7 +1895,7 @@ def update_steam_floats():
                         error_msg = float_data.error if float_data else "Unknown error"
                         failed_items.append({
                             'name': item_name,
-                            'error': f'CSFloat error: {error_msg}'
+                            'error': f'Float lookup error: {error_msg}'
                         })
                         
                 except Exception as e:
@@ -1783,7 +1906,7 @@ def update_steam_floats():
                     })
                     
         finally:
-            csfloat_scraper._cleanup()
+            resolver.close()
         
         # Prepare response
         message_parts = []
@@ -1835,21 +1958,24 @@ def update_steam_prices():
         updated_items = []
         failed_items = []
         skipped_items = []
-        from scrapers.skinsearch_scraper import SkinSearchScraper
-        scraper = SkinSearchScraper()
-        for item in items:
+        scraper = scraper_manager.get_scraper('skinsearch')
+        # Price all items concurrently; results come back in input order
+        price_results = scraper.batch_update_steam_prices(items)
+        for item, result in zip(items, price_results):
             try:
                 item_id = str(item['_id'])
-                price_info = scraper.scrape_steam_item(item)
+                price_info = result.get('price_info')
                 if price_info and hasattr(price_info, 'price') and price_info.price and price_info.price > 0:
                     update_result = steam_item_model.update_item(item_id, {
                         'current_price': price_info.price,
                         'price_source': 'skinsearch.com',
+                        'market_prices': price_info.markets or {},
                         'last_updated': datetime.now().isoformat()
                     })
                     if update_result:
                         item['current_price'] = price_info.price
                         item['price_source'] = 'skinsearch.com'
+                        item['market_prices'] = price_info.markets or {}
                         updated_items.append(item)
                         logger.info(f"Updated price for {item['name']}: {price_info.price} {price_info.currency}")
                     else:
@@ -1857,9 +1983,13 @@ def update_steam_prices():
                             'name': item['name'],
                             'error': 'Database update failed'
                         })
+                elif result.get('error') and result['error'] != 'no price found' and not result['error'].startswith('skipped'):
+                    failed_items.append({
+                        'name': item.get('name', 'Unknown'),
+                        'error': result['error']
+                    })
                 else:
-                    # Log full error response if available
-                    logger.warning(f"SkinSearch price not found for item: {item['name']}. Full item: {item}")
+                    logger.warning(f"SkinSearch price not found for item: {item['name']}")
                     skipped_items.append({
                         'name': item['name'],
                         'reason': 'No price found on SkinSearch'
@@ -1880,18 +2010,23 @@ def update_steam_prices():
         if failed_items:
             message_parts.append(f"failed to update {len(failed_items)} items")
         response_message = " and ".join(message_parts) if message_parts else "No items were processed"
+        tripped_hosts = sorted({r['tripped_host'] for r in price_results if r.get('tripped_host')})
+        if tripped_hosts:
+            response_message += f" (upstream unavailable: {', '.join(tripped_hosts)})"
         # If no prices were updated, return a warning status
         status = 'success' if updated_items else 'warning'
         return jsonify({
             'status': status,
             'message': response_message,
+            'tripped_hosts': tripped_hosts,
             'updated_items': len(updated_items),
             'skipped_items': len(skipped_items),
             'failed_items': len(failed_items),
             'details': {
                 'updated': [{'name': item['name'], 'price': item['current_price']} for item in updated_items],
                 'skipped': skipped_items,
-                'failed': failed_items
+                'failed': failed_items,
+                'timings': [{'name': r['name'], 'elapsed': r['elapsed'], 'error': r['error']} for r in price_results]
             }
         })
     except Exception as e:
@@ -1920,8 +2055,11 @@ def bulk_parallel_scrape():
         # Import the working scraper
         from parallel_scraper import ParallelCSGOSkinsScraper
         
-        # Use 3 instances for bulk operations
-        parallel_scraper = ParallelCSGOSkinsScraper(num_instances=3)
+        # Use 3 instances for bulk operations ('processes' or 'tabs', see parallel_scraper.py)
+        mode = data.get('mode')
+        if mode not in (None, 'processes', 'tabs'):
+            return jsonify({'error': "mode must be 'processes' or 'tabs'"}), 400
+        parallel_scraper = ParallelCSGOSkinsScraper(num_instances=3, mode=mode)
         
         try:
             results = parallel_scraper.scrape_parallel(items)
@@ -1946,6 +2084,7 @@ def bulk_parallel_scrape():
                 'total_items': len(items),
                 'successful_items': len(formatted_results),
                 'success_rate': round(success_rate, 1),
+                'report': parallel_scraper.report,
                 'message': f'Bulk parallel scraping completed: {len(formatted_results)}/{len(items)} items'
             })
                 
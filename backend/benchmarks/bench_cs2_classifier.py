@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Benchmark for CS2 item classification
+
+Compares the previous SteamInventoryScraper checks (_is_cs2_item followed by
+_get_item_category, reproduced verbatim below) against the precompiled
+cs2_classifier, first verifying that both give identical results for every
+description in the corpus.
+
+Usage:
+    python benchmarks/bench_cs2_classifier.py [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from benchmarks.cs2_item_corpus import build_descriptions
+from scrapers.cs2_classifier import CS2Classifier, _name_category, _tag_rule
+
+
+# --- Previous implementation (SteamInventoryScraper methods before cs2_classifier) ---
+
+
+def legacy_is_cs2_item(item_data: Dict) -> bool:
+    """Check if item is a CS2 item (includes all relevant item types)"""
+    name = item_data.get('market_hash_name', '').lower()
+    item_type = item_data.get('type', '').lower()
+
+    # Check for CS2 item types based on tags
+    tags = item_data.get('tags', [])
+
+    # Look for CS2-specific item categories
+    cs2_categories = [
+        'weapon',           # Weapon skins
+        'knife',            # Knives
+        'gloves',           # Gloves
+        'agent',            # Agent skins
+        'sticker',          # Stickers
+        'container',        # Cases
+        'tool',             # Keys, name tags, etc.
+        'graffiti',         # Sprays/graffiti
+        'musickit',         # Music kits
+        'collectible',      # Coins, charms
+        'base',             # Default items
+    ]
+
+    # Check tags for CS2 item types
+    for tag in tags:
+        tag_category = tag.get('category', '').lower()
+        tag_name = tag.get('internal_name', '').lower()
+        tag_localized = tag.get('localized_tag_name', '').lower()
+
+        # Check if it's a CS2 item category
+        if tag_category in ['type', 'itemset', 'quality', 'exterior']:
+            if any(cs2_cat in tag_name or cs2_cat in tag_localized for cs2_cat in cs2_categories):
+                return True
+
+        # Special checks for specific item types that might be missed
+        if 'key' in tag_name or 'key' in tag_localized:
+            return True
+        if 'gloves' in tag_name or 'gloves' in tag_localized or 'glove' in tag_name:
+            return True
+
+    # Additional checks for specific item types
+    cs2_item_indicators = [
+        # Weapons with conditions
+        'factory new', 'minimal wear', 'field-tested', 'well-worn', 'battle-scarred',
+        # Weapon types
+        'ak-47', 'awp', 'm4a4', 'm4a1-s', 'glock', 'usp', 'deagle', 'knife', 'karambit', 'bayonet',
+        # Item types
+        'sticker', 'key', 'case', 'capsule', 'music kit', 'graffiti', 'spray', 'agent',
+        'charm', 'coin', 'gloves', 'pin',
+        # CS2 specific terms
+        'souvenir', 'stattrak', 'operation'
+    ]
+
+    # Check if name contains CS2 indicators
+    if any(indicator in name for indicator in cs2_item_indicators):
+        return True
+
+    # Check item type for CS2 categories
+    if any(cs2_cat in item_type for cs2_cat in cs2_categories):
+        return True
+
+    # Default to including items if we're unsure (better to include too many than miss items)
+    return True
+
+
+def legacy_item_category(item_data: Dict, name: str) -> str:
+    """Determine the category of a CS2 item"""
+    name_lower = name.lower()
+    item_type = item_data.get('type', '').lower()
+
+    # Check tags for more accurate categorization
+    tags = item_data.get('tags', [])
+    for tag in tags:
+        tag_category = tag.get('category', '').lower()
+        tag_name = tag.get('internal_name', '').lower()
+        tag_localized = tag.get('localized_tag_name', '').lower()
+
+        # Direct category matches
+        if 'weapon' in tag_name or 'weapon' in tag_localized:
+            return 'weapon'
+        elif 'knife' in tag_name or 'knife' in tag_localized:
+            return 'knife'
+        elif 'gloves' in tag_name or 'gloves' in tag_localized:
+            return 'gloves'
+        elif 'agent' in tag_name or 'agent' in tag_localized:
+            return 'agent'
+        elif 'sticker' in tag_name or 'sticker' in tag_localized:
+            return 'sticker'
+        elif 'container' in tag_name or 'container' in tag_localized:
+            return 'case'
+        elif 'tool' in tag_name or 'tool' in tag_localized:
+            if 'key' in name_lower:
+                return 'key'
+            elif 'charm' in name_lower:
+                return 'charm'
+            return 'tool'
+        elif 'graffiti' in tag_name or 'graffiti' in tag_localized:
+            return 'spray'
+        elif 'musickit' in tag_name or 'music kit' in tag_localized:
+            return 'music_kit'
+        elif 'collectible' in tag_name or 'collectible' in tag_localized:
+            if 'coin' in name_lower:
+                return 'coin'
+            elif 'charm' in name_lower:
+                return 'charm'
+            elif 'pin' in name_lower:
+                return 'pin'
+            return 'collectible'
+        elif 'patch' in tag_name or 'patch' in tag_localized:
+            return 'patch'
+
+    # Enhanced fallback to name-based detection with all categories
+    if 'knife' in name_lower or 'karambit' in name_lower or 'bayonet' in name_lower:
+        return 'knife'
+    elif 'gloves' in name_lower or 'glove' in name_lower or 'wraps' in name_lower:
+        return 'gloves'
+    elif 'sticker' in name_lower:
+        return 'sticker'
+    elif 'case' in name_lower and ('weapon case' in name_lower or 'container' in name_lower):
+        return 'case'
+    elif 'capsule' in name_lower:
+        if 'sticker capsule' in name_lower:
+            return 'sticker_capsule'
+        elif 'autograph capsule' in name_lower:
+            return 'autograph_capsule'
+        elif 'collectible capsule' in name_lower:
+            return 'collectible_capsule'
+        return 'capsule'
+    elif 'souvenir package' in name_lower:
+        return 'souvenir_package'
+    elif 'collection package' in name_lower:
+        return 'collection_package'
+    elif 'patch pack' in name_lower:
+        return 'patch_pack'
+    elif 'graffiti box' in name_lower:
+        return 'graffiti_box'
+    elif 'music kit box' in name_lower:
+        return 'music_kit_box'
+    elif 'key' in name_lower or ' key' in name_lower:
+        return 'key'
+    elif 'music kit' in name_lower:
+        return 'music_kit'
+    elif 'graffiti' in name_lower or 'spray' in name_lower:
+        return 'spray'
+    elif 'agent' in name_lower:
+        return 'agent'
+    elif 'coin' in name_lower:
+        return 'coin'
+    elif 'charm' in name_lower:
+        return 'charm'
+    elif 'patch' in name_lower:
+        return 'patch'
+    elif 'pin' in name_lower:
+        return 'pin'
+    elif 'pass' in name_lower:
+        return 'pass'
+    elif 'gift' in name_lower:
+        return 'gift'
+    elif 'collectible' in name_lower:
+        return 'collectible'
+    elif 'tag' in name_lower:
+        return 'tag'
+    elif any(weapon in name_lower for weapon in ['ak-47', 'awp', 'm4a4', 'm4a1-s', 'glock', 'usp', 'deagle']):
+        return 'weapon'
+
+    return 'unknown'
+
+
+def run_legacy(descriptions) -> float:
+    start = time.perf_counter()
+    for desc in descriptions:
+        if legacy_is_cs2_item(desc):
+            legacy_item_category(desc, desc['market_hash_name'])
+    return time.perf_counter() - start
+
+
+def run_classifier(classifier: CS2Classifier, descriptions, page_size: int = 2000) -> float:
+    _tag_rule.cache_clear()
+    _name_category.cache_clear()
+    start = time.perf_counter()
+    for offset in range(0, len(descriptions), page_size):
+        classifier.classify_many(descriptions[offset:offset + page_size])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20, help='Times the corpus is repeated')
+    args = parser.parse_args()
+
+    corpus = build_descriptions()
+    classifier = CS2Classifier()
+
+    # Both implementations must agree on every description
+    for desc in corpus:
+        expected = {'is_cs2': legacy_is_cs2_item(desc),
+                    'item_category': legacy_item_category(desc, desc['market_hash_name'])}
+        assert classifier.classify(desc) == expected, (desc['market_hash_name'], desc['tags'])
+
+    # Repeated pages use fresh classids, like distinct inventories holding the same items
+    descriptions = [{**desc, 'classid': f"{round_}_{desc['classid']}"}
+                    for round_ in range(args.repeat) for desc in corpus]
+
+    legacy = run_legacy(descriptions)
+    compiled = run_classifier(classifier, descriptions)
+
+    print(f"Corpus: {len(corpus)} descriptions x {args.repeat} = {len(descriptions)} classifications")
+    print(f"Previous checks   : {legacy * 1000:8.1f} ms  ({len(descriptions) / legacy:10.0f} items/s)")
+    print(f"Precompiled rules : {compiled * 1000:8.1f} ms  ({len(descriptions) / compiled:10.0f} items/s)")
+    print(f"Speedup           : {legacy / compiled:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the shared request-blocking browser profile
+
+Loads each scraper's landing page in a pooled headless Chrome, alternating
+between no blocking and the scraper's blocking profile, with the browser cache
+disabled. Reports page-load time (navigation start to load event) and bytes
+transferred (navigation + Resource Timing transferSize; cross-origin resources
+without Timing-Allow-Origin count as 0, so the totals are a lower bound).
+
+Requires Chrome and chromedriver.
+
+Usage:
+    python benchmarks/bench_request_blocking.py [--repeat 3] [--url CSFloat=https://csfloat.com/]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from scrapers.browser_pool import BrowserPool
+from scrapers.request_blocking import apply_blocking
+
+DEFAULT_PAGES = {
+    'TradingCards': 'https://www.cardmarket.com/en/Pokemon/Products/Search?category=-1',
+    'CSFloat': 'https://csfloat.com/',
+    'SkinSnipe': 'https://www.skinsnipe.com',
+}
+
+PAGE_METRICS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+return {
+    load_ms: nav ? nav.loadEventEnd - nav.startTime : null,
+    bytes: (nav ? nav.transferSize : 0) + resources.reduce((sum, r) => sum + (r.transferSize || 0), 0),
+    requests: resources.length + 1,
+};
+"""
+
+
+def measure(driver, scraper: str, url: str, blocked: bool) -> dict:
+    apply_blocking(driver, scraper if blocked else None)
+    driver.get('about:blank')
+    driver.get(url)
+    return driver.execute_script(PAGE_METRICS_SCRIPT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help='Loads per page and mode')
+    parser.add_argument('--url', action='append', default=[], metavar='SCRAPER=URL',
+                        help='Page to load with that scraper\'s allow-list (default: all scraper landing pages)')
+    args = parser.parse_args()
+
+    pages = dict(url.split('=', 1) for url in args.url) if args.url else DEFAULT_PAGES
+    pool = BrowserPool(max_size=1)
+    driver = pool.lease(profile='default', headless=True, page_load_timeout=60)
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
+        print(f"{'scraper':<14} {'mode':<9} {'load ms':>9} {'KB':>9} {'requests':>9}")
+        for scraper, url in pages.items():
+            results = {False: [], True: []}
+            for _ in range(args.repeat):
+                # Alternate so both modes see the same network conditions
+                for blocked in (False, True):
+                    results[blocked].append(measure(driver, scraper, url, blocked))
+            for blocked, samples in results.items():
+                load = statistics.median(s['load_ms'] or 0 for s in samples)
+                kb = statistics.median(s['bytes'] for s in samples) / 1024
+                requests = statistics.median(s['requests'] for s in samples)
+                print(f"{scraper:<14} {'blocked' if blocked else 'full':<9} {load:9.0f} {kb:9.1f} {requests:9.0f}")
+            full = statistics.median(s['bytes'] for s in results[False])
+            blocked = statistics.median(s['bytes'] for s in results[True])
+            if full:
+                print(f"{'':<14} saved {100 * (full - blocked) / full:.0f}% of transferred bytes")
+    finally:
+        pool.release(driver, discard=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the SkinSearch item name -> URL resolver
+
+Compares the uncached mapping path (map_steam_item_to_skinsearch_args + build_url
+with empty memo tables) against the memoized resolve_items path over a corpus of
+real CS2 market names, repeated to simulate refreshing several inventories.
+
+Usage:
+    python benchmarks/bench_skinsearch_resolver.py [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from benchmarks.cs2_item_corpus import build_corpus
+from scrapers.skinsearch_scraper import SkinSearchScraper, _normalize
+
+
+def run_uncached(scraper: SkinSearchScraper, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        _normalize.cache_clear()
+        item_type, url_args = scraper.map_steam_item_to_skinsearch_args(item)
+        if item_type and url_args and not url_args.get('_doppler_fallback'):
+            scraper.build_url(item_type, **url_args)
+    return time.perf_counter() - start
+
+
+def run_memoized(scraper: SkinSearchScraper, items) -> float:
+    SkinSearchScraper._resolve_memo.clear()
+    _normalize.cache_clear()
+    start = time.perf_counter()
+    scraper.resolve_items(items)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20, help='Times the corpus is repeated')
+    args = parser.parse_args()
+
+    corpus = build_corpus()
+    items = corpus * args.repeat
+    scraper = SkinSearchScraper()
+
+    # Both paths must produce the same URLs
+    for item in corpus:
+        item_type, url_args = scraper.map_steam_item_to_skinsearch_args(item)
+        expected = None
+        if item_type and url_args and not url_args.get('_doppler_fallback'):
+            expected = scraper.build_url(item_type, **url_args)
+        assert scraper.resolve_item(item)[2] == expected, item['name']
+
+    uncached = run_uncached(scraper, items)
+    memoized = run_memoized(scraper, items)
+
+    print(f"Corpus: {len(corpus)} unique items x {args.repeat} = {len(items)} lookups")
+    print(f"Uncached mapping : {uncached * 1000:8.1f} ms  ({len(items) / uncached:10.0f} items/s)")
+    print(f"Memoized resolver: {memoized * 1000:8.1f} ms  ({len(items) / memoized:10.0f} items/s)")
+    print(f"Speedup          : {uncached / memoized:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
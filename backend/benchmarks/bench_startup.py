@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the Flask backend
+
+Measures, in a fresh interpreter per run, how long `import app` takes and how
+long the first request (/api/health by default) takes afterwards. Also reports
+which scrapers were created during startup, which should be none now that
+scrapers and their browsers are created on first use.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--path /api/health]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {backend_dir!r})
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+response = app.app.test_client().get({path!r})
+first_request = time.perf_counter()
+print(json.dumps({{
+    'import': imported - start,
+    'first_request': first_request - imported,
+    'status_code': response.status_code,
+    'scrapers_created': sorted(app.scraper_manager.scrapers),
+}}))
+"""
+
+
+def run_once(path: str) -> dict:
+    code = CHILD.format(backend_dir=backend_dir, path=path)
+    result = subprocess.run([sys.executable, '-c', code], cwd=backend_dir,
+                            capture_output=True, text=True, check=True)
+    # The app logs to stderr; the timings are the last line on stdout
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreter runs to average over')
+    parser.add_argument('--path', default='/api/health', help='Route used for the first request')
+    args = parser.parse_args()
+
+    samples = [run_once(args.path) for _ in range(args.runs)]
+    imports = [s['import'] for s in samples]
+    firsts = [s['first_request'] for s in samples]
+
+    print(f"Runs             : {args.runs}")
+    print(f"import app       : median {statistics.median(imports) * 1000:8.1f} ms  (max {max(imports) * 1000:.1f} ms)")
+    print(f"first request    : median {statistics.median(firsts) * 1000:8.1f} ms  "
+          f"(max {max(firsts) * 1000:.1f} ms, GET {args.path} -> {samples[-1]['status_code']})")
+    print(f"scrapers created : {', '.join(samples[-1]['scrapers_created']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
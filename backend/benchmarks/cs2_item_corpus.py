@@ -0,0 +1,215 @@
+"""
+CS2 item name corpus for benchmarks
+Real market_hash_names with the category and Steam type string the inventory scraper assigns
+"""
+
+from typing import Dict, List
+
+CONDITIONS = {
+    'Factory New': 'FN',
+    'Minimal Wear': 'MW',
+    'Field-Tested': 'FT',
+    'Well-Worn': 'WW',
+    'Battle-Scarred': 'BS',
+}
+
+WEAPON_SKINS = [
+    ('AK-47', 'Redline', 'Classified Rifle'),
+    ('AK-47', 'Vulcan', 'Covert Rifle'),
+    ('AK-47', 'Asiimov', 'Covert Rifle'),
+    ('AK-47', 'Bloodsport', 'Covert Rifle'),
+    ('AK-47', 'Slate', 'Restricted Rifle'),
+    ('AK-47', 'Case Hardened', 'Classified Rifle'),
+    ('AK-47', 'Neon Rider', 'Covert Rifle'),
+    ('AK-47', 'Phantom Disruptor', 'Classified Rifle'),
+    ('AWP', 'Asiimov', 'Covert Sniper Rifle'),
+    ('AWP', 'Hyper Beast', 'Covert Sniper Rifle'),
+    ('AWP', 'Neo-Noir', 'Covert Sniper Rifle'),
+    ('AWP', 'Atheris', 'Restricted Sniper Rifle'),
+    ('AWP', 'Wildfire', 'Covert Sniper Rifle'),
+    ('AWP', 'Chromatic Aberration', 'Covert Sniper Rifle'),
+    ('M4A4', 'The Emperor', 'Covert Rifle'),
+    ('M4A4', 'Neo-Noir', 'Covert Rifle'),
+    ('M4A4', 'Desolate Space', 'Classified Rifle'),
+    ('M4A4', 'In Living Color', 'Covert Rifle'),
+    ('M4A1-S', 'Printstream', 'Covert Rifle'),
+    ('M4A1-S', 'Hyper Beast', 'Covert Rifle'),
+    ('M4A1-S', 'Decimator', 'Covert Rifle'),
+    ('M4A1-S', 'Nightmare', 'Classified Rifle'),
+    ('Desert Eagle', 'Printstream', 'Covert Pistol'),
+    ('Desert Eagle', 'Blaze', 'Restricted Pistol'),
+    ('Desert Eagle', 'Code Red', 'Covert Pistol'),
+    ('Glock-18', 'Water Elemental', 'Classified Pistol'),
+    ('Glock-18', 'Fade', 'Restricted Pistol'),
+    ('Glock-18', 'Vogue', 'Classified Pistol'),
+    ('USP-S', 'Kill Confirmed', 'Covert Pistol'),
+    ('USP-S', 'Cortex', 'Classified Pistol'),
+    ('USP-S', 'Neo-Noir', 'Covert Pistol'),
+    ('P250', 'See Ya Later', 'Covert Pistol'),
+    ('Five-SeveN', 'Hyper Beast', 'Covert Pistol'),
+    ('Tec-9', 'Fuel Injector', 'Classified Pistol'),
+    ('MP9', 'Starlight Protector', 'Covert SMG'),
+    ('MAC-10', 'Neon Rider', 'Covert SMG'),
+    ('UMP-45', 'Primal Saber', 'Classified SMG'),
+    ('P90', 'Asiimov', 'Covert SMG'),
+    ('FAMAS', 'Roll Cage', 'Classified Rifle'),
+    ('Galil AR', 'Chatterbox', 'Covert Rifle'),
+    ('SSG 08', 'Dragonfire', 'Covert Sniper Rifle'),
+    ('SG 553', 'Integrale', 'Classified Rifle'),
+    ('AUG', 'Akihabara Accept', 'Covert Rifle'),
+    ('Nova', 'Hyper Beast', 'Classified Shotgun'),
+    ('XM1014', 'Incinegator', 'Covert Shotgun'),
+    ('MAG-7', 'Justice', 'Classified Shotgun'),
+    ('Negev', 'Power Loader', 'Classified Machinegun'),
+]
+
+KNIVES = [
+    ('★ Karambit', 'Fade', 'Covert Knife'),
+    ('★ Karambit', 'Tiger Tooth', 'Covert Knife'),
+    ('★ Karambit', 'Lore', 'Covert Knife'),
+    ('★ Butterfly Knife', 'Slaughter', 'Covert Knife'),
+    ('★ Butterfly Knife', 'Crimson Web', 'Covert Knife'),
+    ('★ M9 Bayonet', 'Marble Fade', 'Covert Knife'),
+    ('★ Bayonet', 'Autotronic', 'Covert Knife'),
+    ('★ Talon Knife', 'Case Hardened', 'Covert Knife'),
+    ('★ Skeleton Knife', 'Night Stripe', 'Covert Knife'),
+    ('★ Stiletto Knife', 'Vanilla', 'Covert Knife'),
+]
+
+GLOVES = [
+    ('★ Sport Gloves', 'Pandora\'s Box', 'Extraordinary Gloves'),
+    ('★ Specialist Gloves', 'Crimson Kimono', 'Extraordinary Gloves'),
+    ('★ Driver Gloves', 'King Snake', 'Extraordinary Gloves'),
+    ('★ Hand Wraps', 'Cobalt Skulls', 'Extraordinary Gloves'),
+    ('★ Moto Gloves', 'Spearmint', 'Extraordinary Gloves'),
+]
+
+CONTAINERS = [
+    ('Revolution Case', 'Base Grade Container'),
+    ('Recoil Case', 'Base Grade Container'),
+    ('Dreams & Nightmares Case', 'Base Grade Container'),
+    ('Fracture Case', 'Base Grade Container'),
+    ('Clutch Case', 'Base Grade Container'),
+    ('Kilowatt Case', 'Base Grade Container'),
+    ('Chroma 3 Case', 'Base Grade Container'),
+    ('Operation Breakout Weapon Case', 'Base Grade Container'),
+    ('Paris 2023 Legends Sticker Capsule', 'Base Grade Container'),
+    ('Copenhagen 2024 Challengers Sticker Capsule', 'Base Grade Container'),
+    ('Antwerp 2022 Mirage Souvenir Package', 'Souvenir Package'),
+    ('Community Graffiti Box', 'Base Grade Container'),
+]
+
+STICKERS = [
+    'Sticker | Crown (Foil)',
+    'Sticker | Natus Vincere (Holo) | Paris 2023',
+    'Sticker | s1mple (Gold) | Antwerp 2022',
+    'Sticker | ZywOo | Copenhagen 2024',
+    'Sticker | Howling Dawn',
+    'Sticker | Battle Scarred',
+    'Sticker | Hello AWP',
+    'Sticker | FaZe Clan | Rio 2022',
+    'Sticker | Vitality (Glitter) | Paris 2023',
+    'Sticker | donk | Shanghai 2024',
+]
+
+OTHER = [
+    ('Music Kit | Daniel Sadowski, Crimson Assault', 'music_kit', 'High Grade Music Kit'),
+    ('Music Kit | Noisia, Sharpened', 'music_kit', 'High Grade Music Kit'),
+    ('Sir Bloody Miami Darryl | The Professionals', 'agent', 'Master Agent'),
+    ('Special Agent Ava | FBI', 'agent', 'Master Agent'),
+    ('\'Two Times\' McCoy | TACP Cavalry', 'agent', 'Exceptional Agent'),
+    ('Charm | Lil\' Squirt', 'charm', 'Remarkable Charm'),
+    ('Charm | Hot Howl', 'charm', 'High Grade Charm'),
+    ('Patch | Metal Distinguished Master Guardian', 'patch', 'High Grade Patch'),
+    ('Sealed Graffiti | Lambda (Blood Red)', 'spray', 'Base Grade Graffiti'),
+    ('Operation Riptide Pass', 'pass', 'Base Grade Pass'),
+]
+
+
+def build_corpus() -> List[Dict]:
+    """Expand the name lists into steam item dicts as stored by the inventory scraper"""
+    items = []
+    for weapon, skin, item_type in WEAPON_SKINS:
+        for wear, short in CONDITIONS.items():
+            items.append({'name': f"{weapon} | {skin} ({wear})", 'item_category': 'weapon',
+                          'item_type': item_type, 'condition': short})
+            items.append({'name': f"StatTrak™ {weapon} | {skin} ({wear})", 'item_category': 'weapon',
+                          'item_type': f"StatTrak™ {item_type}", 'condition': short})
+    for knife, skin, item_type in KNIVES:
+        for wear, short in CONDITIONS.items():
+            items.append({'name': f"{knife} | {skin} ({wear})", 'item_category': 'knife',
+                          'item_type': item_type, 'condition': short})
+    for glove, skin, item_type in GLOVES:
+        for wear, short in CONDITIONS.items():
+            items.append({'name': f"{glove} | {skin} ({wear})", 'item_category': 'gloves',
+                          'item_type': item_type, 'condition': short})
+    for name, item_type in CONTAINERS:
+        items.append({'name': name, 'item_category': 'case', 'item_type': item_type, 'condition': 'N/A'})
+    for name in STICKERS:
+        items.append({'name': name, 'item_category': 'sticker', 'item_type': 'High Grade Sticker', 'condition': 'N/A'})
+    for name, category, item_type in OTHER:
+        items.append({'name': name, 'item_category': category, 'item_type': item_type, 'condition': 'N/A'})
+    return items
+
+
+# Steam "Type" tags (internal_name, localized_tag_name) per inventory category
+TYPE_TAGS = {
+    'Rifle': ('CSGO_Type_Rifle', 'Rifle'),
+    'Sniper Rifle': ('CSGO_Type_SniperRifle', 'Sniper Rifle'),
+    'Pistol': ('CSGO_Type_Pistol', 'Pistol'),
+    'SMG': ('CSGO_Type_SMG', 'SMG'),
+    'Shotgun': ('CSGO_Type_Shotgun', 'Shotgun'),
+    'Machinegun': ('CSGO_Type_Machinegun', 'Machinegun'),
+    'knife': ('CSGO_Type_Knife', 'Knife'),
+    'gloves': ('Type_Hands', 'Gloves'),
+    'case': ('CSGO_Type_WeaponCase', 'Container'),
+    'sticker': ('CSGO_Tool_Sticker', 'Sticker'),
+    'music_kit': ('CSGO_Type_MusicKit', 'Music Kit'),
+    'agent': ('Type_CustomPlayer', 'Agent'),
+    'charm': ('CSGO_Tool_Keychain', 'Charm'),
+    'patch': ('CSGO_Tool_Patch', 'Patch'),
+    'spray': ('CSGO_Type_Spray', 'Graffiti'),
+    'pass': ('CSGO_Type_Ticket', 'Pass'),
+}
+
+RARITY_TAGS = {
+    'Base Grade': ('Rarity_Common', 'Base Grade'),
+    'High Grade': ('Rarity_Rare', 'High Grade'),
+    'Remarkable': ('Rarity_Mythical', 'Remarkable'),
+    'Exceptional': ('Rarity_Mythical_Character', 'Exceptional'),
+    'Restricted': ('Rarity_Mythical_Weapon', 'Restricted'),
+    'Classified': ('Rarity_Legendary_Weapon', 'Classified'),
+    'Master': ('Rarity_Ancient_Character', 'Master'),
+    'Covert': ('Rarity_Ancient_Weapon', 'Covert'),
+    'Extraordinary': ('Rarity_Ancient', 'Extraordinary'),
+}
+
+
+def _type_tag_for(item: Dict) -> tuple:
+    if item['item_category'] == 'weapon':
+        for weapon_type in ('Sniper Rifle', 'Rifle', 'Pistol', 'SMG', 'Shotgun', 'Machinegun'):
+            if item['item_type'].endswith(weapon_type):
+                return TYPE_TAGS[weapon_type]
+    return TYPE_TAGS.get(item['item_category'], ('CSGO_Type_WeaponCase', 'Container'))
+
+
+def build_descriptions() -> List[Dict]:
+    """
+    Steam inventory descriptions (market_hash_name, type, tags) for the corpus.
+    Every item appears twice: with Steam-style tags and without tags (name fallbacks).
+    """
+    descriptions = []
+    for classid, item in enumerate(build_corpus(), start=1):
+        type_internal, type_localized = _type_tag_for(item)
+        tags = [{'category': 'Type', 'internal_name': type_internal, 'localized_tag_name': type_localized}]
+        quality = 'StatTrak™' if item['name'].startswith('StatTrak™') else 'Normal'
+        tags.append({'category': 'Quality', 'internal_name': 'strange' if quality != 'Normal' else 'normal',
+                     'localized_tag_name': quality})
+        for grade, (internal, localized) in RARITY_TAGS.items():
+            if item['item_type'].startswith(grade) or f" {grade} " in f" {item['item_type']} ":
+                tags.append({'category': 'Rarity', 'internal_name': internal, 'localized_tag_name': localized})
+                break
+        base = {'classid': str(classid), 'market_hash_name': item['name'], 'type': item['item_type']}
+        descriptions.append({**base, 'instanceid': '0', 'tags': tags})
+        descriptions.append({**base, 'instanceid': '1', 'tags': []})
+    return descriptions
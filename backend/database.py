@@ -9,8 +9,9 @@ from typing import List, Dict, Optional
 import logging
 import os
 from dotenv import load_dotenv
-from pymongo.errors import DuplicateKeyError
-import requests
+from pymongo import InsertOne, UpdateOne, DeleteMany
+from pymongo.errors import DuplicateKeyError, BulkWriteError
+from fx_service import fx_service
 
 # Load environment variables
 load_dotenv()
@@ -248,17 +249,8 @@ class CardModel:
     def get_portfolio_summary(self, user_id: str = None) -> Dict:
         """Calculate portfolio summary for a user including all portfolio assets (cards, steam, stocks, etfs, crypto)"""
         try:
-            # Fetch EUR conversion rates
-            conversion_rates = {"USD": 1.0}
-            try:
-                response = requests.get(
-                    "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/eur.json"
-                )
-                if response.ok:
-                    data = response.json()
-                    conversion_rates.update(data.get("eur", {}))
-            except Exception as e:
-                logger.warning(f"Failed to fetch conversion rates: {e}")
+            # EUR conversion rates from the shared FX service
+            conversion_rates = {"USD": fx_service.get_rate('USD', 'EUR') or 1.0}
 
             match_stage = {}
             if user_id:
@@ -561,6 +553,51 @@ class SteamItemModel:
             logger.error(f"Error creating steam item: {e}")
             raise
     
+    def bulk_import_items(self, user_id, items):
+        """
+        Import items with one unordered bulk_write of upserts on (user_id, asset_id).
+        Existing items are left untouched ($setOnInsert), so re-imports only count them as skipped.
+        
+        Returns:
+            {'inserted': [items with _id], 'skipped': [items], 'failed': [{'item', 'error'}],
+             'inserted_count', 'skipped_count', 'failed_count'}
+        """
+        now = datetime.utcnow()
+        documents = [{**item_data, 'user_id': user_id, 'created_at': now, 'updated_at': now} for item_data in items]
+        operations = [
+            UpdateOne({"user_id": user_id, "asset_id": doc.get('asset_id')}, {"$setOnInsert": doc}, upsert=True)
+            for doc in documents
+        ]
+        summary = {'inserted': [], 'skipped': [], 'failed': []}
+        if not operations:
+            return {**summary, 'inserted_count': 0, 'skipped_count': 0, 'failed_count': 0}
+        
+        try:
+            details = self.collection.bulk_write(operations, ordered=False).bulk_api_result
+        except BulkWriteError as e:
+            # Unordered: every operation without an error was still applied
+            details = e.details
+        except Exception as e:
+            logger.error(f"Error bulk importing steam items for user {user_id}: {e}")
+            raise
+        
+        upserted = {entry['index']: entry['_id'] for entry in details.get('upserted', [])}
+        errors = {entry['index']: entry.get('errmsg', 'write error') for entry in details.get('writeErrors', [])}
+        for index, doc in enumerate(documents):
+            if index in upserted:
+                summary['inserted'].append({**doc, '_id': str(upserted[index])})
+            elif index in errors:
+                summary['failed'].append({'item': doc, 'error': errors[index]})
+            else:
+                summary['skipped'].append(doc)
+        
+        return {
+            **summary,
+            'inserted_count': len(summary['inserted']),
+            'skipped_count': len(summary['skipped']),
+            'failed_count': len(summary['failed']),
+        }
+    
     def get_items_by_user(self, user_id, limit=None, skip=0):
         """Get all steam items for a user"""
         try:
@@ -602,6 +639,71 @@ class SteamItemModel:
             logger.error(f"Error finding existing steam item: {e}")
             return None
     
+    def get_asset_ids(self, user_id):
+        """Get the asset ids of all steam items for a user"""
+        try:
+            cursor = self.collection.find({"user_id": user_id}, {"asset_id": 1, "_id": 0})
+            return [str(doc['asset_id']) for doc in cursor if doc.get('asset_id') is not None]
+            
+        except Exception as e:
+            logger.error(f"Error getting steam asset ids for user {user_id}: {e}")
+            raise
+    
+    def apply_inventory_diff(self, user_id, added_items, changed_items, removed_asset_ids):
+        """
+        Apply an inventory sync in a single unordered bulk write:
+        insert added items, $set refreshed fields on changed items, delete removed assets
+        """
+        now = datetime.utcnow()
+        operations = []
+        for item_data in added_items:
+            operations.append(InsertOne({**item_data, 'user_id': user_id, 'created_at': now, 'updated_at': now}))
+        for item_data in changed_items:
+            fields = {k: v for k, v in item_data.items() if k not in ('user_id', 'asset_id')}
+            operations.append(UpdateOne(
+                {"user_id": user_id, "asset_id": item_data['asset_id']},
+                {"$set": {**fields, 'updated_at': now}}
+            ))
+        if removed_asset_ids:
+            operations.append(DeleteMany({"user_id": user_id, "asset_id": {"$in": list(removed_asset_ids)}}))
+        
+        summary = {'inserted': 0, 'updated': 0, 'removed': 0, 'errors': 0}
+        if not operations:
+            return summary
+        
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            details = result.bulk_api_result
+        except BulkWriteError as e:
+            # Unordered: the remaining operations were still applied
+            details = e.details
+            logger.warning(f"Steam inventory sync for user {user_id} had {len(details.get('writeErrors', []))} write errors")
+        
+        summary.update({
+            'inserted': details.get('nInserted', 0),
+            'updated': details.get('nModified', 0),
+            'removed': details.get('nRemoved', 0),
+            'errors': len(details.get('writeErrors', [])),
+        })
+        return summary
+    
+    def get_item(self, item_id, user_id):
+        """Get a single steam item owned by a user"""
+        try:
+            item = self.collection.find_one({
+                "_id": ObjectId(item_id),
+                "user_id": user_id
+            })
+            
+            if item:
+                item['_id'] = str(item['_id'])
+            
+            return item
+            
+        except Exception as e:
+            logger.error(f"Error getting steam item {item_id}: {e}")
+            return None
+    
     def get_user_items(self, user_id):
         """Get all steam items for a user"""
         try:
@@ -725,6 +827,120 @@ class SteamItemModel:
             logger.error(f"Error getting steam stats for user {user_id}: {e}")
             raise
 
+class SteamInventorySnapshotModel:
+    """Per-inventory snapshot of asset ids and description hashes used for incremental sync"""
+    
+    def __init__(self, db):
+        self.collection = db.steam_inventory_snapshots
+        self._ensure_indexes()
+    
+    def _ensure_indexes(self):
+        """Create necessary indexes"""
+        try:
+            self.collection.create_index([
+                ("user_id", 1),
+                ("steam_id", 1)
+            ], unique=True)
+            
+        except Exception as e:
+            logger.warning(f"Could not create steam snapshot indexes: {e}")
+    
+    def get_snapshot(self, user_id: str, steam_id: str) -> Dict[str, str]:
+        """Get {asset_id: description_hash} from the last sync, empty if there was none"""
+        try:
+            snapshot = self.collection.find_one({"user_id": user_id, "steam_id": steam_id}, {"assets": 1})
+            return snapshot.get('assets', {}) if snapshot else {}
+            
+        except Exception as e:
+            logger.error(f"Error getting steam snapshot for {steam_id}: {e}")
+            return {}
+    
+    def get_content_hash(self, user_id: str, steam_id: str) -> Optional[str]:
+        """Get the inventory content hash recorded by the last sync"""
+        try:
+            snapshot = self.collection.find_one({"user_id": user_id, "steam_id": steam_id}, {"content_hash": 1})
+            return snapshot.get('content_hash') if snapshot else None
+            
+        except Exception as e:
+            logger.error(f"Error getting steam snapshot hash for {steam_id}: {e}")
+            return None
+    
+    def save_snapshot(self, user_id: str, steam_id: str, app_id: str, assets: Dict[str, str],
+                      content_hash: Optional[str] = None) -> bool:
+        """Store the asset ids and description hashes seen by the latest sync"""
+        try:
+            self.collection.update_one(
+                {"user_id": user_id, "steam_id": steam_id},
+                {"$set": {"app_id": app_id, "assets": assets, "asset_count": len(assets),
+                          "content_hash": content_hash, "updated_at": datetime.utcnow()}},
+                upsert=True
+            )
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error saving steam snapshot for {steam_id}: {e}")
+            return False
+    
+    def invalidate(self, user_id: str, steam_id: Optional[str] = None) -> bool:
+        """Forget the content hash of a user's snapshots (all of them without steam_id) after items were deleted"""
+        try:
+            query = {"user_id": user_id}
+            if steam_id:
+                query["steam_id"] = steam_id
+            self.collection.update_many(query, {"$set": {"content_hash": None, "updated_at": datetime.utcnow()}})
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error invalidating steam snapshots for {user_id}: {e}")
+            return False
+
+class FloatCacheModel:
+    """Permanent float value / paint seed cache keyed by inspect link asset identity"""
+    
+    def __init__(self, db):
+        self.collection = db.float_cache
+        self._ensure_indexes()
+    
+    def _ensure_indexes(self):
+        """Create necessary indexes"""
+        try:
+            self.collection.create_index([("key", 1)], unique=True)
+            
+        except Exception as e:
+            logger.warning(f"Could not create float cache indexes: {e}")
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Dict]:
+        """Get {key: entry} for every cached key with one query"""
+        if not keys:
+            return {}
+        try:
+            cursor = self.collection.find({"key": {"$in": list(keys)}}, {"_id": 0})
+            return {entry['key']: entry for entry in cursor}
+            
+        except Exception as e:
+            logger.error(f"Error reading float cache: {e}")
+            return {}
+    
+    def save_many(self, entries: Dict[str, Dict]) -> int:
+        """Store {key: {'float_value', 'paint_seed', ...}} with one unordered bulk upsert"""
+        if not entries:
+            return 0
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne({"key": key}, {"$set": {**entry, "key": key, "updated_at": now}}, upsert=True)
+            for key, entry in entries.items()
+        ]
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            return result.upserted_count + result.modified_count
+            
+        except BulkWriteError as e:
+            logger.warning(f"Float cache write partially failed: {len(e.details.get('writeErrors', []))} errors")
+            return e.details.get('nUpserted', 0) + e.details.get('nModified', 0)
+        except Exception as e:
+            logger.error(f"Error writing float cache: {e}")
+            return 0
+
 class FinancialAssetModel:
     """Model for managing financial assets (stocks, ETFs, crypto)"""
     
@@ -907,9 +1123,13 @@ if mongodb.connected:
     # Initialize models
     card_model = CardModel(mongodb.db)
     steam_item_model = SteamItemModel(mongodb.db)
+    steam_snapshot_model = SteamInventorySnapshotModel(mongodb.db)
+    float_cache_model = FloatCacheModel(mongodb.db)
     financial_asset_model = FinancialAssetModel(mongodb.db)
 else:
     card_model = None
     steam_item_model = None
+    steam_snapshot_model = None
+    float_cache_model = None
     financial_asset_model = None
     logger.warning("Models not initialized - MongoDB not available")
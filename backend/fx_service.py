@@ -0,0 +1,215 @@
+"""
+Foreign Exchange Rate Service
+Process-wide currency rates shared by the scrapers, yfinance service and portfolio summary
+
+Rates are fetched once from the currency CDN (EUR base) and kept in memory with a TTL.
+Once the TTL expires the last rates keep being served while a background thread
+refreshes them (stale-while-revalidate). Every successful fetch is written to an
+on-disk last-known-good snapshot that is used when the CDN is unreachable.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+FX_SOURCES = [
+    "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/{base}.json",
+    "https://latest.currency-api.pages.dev/v1/currencies/{base}.json",
+]
+
+# Minor-unit quote currencies used by Yahoo Finance (LSE pence, JSE cents, TASE agorot): (currency, units per major)
+MINOR_CURRENCY_UNITS = {
+    'GBp': ('GBP', 100),
+    'GBX': ('GBP', 100),
+    'ZAc': ('ZAR', 100),
+    'ZAC': ('ZAR', 100),
+    'ILA': ('ILS', 100),
+}
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'fx_rates.json')
+
+
+class FXService:
+    """Cached currency conversion with background refresh and disk fallback"""
+
+    BASE_CURRENCY = 'EUR'
+
+    def __init__(self, ttl: int = 3600, max_stale: int = 7 * 86400, snapshot_path: Optional[str] = None):
+        """
+        Args:
+            ttl: Seconds before rates are considered stale and refreshed in the background
+            max_stale: Seconds after which stale rates are refreshed synchronously instead
+            snapshot_path: File used to persist the last known good rates
+        """
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.snapshot_path = snapshot_path or os.getenv('FX_SNAPSHOT_PATH', DEFAULT_SNAPSHOT_PATH)
+        self._rates: Dict[str, float] = {}
+        self._fetched_at = 0.0
+        # Re-entrant: the snapshot is loaded (and counted in stats) while the lock is held
+        self._lock = threading.RLock()
+        self._refreshing = False
+        self.stats = {'fetches': 0, 'fetch_failures': 0, 'background_refreshes': 0, 'snapshot_loads': 0}
+
+    def _count(self, stat: str):
+        """Increment a stats counter; refreshes run on several threads"""
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _fetch_rates(self) -> Optional[Dict[str, float]]:
+        """Fetch all rates against the base currency from the CDN sources"""
+        base = self.BASE_CURRENCY.lower()
+        for source in FX_SOURCES:
+            url = source.format(base=base)
+            try:
+                resp = http_client.get(url, timeout=5, retries=1)
+                if resp.status_code == 200:
+                    data = resp.json().get(base, {})
+                    rates = {code.upper(): float(rate) for code, rate in data.items()
+                             if isinstance(rate, (int, float)) and rate > 0}
+                    if rates:
+                        rates[self.BASE_CURRENCY] = 1.0
+                        self._count('fetches')
+                        logger.info(f"[FX] Fetched {len(rates)} rates from {url}")
+                        return rates
+                logger.warning(f"[FX] Currency API request failed: {url} (status {resp.status_code})")
+            except Exception as e:
+                logger.warning(f"[FX] Error fetching rates from {url}: {e}")
+        self._count('fetch_failures')
+        return None
+
+    def _load_snapshot(self) -> bool:
+        """Load last known good rates from disk"""
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            rates = snapshot.get('rates') or {}
+            if not rates:
+                return False
+            self._rates = {code: float(rate) for code, rate in rates.items()}
+            self._fetched_at = float(snapshot.get('fetched_at', 0))
+            self._count('snapshot_loads')
+            logger.info(f"[FX] Loaded rate snapshot from {self.snapshot_path}")
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"[FX] Could not load rate snapshot: {e}")
+            return False
+
+    def _save_snapshot(self):
+        """Persist the current rates as the last known good snapshot"""
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'base': self.BASE_CURRENCY, 'fetched_at': self._fetched_at, 'rates': self._rates}, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            logger.warning(f"[FX] Could not write rate snapshot: {e}")
+
+    def refresh(self) -> bool:
+        """Fetch fresh rates synchronously; keeps the old rates if the fetch fails"""
+        rates = self._fetch_rates()
+        if not rates:
+            return False
+        with self._lock:
+            self._rates = rates
+            self._fetched_at = time.time()
+        self._save_snapshot()
+        return True
+
+    def _background_refresh(self):
+        try:
+            self._count('background_refreshes')
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _get_rates(self) -> Dict[str, float]:
+        """Return the rate table, refreshing it according to the TTL policy"""
+        if not self._rates:
+            with self._lock:
+                if not self._rates:
+                    self._load_snapshot()
+
+        age = time.time() - self._fetched_at
+        if self._rates and age < self.ttl:
+            return self._rates
+
+        if self._rates and age < self.max_stale:
+            # Serve stale rates and revalidate in the background
+            with self._lock:
+                if self._refreshing:
+                    return self._rates
+                self._refreshing = True
+            threading.Thread(target=self._background_refresh, name='fx-refresh', daemon=True).start()
+            return self._rates
+
+        if not self.refresh() and self._rates:
+            logger.warning("[FX] Using last known good rates after failed refresh")
+        return self._rates
+
+    @staticmethod
+    def major_unit(currency: Optional[str]):
+        """(ISO code, minor units per major unit) for a currency code; GBp -> ('GBP', 100)"""
+        if currency in MINOR_CURRENCY_UNITS:
+            return MINOR_CURRENCY_UNITS[currency]
+        return (currency or FXService.BASE_CURRENCY).upper(), 1
+
+    def get_rate(self, from_currency: str, to_currency: str = 'EUR') -> Optional[float]:
+        """
+        Get the conversion rate between two currencies (minor units like GBp are scaled).
+        Returns None if no rate is known for either currency, so callers can pick their own fallback.
+        """
+        from_code, from_units = self.major_unit(from_currency)
+        to_code, to_units = self.major_unit(to_currency)
+        scale = to_units / from_units
+        if from_code == to_code:
+            return scale
+        rates = self._get_rates()
+        if from_code not in rates or to_code not in rates:
+            logger.warning(f"[FX] No rate for {from_code}->{to_code}")
+            return None
+        return rates[to_code] / rates[from_code] * scale
+
+    def convert(self, amount: float, from_currency: str, to_currency: str = 'EUR') -> Optional[float]:
+        """Convert an amount between two currencies; None if no rate is known"""
+        rate = self.get_rate(from_currency, to_currency)
+        if rate is None:
+            return None
+        return amount * rate
+
+    def get_matrix(self, currencies: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Get a cross-rate matrix {from: {to: rate}} for the given currencies
+        (all known currencies if omitted)
+        """
+        rates = self._get_rates()
+        codes = [c.upper() for c in currencies] if currencies else sorted(rates)
+        codes = [c for c in codes if c in rates]
+        return {src: {dst: rates[dst] / rates[src] for dst in codes} for src in codes}
+
+    def get_status(self) -> Dict:
+        """Get cache status information"""
+        with self._lock:
+            stats = dict(self.stats)
+        return {
+            'currencies': len(self._rates),
+            'fetched_at': self._fetched_at,
+            'age_seconds': round(time.time() - self._fetched_at, 1) if self._fetched_at else None,
+            'ttl': self.ttl,
+            'stats': stats,
+        }
+
+
+# Global service instance
+fx_service = FXService()
@@ -0,0 +1,289 @@
+"""
+Shared HTTP Client
+Pooled keep-alive connections per host for all scrapers and services
+
+Features:
+- One requests.Session per host with a bounded connection pool (keep-alive)
+- gzip/deflate compression, plus brotli when the brotli package is installed
+- Retry with exponential backoff and full jitter on connection errors, 429 and 5xx
+- Per-host timeout settings
+- Per-host circuit breaker and adaptive rate limiting (see resilience.py)
+- Async face: httpx.AsyncClient (optionally HTTP/2) when httpx is installed,
+  otherwise the sync client is run in a worker thread
+
+Usage:
+    from http_client import http_client
+    resp = http_client.get("https://steamcommunity.com/inventory/...", timeout=30)
+    resp = await http_client.aget("https://skinsearch.com/api/...")
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from resilience import get_host_guard
+
+# Try to import httpx for the async/HTTP2 face, fallback to threads if not available
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# urllib3 only decodes brotli responses when a brotli package is installed
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Default timeouts (seconds) per upstream host
+DEFAULT_HOST_TIMEOUTS = {
+    'skinsearch.com': 15,
+    'steamcommunity.com': 30,
+    'cdn.jsdelivr.net': 5,
+    'latest.currency-api.pages.dev': 5,
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Errors raised before anything reached the host; they say nothing about its health
+if HTTPX_AVAILABLE:
+    ASYNC_LOCAL_ERRORS = (httpx.InvalidURL, httpx.UnsupportedProtocol)
+else:
+    ASYNC_LOCAL_ERRORS = ()
+LOCAL_ERRORS = (requests.exceptions.InvalidURL, requests.exceptions.MissingSchema,
+                requests.exceptions.InvalidSchema, requests.exceptions.InvalidHeader,
+                requests.exceptions.URLRequired)
+
+
+class HttpClient:
+    """Pooled HTTP client with retries, backoff and per-host settings"""
+
+    def __init__(self, pool_maxsize: int = 20, max_retries: int = 2, backoff_base: float = 0.5,
+                 backoff_max: float = 8.0, default_timeout: float = 15,
+                 host_timeouts: Optional[Dict[str, float]] = None, http2: bool = False):
+        """
+        Args:
+            pool_maxsize: Maximum keep-alive connections per host
+            max_retries: Retries after the first attempt for retryable failures
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Upper bound for a single backoff delay
+            default_timeout: Timeout for hosts without a specific setting
+            host_timeouts: Per-host timeout overrides
+            http2: Use HTTP/2 on the async face (requires httpx with h2)
+        """
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.default_timeout = default_timeout
+        self.host_timeouts = {**DEFAULT_HOST_TIMEOUTS, **(host_timeouts or {})}
+        self.http2 = http2
+        self.default_headers = {
+            'Accept-Encoding': 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate',
+            'Connection': 'keep-alive',
+        }
+        self._sessions: Dict[str, requests.Session] = {}
+        # Keyed weakly by event loop: a client dies with its loop and is never handed to a new loop
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def configure_host(self, host: str, timeout: Optional[float] = None):
+        """Override settings for a single host"""
+        if timeout is not None:
+            self.host_timeouts[host.lower()] = timeout
+
+    def timeout_for(self, host: str) -> float:
+        return self.host_timeouts.get(host, self.default_timeout)
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Delay before retry number `attempt` (1-based), honoring Retry-After when given"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def _record_status(guard, status_code: int, final: bool):
+        """
+        Report a response to the host guard. Retryable statuses count against the circuit only
+        once the retries are used up, and a 500 never does: it usually means one broken page
+        (e.g. a single item URL), not a host that is down.
+        """
+        if status_code not in RETRY_STATUSES:
+            guard.record_success()
+        elif status_code == 500 or not final:
+            guard.release(slow_down=True)
+        else:
+            guard.record_failure(throttled=status_code == 429)
+
+    def _session_for(self, host: str) -> requests.Session:
+        """Get (or create) the pooled session for a host"""
+        session = self._sessions.get(host)
+        if session is not None:
+            return session
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update(self.default_headers)
+                self._sessions[host] = session
+        return session
+
+    def request(self, method: str, url: str, retries: Optional[int] = None,
+                timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """
+        Send a request through the host's pooled session.
+
+        Connection errors, timeouts, 429 and 5xx responses are retried with backoff.
+        The last response is returned (or the last exception raised) when retries run out.
+        """
+        host = self.host_of(url)
+        session = self._session_for(host)
+        retries = self.max_retries if retries is None else retries
+        timeout = timeout if timeout is not None else self.timeout_for(host)
+
+        guard = get_host_guard(host)
+        for attempt in range(retries + 1):
+            # Fails fast with CircuitOpenError while the host is marked down
+            guard.before_call()
+            try:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                guard.record_failure()
+                if attempt >= retries:
+                    raise
+                delay = self.backoff_delay(attempt + 1)
+                logger.warning(f"[HTTP] {method} {host} failed ({e}); retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            except LOCAL_ERRORS:
+                guard.release()
+                raise
+            except requests.RequestException:
+                # Broken transfers, decoding errors, redirect loops: the host misbehaved
+                guard.record_failure()
+                raise
+            except BaseException:
+                # KeyboardInterrupt and the like; the half-open trial must still end
+                guard.release()
+                raise
+
+            self._record_status(guard, response.status_code, final=attempt >= retries)
+            if response.status_code in RETRY_STATUSES and attempt < retries:
+                delay = self.backoff_delay(attempt + 1, response.headers.get('Retry-After'))
+                logger.warning(f"[HTTP] {method} {host} returned {response.status_code}; retrying in {delay:.2f}s")
+                response.close()
+                time.sleep(delay)
+                continue
+            return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def _async_client(self):
+        """Get the httpx.AsyncClient bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                limits = httpx.Limits(max_keepalive_connections=self.pool_maxsize, max_connections=self.pool_maxsize * 4)
+                client = httpx.AsyncClient(http2=self.http2, limits=limits, headers=self.default_headers)
+                self._async_clients[loop] = client
+        return client
+
+    async def arequest(self, method: str, url: str, retries: Optional[int] = None,
+                       timeout: Optional[float] = None, **kwargs):
+        """
+        Async request. Returns an httpx.Response when httpx is installed,
+        otherwise a requests.Response from the sync client run in a thread.
+        """
+        if not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(self.request, method, url, retries=retries, timeout=timeout, **kwargs)
+
+        host = self.host_of(url)
+        client = self._async_client()
+        retries = self.max_retries if retries is None else retries
+        timeout = timeout if timeout is not None else self.timeout_for(host)
+
+        guard = get_host_guard(host)
+        for attempt in range(retries + 1):
+            await asyncio.to_thread(guard.before_call)
+            try:
+                response = await client.request(method, url, timeout=timeout, **kwargs)
+            except (httpx.ConnectError, httpx.TimeoutException, httpx.RemoteProtocolError) as e:
+                guard.record_failure()
+                if attempt >= retries:
+                    raise
+                delay = self.backoff_delay(attempt + 1)
+                logger.warning(f"[HTTP] {method} {host} failed ({e}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            except ASYNC_LOCAL_ERRORS:
+                guard.release()
+                raise
+            except (httpx.TransportError, httpx.DecodingError, httpx.TooManyRedirects):
+                guard.record_failure()
+                raise
+            except BaseException:
+                # Including cancellation: a half-open trial must not stay in flight forever
+                guard.release()
+                raise
+
+            self._record_status(guard, response.status_code, final=attempt >= retries)
+            if response.status_code in RETRY_STATUSES and attempt < retries:
+                delay = self.backoff_delay(attempt + 1, response.headers.get('Retry-After'))
+                logger.warning(f"[HTTP] {method} {host} returned {response.status_code}; retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            return response
+
+    async def aget(self, url: str, **kwargs):
+        return await self.arequest('GET', url, **kwargs)
+
+    async def aclose(self):
+        """Close the async client bound to the running event loop"""
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def close(self):
+        """Close all pooled sessions"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+# Global client instance
+http_client = HttpClient(http2=os.getenv('HTTP_CLIENT_HTTP2', '').lower() in ('1', 'true', 'yes'))
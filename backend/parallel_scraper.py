@@ -2,6 +2,23 @@
 """
 Multi-instance parallel scraper for CSGOSkins.gg
 Uses multiple browser instances to scrape items in parallel for dramatically improved performance
+
+Modes:
+- processes: one Chrome per instance, restarted every 2 items
+- tabs: one Chrome; every instance drives its own tab through a separate WebDriver
+  session attached to that browser's debugger address, items are dealt round-robin
+  and tabs are replaced (not browsers restarted) every 2 items
+
+Each run reports items per second and the memory (RSS of chromedriver and Chrome,
+needs psutil) per concurrent lookup, so both modes can be compared.
+
+Configuration:
+    PARALLEL_SCRAPER_MODE   processes or tabs (default processes)
+
+Usage:
+    python parallel_scraper.py             # test run, processes mode
+    python parallel_scraper.py --tabs      # test run, tabs mode
+    python parallel_scraper.py --compare   # both modes on the same items, reports side by side
 """
 
 import sys
@@ -14,35 +31,130 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from queue import Queue
 import random
 
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
 # Add the backend directory to the path
 backend_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, backend_dir)
 
 from scrapers.csgoskins_scraper import CSGOSkinsGGScraper
 
+# Try to import webdriver_manager, fallback if not available
+try:
+    from webdriver_manager.chrome import ChromeDriverManager
+    WEBDRIVER_MANAGER_AVAILABLE = True
+except ImportError:
+    WEBDRIVER_MANAGER_AVAILABLE = False
+
+# psutil is only needed for the memory report
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+PARALLEL_MODES = ('processes', 'tabs')
+PARALLEL_MODE = os.getenv('PARALLEL_SCRAPER_MODE', 'processes').strip().lower()
+MEMORY_SAMPLE_INTERVAL = 0.5
+
+
+class MemorySampler:
+    """Samples the combined RSS of the chromedriver process trees (including Chrome) of running scrapers"""
+    
+    def __init__(self, interval=MEMORY_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.pids = set()
+        self.samples = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def track(self, driver):
+        """Include a driver's chromedriver (and every process it started) in the samples"""
+        try:
+            pid = driver.service.process.pid
+        except AttributeError:
+            return
+        with self._lock:
+            self.pids.add(pid)
+    
+    def sample(self):
+        """Current RSS in MB, or None without psutil"""
+        if not PSUTIL_AVAILABLE:
+            return None
+        with self._lock:
+            pids = list(self.pids)
+        rss = {}
+        for pid in pids:
+            try:
+                process = psutil.Process(pid)
+                for p in [process] + process.children(recursive=True):
+                    rss[p.pid] = p.memory_info().rss
+            except psutil.Error:
+                with self._lock:
+                    self.pids.discard(pid)  # Browser was restarted or closed
+        total = sum(rss.values()) / (1024 * 1024)
+        if rss:
+            self.samples.append(total)
+        return total
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+    
+    def start(self):
+        if PSUTIL_AVAILABLE:
+            self._thread = threading.Thread(target=self._run, name='parallel-memory-sampler', daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+    
+    @property
+    def peak_mb(self):
+        return max(self.samples) if self.samples else None
+    
+    @property
+    def mean_mb(self):
+        return sum(self.samples) / len(self.samples) if self.samples else None
+
 class ParallelCSGOSkinsScraper:
     """
     Parallel scraper using multiple CSGOSkins.gg scraper instances
     """
     
-    def __init__(self, num_instances=3, headless=True):
+    def __init__(self, num_instances=3, headless=True, mode=None):
         """
         Initialize parallel scraper
         
         Args:
             num_instances (int): Number of parallel scraper instances (default: 3)
             headless (bool): Whether to run browsers in headless mode
+            mode (str): 'processes' (one browser per instance) or 'tabs' (one tab per
+                        instance in a single browser); default PARALLEL_SCRAPER_MODE
         """
         self.num_instances = num_instances
         self.headless = headless
+        self.mode = (mode or PARALLEL_MODE).lower()
+        if self.mode not in PARALLEL_MODES:
+            raise ValueError(f"Unknown parallel mode '{self.mode}', expected one of {PARALLEL_MODES}")
         self.scrapers = []
         self.results_queue = Queue()
+        self.memory = MemorySampler()
+        self.browser_starts = 0
+        self.tab_opens = 0
+        self._counter_lock = threading.Lock()  # Counters are bumped from worker threads
+        self.report = {}
         
-        logger.info(f"Initializing parallel scraper with {num_instances} instances")
+        logger.info(f"Initializing parallel scraper with {num_instances} instances ({self.mode} mode)")
     
     def create_scraper_instance(self, instance_id):
         """
@@ -61,6 +173,8 @@ class ParallelCSGOSkinsScraper:
             time.sleep(instance_id * 0.5)
             
             if scraper.setup_driver():
+                self.count('browser_starts')
+                self.memory.track(scraper.driver)
                 logger.info(f"✅ Scraper instance {instance_id} ready")
                 return scraper
             else:
@@ -71,7 +185,84 @@ class ParallelCSGOSkinsScraper:
             logger.error(f"❌ Error creating scraper instance {instance_id}: {e}")
             return None
     
-    def scrape_item_batch(self, scraper, items_batch, instance_id):
+    def count(self, counter):
+        """Increment browser_starts or tab_opens (called from worker threads)"""
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def attach_tab(self, debugger_address):
+        """
+        Open a new tab in an already running Chrome and return a WebDriver session bound to it
+        
+        Args:
+            debugger_address (str): host:port of the browser's remote debugging endpoint
+            
+        Returns:
+            WebDriver: Session whose current window is the new tab
+        """
+        chrome_options = Options()
+        chrome_options.add_experimental_option('debuggerAddress', debugger_address)
+        service = Service(ChromeDriverManager().install()) if WEBDRIVER_MANAGER_AVAILABLE else Service()
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+        driver.switch_to.new_window('tab')
+        self.count('tab_opens')
+        self.memory.track(driver)
+        return driver
+    
+    def recycle_tab(self, driver):
+        """Replace the driver's current tab with a fresh one (the tabs mode counterpart of a browser restart)"""
+        old_handle = driver.current_window_handle
+        driver.switch_to.new_window('tab')
+        new_handle = driver.current_window_handle
+        driver.switch_to.window(old_handle)
+        driver.close()
+        driver.switch_to.window(new_handle)
+        self.count('tab_opens')
+    
+    def create_tab_instances(self):
+        """
+        Start one browser and attach a scraper to a separate tab of it per instance
+        
+        Returns:
+            list: Scraper instances; the first one owns the browser
+        """
+        primary = self.create_scraper_instance(1)
+        if not primary:
+            return []
+        
+        scrapers = [primary]
+        try:
+            debugger_address = primary.driver.capabilities['goog:chromeOptions']['debuggerAddress']
+        except (AttributeError, KeyError, TypeError):
+            logger.error("Browser exposes no debugger address - running a single tab")
+            return scrapers
+        
+        for instance_id in range(2, self.num_instances + 1):
+            try:
+                scraper = CSGOSkinsGGScraper(headless=self.headless)
+                scraper.driver = self.attach_tab(debugger_address)
+                scrapers.append(scraper)
+                logger.info(f"✅ Scraper tab {instance_id} ready")
+            except Exception as e:
+                logger.error(f"❌ Failed to open scraper tab {instance_id}: {e}")
+        return scrapers
+    
+    def close_tab_instances(self, scrapers):
+        """Close the attached tabs, then the browser that owns them"""
+        for scraper in scrapers[1:]:
+            try:
+                scraper.driver.close()
+                scraper.driver.quit()  # Detaches; the browser belongs to the first scraper
+            except Exception as e:
+                logger.debug(f"Error closing scraper tab: {e}")
+            scraper.driver = None
+        if scrapers:
+            try:
+                scrapers[0].close()
+            except Exception as e:
+                logger.error(f"Error closing shared browser: {e}")
+    
+    def scrape_item_batch(self, scraper, items_batch, instance_id, tab=False):
         """
         Scrape a batch of items using a single scraper instance with fresh browser per item
         
@@ -79,6 +270,8 @@ class ParallelCSGOSkinsScraper:
             scraper (CSGOSkinsGGScraper): Scraper instance to use
             items_batch (list): List of items to scrape
             instance_id (int): Instance ID for logging
+            tab (bool): The scraper drives a tab of a shared browser; refresh the tab
+                        instead of restarting the browser, and leave closing to the caller
             
         Returns:
             list: Results from this batch
@@ -104,15 +297,21 @@ class ParallelCSGOSkinsScraper:
                     
                     # ENHANCED FRESH BROWSER STRATEGY: Restart browser every 2 items + randomize timing
                     if i > 0 and i % 2 == 0:
-                        logger.info(f"Instance {instance_id}: 🔄 Refreshing browser for item #{i+1} to prevent slowdown")
-                        scraper.close()
+                        logger.info(f"Instance {instance_id}: 🔄 Refreshing {'tab' if tab else 'browser'} for item #{i+1} to prevent slowdown")
+                        if not tab:
+                            scraper.close()
                         
                         # Add random delay before restarting to break patterns
                         pattern_break_delay = random.uniform(1.0, 3.0)
                         logger.info(f"Instance {instance_id}: ⏸️ Pattern-breaking delay: {pattern_break_delay:.2f}s")
                         time.sleep(pattern_break_delay)
                         
-                        if not scraper.setup_driver():
+                        if tab:
+                            self.recycle_tab(scraper.driver)
+                        elif scraper.setup_driver():
+                            self.count('browser_starts')
+                            self.memory.track(scraper.driver)
+                        else:
                             logger.error(f"Instance {instance_id}: Failed to restart browser")
                             continue
                     
@@ -151,8 +350,8 @@ class ParallelCSGOSkinsScraper:
             logger.error(f"Instance {instance_id}: Batch processing error: {e}")
         
         finally:
-            # Clean up this instance
-            if scraper:
+            # Clean up this instance (tabs are closed together once every instance is done)
+            if scraper and not tab:
                 scraper.close()
         
         return results
@@ -196,6 +395,20 @@ class ParallelCSGOSkinsScraper:
         
         return batches
     
+    def distribute_round_robin(self, items_data, num_batches):
+        """
+        Deal items across instances in turn (item 1 to instance 1, item 2 to instance 2, ...)
+        
+        Args:
+            items_data (list): List of all items to scrape
+            num_batches (int): Number of instances that are ready
+            
+        Returns:
+            list: List of batches, one per instance
+        """
+        batches = [items_data[i::num_batches] for i in range(num_batches)]
+        return [batch for batch in batches if batch]
+    
     def scrape_parallel(self, items_data):
         """
         Scrape items in parallel using multiple instances
@@ -209,44 +422,64 @@ class ParallelCSGOSkinsScraper:
         if not items_data:
             return []
         
-        logger.info(f"🚀 Starting parallel scraping of {len(items_data)} items with {self.num_instances} instances")
+        logger.info(f"🚀 Starting parallel scraping of {len(items_data)} items with {self.num_instances} instances ({self.mode} mode)")
         start_time = time.time()
+        self.browser_starts = 0
+        self.tab_opens = 0
+        self.memory = MemorySampler()
+        self.memory.start()
         
-        # Distribute items across instances
-        item_batches = self.distribute_items(items_data)
-        
-        if not item_batches:
-            logger.warning("No item batches created")
-            return []
-        
-        all_results = []
-        
-        # Use ThreadPoolExecutor for parallel processing
-        with ThreadPoolExecutor(max_workers=self.num_instances) as executor:
-            # Submit scraping tasks
-            future_to_instance = {}
+        tab_scrapers = []
+        future_to_instance = {}
+        try:
+            if self.mode == 'tabs':
+                # One browser, one tab per instance; items dealt round-robin across the ready tabs
+                tab_scrapers = self.create_tab_instances()
+                item_batches = self.distribute_round_robin(items_data, len(tab_scrapers)) if tab_scrapers else []
+            else:
+                # Distribute items across instances
+                item_batches = self.distribute_items(items_data)
             
-            for instance_id, batch in enumerate(item_batches):
-                scraper = self.create_scraper_instance(instance_id + 1)
-                if scraper:
-                    future = executor.submit(self.scrape_item_batch, scraper, batch, instance_id + 1)
-                    future_to_instance[future] = instance_id + 1
-                else:
-                    logger.error(f"Skipping instance {instance_id + 1} due to setup failure")
+            if not item_batches:
+                logger.warning("No item batches created")
+                return []
             
-            # Collect results as they complete
-            completed_instances = 0
-            for future in as_completed(future_to_instance):
-                instance_id = future_to_instance[future]
-                try:
-                    batch_results = future.result()
-                    all_results.extend(batch_results)
-                    completed_instances += 1
+            all_results = []
+            
+            # Use ThreadPoolExecutor for parallel processing
+            with ThreadPoolExecutor(max_workers=self.num_instances) as executor:
+                # Submit scraping tasks
+            
+                for instance_id, batch in enumerate(item_batches):
+                    if tab_scrapers:
+                        future = executor.submit(self.scrape_item_batch, tab_scrapers[instance_id], batch, instance_id + 1, True)
+                        future_to_instance[future] = instance_id + 1
+                        continue
+                    scraper = self.create_scraper_instance(instance_id + 1)
+                    if scraper:
+                        future = executor.submit(self.scrape_item_batch, scraper, batch, instance_id + 1)
+                        future_to_instance[future] = instance_id + 1
+                    else:
+                        logger.error(f"Skipping instance {instance_id + 1} due to setup failure")
+            
+                # Collect results as they complete
+                completed_instances = 0
+                for future in as_completed(future_to_instance):
+                    instance_id = future_to_instance[future]
+                    try:
+                        batch_results = future.result()
+                        all_results.extend(batch_results)
+                        completed_instances += 1
                     
-                    logger.info(f"✅ Instance {instance_id} completed ({completed_instances}/{len(future_to_instance)})")
+                        logger.info(f"✅ Instance {instance_id} completed ({completed_instances}/{len(future_to_instance)})")
                     
-                except Exception as e:
-                    logger.error(f"❌ Instance {instance_id} failed: {e}")
+                    except Exception as e:
+                        logger.error(f"❌ Instance {instance_id} failed: {e}")
+        finally:
+            # Last sample while every browser/tab is still open; tabs and sampler never outlive the run
+            self.memory.sample()
+            self.memory.stop()
+            self.close_tab_instances(tab_scrapers)
         
         end_time = time.time()
         total_time = end_time - start_time
@@ -263,6 +496,27 @@ class ParallelCSGOSkinsScraper:
         logger.info(f"   Total time: {total_time:.2f} seconds")
         logger.info(f"   Average per item: {avg_time_per_item:.2f} seconds")
         
+        concurrent = len(future_to_instance)
+        peak_rss = self.memory.peak_mb
+        self.report = {
+            'mode': self.mode,
+            'instances': concurrent,
+            'total_items': total_items,
+            'successful_items': successful_items,
+            'total_seconds': round(total_time, 2),
+            'items_per_second': round(successful_items / total_time, 3) if total_time > 0 else 0,
+            'browser_starts': self.browser_starts,
+            'tab_opens': self.tab_opens,
+            'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+            'mean_rss_mb': round(self.memory.mean_mb, 1) if peak_rss is not None else None,
+            'rss_mb_per_lookup': round(peak_rss / concurrent, 1) if peak_rss is not None and concurrent else None,
+        }
+        logger.info(f"   Throughput: {self.report['items_per_second']} items/s, "
+                    f"{self.browser_starts} browser starts, {self.tab_opens} tabs opened")
+        if peak_rss is not None:
+            logger.info(f"   Memory: peak {self.report['peak_rss_mb']} MB, "
+                        f"{self.report['rss_mb_per_lookup']} MB per concurrent lookup")
+        
         # Calculate performance improvement
         estimated_sequential_time = total_items * 20  # Assume 20s per item sequentially
         if total_time > 0:
@@ -274,11 +528,42 @@ class ParallelCSGOSkinsScraper:
     def cleanup(self):
         """Clean up all scraper instances"""
         logger.info("🧹 Cleaning up parallel scraper instances...")
-        # Note: Individual scrapers are cleaned up automatically in scrape_item_batch
+        # Note: Individual scrapers (and tabs) are cleaned up automatically in scrape_parallel
         # This method exists for API compatibility
         logger.info("✅ Cleanup completed")
 
-def test_parallel_scraping():
+def compare_modes(items_data, num_instances=3, headless=True):
+    """
+    Scrape the same items in processes mode and in tabs mode and print their reports side by side
+    
+    Returns:
+        dict: Report per mode
+    """
+    reports = {}
+    for mode in PARALLEL_MODES:
+        parallel_scraper = ParallelCSGOSkinsScraper(num_instances=num_instances, headless=headless, mode=mode)
+        parallel_scraper.scrape_parallel(items_data)
+        reports[mode] = parallel_scraper.report
+    
+    def show(value, fmt):
+        return format(value, fmt) if value is not None else 'n/a'
+    
+    print(f"\n{'':<24} {'processes':>12} {'tabs':>12}")
+    for key, label, fmt in [
+        ('successful_items', 'Successful items', 'd'),
+        ('total_seconds', 'Total time (s)', '.1f'),
+        ('items_per_second', 'Items per second', '.3f'),
+        ('browser_starts', 'Browser starts', 'd'),
+        ('tab_opens', 'Tabs opened', 'd'),
+        ('peak_rss_mb', 'Peak RSS (MB)', '.0f'),
+        ('rss_mb_per_lookup', 'RSS per lookup (MB)', '.0f'),
+    ]:
+        print(f"{label:<24} {show(reports['processes'].get(key), fmt):>12} {show(reports['tabs'].get(key), fmt):>12}")
+    if not PSUTIL_AVAILABLE:
+        print("(install psutil for the memory figures)")
+    return reports
+
+def test_parallel_scraping(mode=None):
     """Test the parallel scraping system"""
     print("🚀 Testing Parallel CSGOSkins.gg Scraping")
     print("=" * 60)
@@ -301,7 +586,8 @@ def test_parallel_scraping():
     num_instances = 3  # Use 3 instances for testing
     parallel_scraper = ParallelCSGOSkinsScraper(
         num_instances=num_instances, 
-        headless=True  # Set to False for debugging
+        headless=True,  # Set to False for debugging
+        mode=mode
     )
     
     print(f"📋 Testing {len(test_items)} items with {num_instances} parallel instances")
@@ -384,7 +670,17 @@ def test_parallel_scraping():
         return False
 
 if __name__ == '__main__':
-    success = test_parallel_scraping()
+    if '--compare' in sys.argv:
+        compare_modes([
+            {'name': 'AK-47 | Redline', 'condition': 'FT'},
+            {'name': 'AWP | Asiimov', 'condition': 'FT'},
+            {'name': 'M4A1-S | Hyper Beast', 'condition': 'FT'},
+            {'name': 'Glock-18 | Water Elemental', 'condition': 'MW'},
+            {'name': 'USP-S | Kill Confirmed', 'condition': 'MW'},
+            {'name': 'Desert Eagle | Blaze', 'condition': 'FN'},
+        ])
+        sys.exit(0)
+    success = test_parallel_scraping(mode='tabs' if '--tabs' in sys.argv else None)
     if success:
         print("\n🎉 Parallel scraping test successful!")
     else:
@@ -0,0 +1,212 @@
+"""
+Upstream Resilience
+Per-host circuit breakers and adaptive (AIMD) token-bucket rate limiting
+
+Each upstream host gets a HostGuard that combines:
+- CircuitBreaker: closed -> open after consecutive failures, half-open after a
+  cool-down, closed again after a successful trial call
+- AdaptiveRateLimiter: token bucket whose rate grows additively on success and
+  shrinks multiplicatively on 429/5xx/timeouts
+
+Usage:
+    guard = get_host_guard('skinsearch.com')
+    guard.before_call()          # raises CircuitOpenError when the host is down
+    ...
+    guard.record_success() / guard.record_failure(throttled=True)
+    guard.release()              # outcome says nothing about the host (our own error, retry pending)
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Starting request rate (requests/second) per host
+DEFAULT_HOST_RATES = {
+    'skinsearch.com': 5.0,
+    'steamcommunity.com': 0.5,
+    'cdn.jsdelivr.net': 5.0,
+    'latest.currency-api.pages.dev': 5.0,
+    'query1.finance.yahoo.com': 2.0,
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is attempted against a host whose circuit is open"""
+
+    def __init__(self, host: str, retry_in: float):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f"Circuit open for {host}; retry in {retry_in:.0f}s")
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for one upstream host"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, host: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 trial_timeout: Optional[float] = None):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        # A trial whose outcome was never recorded stops blocking the host after this long
+        self.trial_timeout = trial_timeout if trial_timeout is not None else recovery_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Allow the call or raise CircuitOpenError"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            elapsed = time.monotonic() - self.opened_at
+            if self.state == self.OPEN and elapsed >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+                logger.info(f"[Circuit] {self.host} half-open, allowing a trial request")
+            now = time.monotonic()
+            if self.state == self.HALF_OPEN and self._trial_in_flight and now - self._trial_started >= self.trial_timeout:
+                logger.warning(f"[Circuit] {self.host} trial request lost, allowing another")
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                self._trial_started = now
+                return
+            if self.state == self.HALF_OPEN:
+                raise CircuitOpenError(self.host, max(0.0, self.trial_timeout - (now - self._trial_started)))
+            raise CircuitOpenError(self.host, max(0.0, self.recovery_timeout - elapsed))
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"[Circuit] {self.host} closed after successful trial request")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def release(self):
+        """End a call without judging the host; a half-open circuit allows the next trial"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                    logger.warning(f"[Circuit] {self.host} opened after {self.consecutive_failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'trips': self.trips,
+            }
+
+
+class AdaptiveRateLimiter:
+    """Token bucket with additive-increase / multiplicative-decrease rate control"""
+
+    def __init__(self, rate: float = 5.0, min_rate: float = 0.2, max_rate: float = 20.0,
+                 burst: float = 5.0, increase: float = 0.1, decrease_factor: float = 0.5):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+
+
+class HostGuard:
+    """Circuit breaker plus adaptive rate limiter for one host"""
+
+    def __init__(self, host: str, rate: Optional[float] = None):
+        self.host = host
+        self.breaker = CircuitBreaker(host)
+        self.limiter = AdaptiveRateLimiter(rate=rate or DEFAULT_HOST_RATES.get(host, 5.0))
+
+    def before_call(self):
+        """Fail fast when the circuit is open, otherwise wait for a rate token"""
+        self.breaker.before_call()
+        self.limiter.acquire()
+
+    def record_success(self):
+        self.breaker.record_success()
+        self.limiter.on_success()
+
+    def record_failure(self, throttled: bool = False):
+        """Register a timeout, connection error or 5xx; throttled=True for 429"""
+        self.breaker.record_failure()
+        self.limiter.on_throttle()
+        if throttled:
+            logger.warning(f"[RateLimit] {self.host} throttled us, rate now {self.limiter.rate:.2f}/s")
+
+    def release(self, slow_down: bool = False):
+        """
+        Neutral outcome: a client-side error, cancellation, or a retryable status with retries
+        left. The breaker is not charged; slow_down still backs off the rate limiter.
+        """
+        self.breaker.release()
+        if slow_down:
+            self.limiter.on_throttle()
+
+    def status(self) -> Dict[str, Any]:
+        return {**self.breaker.status(), 'rate_per_second': round(self.limiter.rate, 2)}
+
+
+_guards: Dict[str, HostGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def get_host_guard(host: str) -> HostGuard:
+    """Get the shared guard for a host"""
+    host = host.lower()
+    guard = _guards.get(host)
+    if guard is None:
+        with _guards_lock:
+            guard = _guards.setdefault(host, HostGuard(host))
+    return guard
+
+
+def get_upstream_status() -> Dict[str, Dict[str, Any]]:
+    """Get circuit state and current rate for every host contacted so far"""
+    with _guards_lock:
+        guards = list(_guards.values())
+    return {guard.host: guard.status() for guard in guards}
@@ -0,0 +1,357 @@
+"""
+Browser Pool
+Shared pool of warm Chrome WebDrivers for all Selenium scrapers
+
+Features:
+- lease()/release() semantics with a maximum pool size; lease() waits for a free browser
+- Browsers are keyed by profile (option set) and headless mode, so scrapers that need
+  different Chrome options never share a browser
+- Health check (a trivial script call) before a pooled browser is handed out
+- Recycling after a number of page loads or once the browser's memory (RSS) grows too large
+- Optional warm-up in a background thread at startup
+- Per-lease request blocking (images, fonts, ads, ...) through CDP, see request_blocking.py
+
+Configuration:
+    BROWSER_POOL_SIZE       maximum number of browsers alive at once (default 3)
+    BROWSER_MAX_PAGES       page loads before a browser is recycled (default 200)
+    BROWSER_MAX_RSS_MB      memory of chromedriver + Chrome before recycling (default 1024, needs psutil)
+    BROWSER_LEASE_TIMEOUT   seconds lease() waits for a free browser (default 120)
+    BROWSER_POOL_WARM       browsers started in the background at startup (default 0)
+
+Usage:
+    driver = browser_pool.lease(profile='stealth', headless=True, blocking='CSFloat')
+    try:
+        driver.get("https://csfloat.com/")
+    finally:
+        browser_pool.release(driver)
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from .request_blocking import apply_blocking
+
+# Try to import webdriver_manager, fallback if not available
+try:
+    from webdriver_manager.chrome import ChromeDriverManager
+    WEBDRIVER_MANAGER_AVAILABLE = True
+except ImportError:
+    WEBDRIVER_MANAGER_AVAILABLE = False
+
+# psutil is only needed for the memory based recycling
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+# Chrome option sets; each scraper picks the profile matching the options it used before
+BROWSER_PROFILES = {
+    # CardMarket and Steam
+    'default': {
+        'headless_arg': '--headless',
+        'arguments': ['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu', '--window-size=1920,1080'],
+        'prefs': {},
+        'stealth': False,
+    },
+    # csfloat.com: new headless mode and hidden automation flags
+    'stealth': {
+        'headless_arg': '--headless=new',
+        'arguments': ['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu', '--disable-software-rasterizer',
+                      '--window-size=1920,1080', '--disable-blink-features=AutomationControlled',
+                      '--log-level=3', '--silent'],
+        'prefs': {
+            'profile.default_content_setting_values': {
+                'plugins': 2, 'popups': 2, 'geolocation': 2, 'notifications': 2, 'media_stream': 2,
+            },
+        },
+        'stealth': True,
+    },
+    # SkinSnipe: like stealth, but without images
+    'no_images': {
+        'headless_arg': '--headless',
+        'arguments': ['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu', '--window-size=1920,1080',
+                      '--disable-images', '--disable-plugins', '--disable-extensions', '--disable-web-security',
+                      '--disable-blink-features=AutomationControlled'],
+        'prefs': {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2,
+            'profile.default_content_settings.popups': 0,
+        },
+        'stealth': True,
+    },
+}
+# SkinSnipe in network capture mode: no_images plus the performance log (see network_capture.py)
+BROWSER_PROFILES['no_images_capture'] = {**BROWSER_PROFILES['no_images'], 'performance_log': True}
+
+
+class BrowserPoolError(Exception):
+    """Raised when no browser could be leased"""
+    pass
+
+
+class PooledDriver:
+    """
+    Leased WebDriver. Behaves like the wrapped driver (attribute access is delegated)
+    and counts page loads so the pool knows when to recycle the browser.
+    """
+
+    def __init__(self, driver, profile: str, headless: bool):
+        self.driver = driver
+        self.profile = profile
+        self.headless = headless
+        self.pages = 0
+        self.leases = 0
+        self.blocked_urls: List[str] = []  # Patterns currently set with Network.setBlockedURLs
+        self.created_at = time.time()
+
+    def get(self, url: str):
+        self.pages += 1
+        return self.driver.get(url)
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+
+class BrowserPool:
+    """Bounded pool of reusable Chrome browsers shared by all Selenium scrapers"""
+
+    def __init__(self, max_size: Optional[int] = None, max_pages: Optional[int] = None,
+                 max_rss_mb: Optional[float] = None, lease_timeout: Optional[float] = None):
+        """
+        Args:
+            max_size: Maximum number of browsers alive at once (leased + idle)
+            max_pages: Page loads after which a browser is quit instead of returned to the pool
+            max_rss_mb: Memory (chromedriver and Chrome processes) after which a browser is recycled
+            lease_timeout: Seconds lease() waits for a browser before raising BrowserPoolError
+        """
+        self.max_size = max_size or int(os.getenv('BROWSER_POOL_SIZE', '3'))
+        self.max_pages = max_pages or int(os.getenv('BROWSER_MAX_PAGES', '200'))
+        self.max_rss_mb = max_rss_mb or float(os.getenv('BROWSER_MAX_RSS_MB', '1024'))
+        self.lease_timeout = lease_timeout or float(os.getenv('BROWSER_LEASE_TIMEOUT', '120'))
+        self._idle: List[PooledDriver] = []
+        self._leased: Dict[int, PooledDriver] = {}
+        self._starting = 0
+        self._condition = threading.Condition()
+        self.stats = {'created': 0, 'reused': 0, 'recycled': 0, 'unhealthy': 0, 'waits': 0}
+
+    def _build_options(self, profile: str, headless: bool) -> Options:
+        spec = BROWSER_PROFILES.get(profile, BROWSER_PROFILES['default'])
+        chrome_options = Options()
+        if headless:
+            chrome_options.add_argument(spec['headless_arg'])
+        for argument in spec['arguments']:
+            chrome_options.add_argument(argument)
+        chrome_options.add_argument(f'--user-agent={DEFAULT_USER_AGENT}')
+        if spec['stealth']:
+            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            chrome_options.add_experimental_option('useAutomationExtension', False)
+        if spec['prefs']:
+            chrome_options.add_experimental_option("prefs", spec['prefs'])
+        if spec.get('performance_log'):
+            # Network events for NetworkCapture (see network_capture.py)
+            chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        return chrome_options
+
+    def _launch(self, profile: str, headless: bool) -> PooledDriver:
+        """Start a new Chrome instance"""
+        chrome_options = self._build_options(profile, headless)
+        try:
+            service = Service(ChromeDriverManager().install()) if WEBDRIVER_MANAGER_AVAILABLE else Service()
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+        except Exception:
+            driver = webdriver.Chrome(options=chrome_options)
+        if BROWSER_PROFILES.get(profile, BROWSER_PROFILES['default'])['stealth']:
+            # Hide automation indicators
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self.stats['created'] += 1
+        logger.info(f"[BrowserPool] Started Chrome ({profile}, headless={headless})")
+        return PooledDriver(driver, profile, headless)
+
+    @staticmethod
+    def _quit(pooled: PooledDriver):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.debug(f"[BrowserPool] Error quitting browser: {e}")
+
+    @staticmethod
+    def _is_healthy(pooled: PooledDriver) -> bool:
+        try:
+            return pooled.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _rss_mb(pooled: PooledDriver) -> Optional[float]:
+        """Resident memory of chromedriver and all Chrome processes it started"""
+        if not PSUTIL_AVAILABLE:
+            return None
+        try:
+            process = psutil.Process(pooled.driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except Exception:
+            return None
+
+    def _needs_recycling(self, pooled: PooledDriver) -> Optional[str]:
+        if pooled.pages >= self.max_pages:
+            return f"{pooled.pages} pages loaded"
+        rss = self._rss_mb(pooled)
+        if rss is not None and rss >= self.max_rss_mb:
+            return f"{rss:.0f} MB RSS"
+        return None
+
+    def _total(self) -> int:
+        return len(self._idle) + len(self._leased) + self._starting
+
+    def lease(self, profile: str = 'default', headless: bool = True, implicit_wait: Optional[float] = None,
+              page_load_timeout: Optional[float] = None, timeout: Optional[float] = None,
+              blocking: Optional[str] = None) -> PooledDriver:
+        """
+        Borrow a browser, reusing an idle one with the same profile when possible.
+        blocking names the scraper whose request-blocking allow-list applies (None loads everything).
+        Must be handed back with release().
+        """
+        deadline = time.monotonic() + (self.lease_timeout if timeout is None else timeout)
+        while True:
+            candidate = None
+            evict = None
+            with self._condition:
+                while True:
+                    for pooled in self._idle:
+                        if pooled.profile == profile and pooled.headless == headless:
+                            candidate = pooled
+                            break
+                    if candidate is not None:
+                        self._idle.remove(candidate)
+                        break
+                    if self._total() < self.max_size:
+                        self._starting += 1
+                        break
+                    if self._idle:
+                        # Pool is full of idle browsers with another profile; replace the oldest
+                        evict = self._idle.pop(0)
+                        self._starting += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise BrowserPoolError(f"No browser available within the lease timeout "
+                                               f"({len(self._leased)} leased, max {self.max_size})")
+                    self.stats['waits'] += 1
+                    self._condition.wait(remaining)
+
+            if evict is not None:
+                self._quit(evict)
+
+            if candidate is not None:
+                if not self._is_healthy(candidate):
+                    self.stats['unhealthy'] += 1
+                    logger.warning(f"[BrowserPool] Dropping unresponsive {candidate.profile} browser")
+                    self._quit(candidate)
+                    with self._condition:
+                        self._condition.notify()
+                    continue
+                pooled = candidate
+                self.stats['reused'] += 1
+            else:
+                try:
+                    pooled = self._launch(profile, headless)
+                except Exception as e:
+                    with self._condition:
+                        self._starting -= 1
+                        self._condition.notify()
+                    raise BrowserPoolError(f"Failed to initialize Chrome WebDriver: {e}")
+                with self._condition:
+                    self._starting -= 1
+
+            if implicit_wait is not None:
+                pooled.driver.implicitly_wait(implicit_wait)
+            if page_load_timeout is not None:
+                pooled.driver.set_page_load_timeout(page_load_timeout)
+            apply_blocking(pooled, blocking)
+            pooled.leases += 1
+            with self._condition:
+                self._leased[id(pooled)] = pooled
+            return pooled
+
+    def release(self, pooled: Optional[PooledDriver], discard: bool = False):
+        """Return a leased browser; it is quit instead when discarded, unhealthy or due for recycling"""
+        if pooled is None:
+            return
+        with self._condition:
+            if self._leased.pop(id(pooled), None) is None:
+                return
+        reason = 'discarded' if discard else self._needs_recycling(pooled)
+        if reason is None:
+            try:
+                # Stop whatever the page was doing so the idle browser stays quiet
+                pooled.driver.get('about:blank')
+            except Exception:
+                reason = 'unresponsive'
+        if reason is not None:
+            self.stats['recycled'] += 1
+            logger.info(f"[BrowserPool] Recycling {pooled.profile} browser ({reason})")
+            self._quit(pooled)
+            with self._condition:
+                self._condition.notify()
+            return
+        with self._condition:
+            self._idle.append(pooled)
+            self._condition.notify()
+
+    def warm_up(self, count: Optional[int] = None, profile: str = 'default', headless: bool = True):
+        """Start browsers ahead of the first scrape"""
+        count = min(count if count is not None else int(os.getenv('BROWSER_POOL_WARM', '0')), self.max_size)
+        leased = []
+        try:
+            for _ in range(count):
+                leased.append(self.lease(profile=profile, headless=headless, timeout=0))
+        except Exception as e:
+            logger.warning(f"[BrowserPool] Warm-up stopped after {len(leased)} browsers: {e}")
+        for pooled in leased:
+            self.release(pooled)
+        if leased:
+            logger.info(f"[BrowserPool] Warmed up {len(leased)} {profile} browsers")
+
+    def warm_up_async(self, count: Optional[int] = None, profile: str = 'default', headless: bool = True):
+        """warm_up() in a background thread so startup is never blocked on Chrome"""
+        count = count if count is not None else int(os.getenv('BROWSER_POOL_WARM', '0'))
+        if count > 0:
+            threading.Thread(target=self.warm_up, args=(count, profile, headless),
+                             name='browser-pool-warmup', daemon=True).start()
+
+    def shutdown(self):
+        """Quit all idle browsers (leased ones are quit when they are released)"""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self.max_pages = 0  # Browsers still leased are recycled on release
+        for pooled in idle:
+            self._quit(pooled)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                **self.stats,
+                'max_size': self.max_size,
+                'idle': len(self._idle),
+                'leased': len(self._leased),
+                'starting': self._starting,
+                'profiles': sorted({p.profile for p in self._idle + list(self._leased.values())}),
+            }
+
+
+# Global browser pool instance
+browser_pool = BrowserPool()
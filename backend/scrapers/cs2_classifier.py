@@ -0,0 +1,151 @@
+"""
+CS2 Item Classifier
+Single-pass categorization of Steam inventory descriptions for Counter-Strike 2
+
+Features:
+- Tag rules resolved once per distinct (internal_name, localized_tag_name) pair
+- Name fallbacks as an ordered list of precompiled patterns, memoized per name
+- classify_many() classifies a whole inventory page, once per classid_instanceid
+
+The rule order mirrors the original SteamInventoryScraper checks exactly, so the
+first matching tag (in Steam's tag order) decides the category and names are only
+consulted when no tag matches.
+
+Usage:
+    from scrapers.cs2_classifier import cs2_classifier
+    result = cs2_classifier.classify(description)  # {'is_cs2': True, 'item_category': 'knife'}
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Tag rules in priority order: (rule, substring in internal_name, substring in localized_tag_name)
+TAG_RULES = [
+    ('weapon', 'weapon', 'weapon'),
+    ('knife', 'knife', 'knife'),
+    ('gloves', 'gloves', 'gloves'),
+    ('agent', 'agent', 'agent'),
+    ('sticker', 'sticker', 'sticker'),
+    ('case', 'container', 'container'),
+    ('tool', 'tool', 'tool'),
+    ('spray', 'graffiti', 'graffiti'),
+    ('music_kit', 'musickit', 'music kit'),
+    ('collectible', 'collectible', 'collectible'),
+    ('patch', 'patch', 'patch'),
+]
+
+# Tag rules whose final category depends on the item name: ordered (category, name substring)
+TAG_NAME_REFINEMENTS = {
+    'tool': [('key', 'key'), ('charm', 'charm')],
+    'collectible': [('coin', 'coin'), ('charm', 'charm'), ('pin', 'pin')],
+}
+
+# Name fallbacks in priority order, used when no tag matches
+NAME_RULES = [
+    ('knife', r'knife|karambit|bayonet'),
+    ('gloves', r'glove|wraps'),
+    ('sticker', r'sticker'),
+    ('case', r'weapon case|^(?=.*case).*container'),
+    ('sticker_capsule', r'sticker capsule'),
+    ('autograph_capsule', r'autograph capsule'),
+    ('collectible_capsule', r'collectible capsule'),
+    ('capsule', r'capsule'),
+    ('souvenir_package', r'souvenir package'),
+    ('collection_package', r'collection package'),
+    ('patch_pack', r'patch pack'),
+    ('graffiti_box', r'graffiti box'),
+    ('music_kit_box', r'music kit box'),
+    ('key', r'key'),
+    ('music_kit', r'music kit'),
+    ('spray', r'graffiti|spray'),
+    ('agent', r'agent'),
+    ('coin', r'coin'),
+    ('charm', r'charm'),
+    ('patch', r'patch'),
+    ('pin', r'pin'),
+    ('pass', r'pass'),
+    ('gift', r'gift'),
+    ('collectible', r'collectible'),
+    ('tag', r'tag'),
+    ('weapon', r'ak-47|awp|m4a4|m4a1-s|glock|usp|deagle'),
+]
+
+COMPILED_NAME_RULES = [(category, re.compile(pattern)) for category, pattern in NAME_RULES]
+# Any keyword at all; names without one skip the ordered rules entirely
+NAME_KEYWORDS_RE = re.compile('|'.join(f'(?:{pattern})' for _, pattern in NAME_RULES))
+
+NAME_MEMO_SIZE = 20000
+
+
+@lru_cache(maxsize=4096)
+def _tag_rule(internal_name: str, localized: str) -> Optional[str]:
+    """Rule matched by one tag, or None"""
+    for rule, internal_sub, localized_sub in TAG_RULES:
+        if internal_sub in internal_name or localized_sub in localized:
+            return rule
+    return None
+
+
+@lru_cache(maxsize=NAME_MEMO_SIZE)
+def _name_category(name_lower: str) -> str:
+    """Category from the item name alone"""
+    if not NAME_KEYWORDS_RE.search(name_lower):
+        return 'unknown'
+    for category, pattern in COMPILED_NAME_RULES:
+        if pattern.search(name_lower):
+            return category
+    return 'unknown'
+
+
+def _tag_key(tag: Dict) -> Tuple[str, str]:
+    return tag.get('internal_name', '').lower(), tag.get('localized_tag_name', '').lower()
+
+
+class CS2Classifier:
+    """Categorizes Steam inventory descriptions using precompiled tag and name rules"""
+
+    def category(self, description: Dict, name: Optional[str] = None) -> str:
+        """Determine the category of a CS2 item"""
+        name_lower = (description.get('market_hash_name', '') if name is None else name).lower()
+        for tag in description.get('tags', []):
+            rule = _tag_rule(*_tag_key(tag))
+            if rule is None:
+                continue
+            for category, keyword in TAG_NAME_REFINEMENTS.get(rule, ()):
+                if keyword in name_lower:
+                    return category
+            return rule
+        return _name_category(name_lower)
+
+    def is_cs2_item(self, description: Dict) -> bool:
+        """
+        Whether the description is a CS2 item. The original tag and name scans
+        defaulted to True for anything they did not recognize, so every item is kept.
+        """
+        return True
+
+    def classify(self, description: Dict) -> Dict[str, object]:
+        """Classify a single description"""
+        return {'is_cs2': self.is_cs2_item(description), 'item_category': self.category(description)}
+
+    def classify_many(self, descriptions: Iterable[Dict]) -> List[Dict[str, object]]:
+        """Classify a page of descriptions in one call; shared classid_instanceid results are reused"""
+        seen: Dict[str, Dict[str, object]] = {}
+        results = []
+        for description in descriptions:
+            key = f"{description.get('classid')}_{description.get('instanceid')}"
+            result = seen.get(key)
+            if result is None:
+                result = seen[key] = self.classify(description)
+            results.append(result)
+        return results
+
+    @staticmethod
+    def cache_info() -> Dict[str, object]:
+        """Memo table statistics"""
+        return {'tags': _tag_rule.cache_info()._asdict(), 'names': _name_category.cache_info()._asdict()}
+
+
+# Global classifier instance
+cs2_classifier = CS2Classifier()
@@ -1,49 +1,33 @@
 """
 Improved CSFloat Scraper for retrieving float values and paint seeds
 Fixed version with better selectors, timing, and error handling
+
+Used as the Selenium fallback backend of scrapers.float_resolver
 """
 
 import logging
 import time
 import re
-import os
 from typing import Optional, Dict, Any
-from dataclasses import dataclass
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.keys import Keys
 
-# Try to import webdriver_manager, fallback if not available
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    WEBDRIVER_MANAGER_AVAILABLE = True
-except ImportError:
-    WEBDRIVER_MANAGER_AVAILABLE = False
+from .browser_pool import browser_pool
+from .float_resolver import FloatData
+from .wait_engine import WaitEngine
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
-class FloatData:
-    float_value: Optional[float]
-    paint_seed: Optional[int]
-    inspect_link: Optional[str]
-    weapon_name: Optional[str] = None
-    skin_name: Optional[str] = None
-    wear_rating: Optional[str] = None
-    success: bool = False
-    error: Optional[str] = None
-
 class ImprovedCSFloatScraper:
     """Improved CSFloat scraper with better reliability"""
     
     def __init__(self, headless: bool = True):
         self.driver = None
+        self.wait = None
         self.headless = headless
         self.base_url = "https://csfloat.com/"
         self.logger = logger
@@ -51,61 +35,12 @@ class ImprovedCSFloatScraper:
         self._setup_driver()
         
     def _setup_driver(self):
-        """Setup Chrome WebDriver with improved options"""
-        chrome_options = Options()
-        
-        if self.headless:
-            chrome_options.add_argument('--headless=new')  # Use new headless mode
-        
-        # Essential options for stability
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--disable-software-rasterizer')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        # Better user agent
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        
-        # Performance optimizations (but keep JavaScript enabled!)
-        prefs = {
-            "profile.default_content_setting_values": {
-                "images": 1,  # Allow images (they might be needed for proper rendering)
-                "plugins": 2,
-                "popups": 2,
-                "geolocation": 2,
-                "notifications": 2,
-                "media_stream": 2,
-            },
-            "profile.managed_default_content_settings": {
-                "images": 1
-            }
-        }
-        chrome_options.add_experimental_option("prefs", prefs)
-        
-        # Suppress logging
-        chrome_options.add_argument('--log-level=3')
-        chrome_options.add_argument('--silent')
-        
+        """Lease a Chrome WebDriver (stealth profile: new headless mode, automation flags hidden)"""
         try:
-            if WEBDRIVER_MANAGER_AVAILABLE:
-                service = Service(ChromeDriverManager().install())
-            else:
-                service = Service()
-            
-            service.log_path = 'NUL' if os.name == 'nt' else '/dev/null'
-            
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            # Hide automation indicators
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            self.driver.implicitly_wait(10)
-            self.driver.set_page_load_timeout(30)
-            self.logger.info("Chrome WebDriver initialized successfully")
+            self.driver = browser_pool.lease(profile='stealth', headless=self.headless,
+                                             implicit_wait=10, page_load_timeout=30, blocking='CSFloat')
+            self.wait = WaitEngine(self.driver, 'CSFloat', implicit_wait=10)
+            self.logger.info("Chrome WebDriver leased from browser pool")
             
         except Exception as e:
             raise Exception(f"Failed to initialize Chrome WebDriver: {e}")
@@ -137,11 +72,9 @@ class ImprovedCSFloatScraper:
                     lambda driver: driver.execute_script("return document.readyState") == "complete"
                 )
                 
-                # Additional wait for Angular/React to initialize
-                time.sleep(3)
-                
-                # Try multiple strategies to find the input field
-                input_element = self._find_input_field()
+                # Wait for Angular/React to render the input field
+                input_element = self.wait.until(lambda driver: self._find_input_field(), fixed=3,
+                                                label='input_field', timeout=10)
                 if not input_element:
                     if attempt < max_retries - 1:
                         self.logger.warning("Input field not found, retrying...")
@@ -246,19 +179,15 @@ class ImprovedCSFloatScraper:
             try:
                 # Clear the field multiple ways
                 element.clear()
-                time.sleep(0.5)
                 element.send_keys(Keys.CONTROL + "a")
-                time.sleep(0.2)
                 element.send_keys(Keys.DELETE)
-                time.sleep(0.5)
                 
                 # Enter the text
                 element.send_keys(text)
-                time.sleep(1)
                 
                 # Verify text was entered
-                current_value = element.get_attribute('value')
-                if inspect_link in current_value:
+                if self.wait.until(lambda driver: text in (element.get_attribute('value') or ''),
+                                   fixed=2.2, label='input_value'):
                     self.logger.info("Successfully entered inspect link")
                     return True
                     
@@ -304,7 +233,7 @@ class ImprovedCSFloatScraper:
                     if element.is_displayed() and element.is_enabled():
                         element.click()
                         self.logger.info(f"Clicked button with XPath: {selector}")
-                        time.sleep(2)
+                        self.wait.ready(fixed=2, label='search_submit')
                         return True
             except Exception as e:
                 self.logger.debug(f"XPath selector {selector} failed: {e}")
@@ -320,7 +249,7 @@ class ImprovedCSFloatScraper:
                     if element.is_displayed() and element.is_enabled():
                         element.click()
                         self.logger.info(f"Clicked button with CSS: {selector}")
-                        time.sleep(2)
+                        self.wait.ready(fixed=2, label='search_submit')
                         return True
             except Exception as e:
                 self.logger.debug(f"CSS selector {selector} failed: {e}")
@@ -331,7 +260,7 @@ class ImprovedCSFloatScraper:
             if input_element:
                 input_element.send_keys(Keys.ENTER)
                 self.logger.info("Pressed Enter on input field")
-                time.sleep(2)
+                self.wait.ready(fixed=2, label='search_submit')
                 return True
         except Exception as e:
             self.logger.debug(f"Enter key press failed: {e}")
@@ -339,7 +268,7 @@ class ImprovedCSFloatScraper:
         return False
     
     def _wait_for_results(self):
-        """Wait for results to appear"""
+        """Wait for results to appear (lookup requests finished, then a visible result element)"""
         # Wait for any indication that results are loading or loaded
         result_indicators = [
             # Loading indicators
@@ -358,25 +287,18 @@ class ImprovedCSFloatScraper:
         ]
         
         # First wait for any loading to complete
-        time.sleep(5)
+        self.wait.ready(fixed=5, label='lookup', timeout=10)
         
-        # Then check for results
-        for i in range(10):  # Wait up to 20 seconds
-            try:
-                for selector in result_indicators:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        visible_elements = [e for e in elements if e.is_displayed()]
-                        if visible_elements:
-                            self.logger.info(f"Found results with selector: {selector}")
-                            time.sleep(2)  # Additional wait for content to stabilize
-                            return True
-            except Exception as e:
-                self.logger.debug(f"Result check failed: {e}")
-            
-            time.sleep(2)
+        # Then check for results (up to 20 seconds)
+        element = self.wait.any_element([(By.CSS_SELECTOR, selector) for selector in result_indicators],
+                                        fixed=0, label='results', visible=True, timeout=20)
+        if element is None:
+            return False
         
-        return False
+        self.logger.info("Found results")
+        # Wait for content to stabilize
+        self.wait.ready(fixed=2, label='results_settle')
+        return True
     
     def _extract_float_value(self) -> Optional[float]:
         """Extract float value using improved selectors"""
@@ -501,13 +423,17 @@ class ImprovedCSFloatScraper:
         return info
     
     def cleanup(self):
-        """Clean up WebDriver resources"""
+        """Return the WebDriver to the browser pool"""
+        if self.wait is not None and self.wait.waits:
+            self.logger.info(f"Waits: {self.wait.summary()}")
         if self.driver:
             try:
-                self.driver.quit()
-                self.logger.info("WebDriver cleaned up successfully")
+                browser_pool.release(self.driver)
+                self.logger.info("WebDriver returned to browser pool")
             except Exception as e:
                 self.logger.error(f"Error cleaning up WebDriver: {e}")
+            self.driver = None
+            self.wait = None
     
     def __del__(self):
         """Destructor to ensure cleanup"""
@@ -0,0 +1,369 @@
+"""
+Float Resolver
+Pluggable backends that turn CS2 inspect links into float values and paint seeds
+
+Backends:
+- HttpInspectResolver: plain HTTP/JSON inspect service (csfloat/inspect compatible API,
+  GET /?url=<link> and POST /bulk), batched and resolved concurrently
+- SeleniumFloatResolver: drives csfloat.com in Chrome via ImprovedCSFloatScraper (slow fallback)
+- FallbackFloatResolver: tries a primary backend and hands the failures to a fallback
+- CachedFloatResolver: permanent cache in front of any backend, keyed by the S/M, A and D
+  parts of the inspect link (float and paint seed never change for an asset); a whole
+  inventory is prefetched with one lookup
+
+Configuration:
+    FLOAT_RESOLVER         'http', 'selenium' or 'auto' (default); 'auto' is http with selenium
+                           fallback when FLOAT_INSPECT_URL is set, selenium otherwise
+    FLOAT_INSPECT_URL      base URL of the inspect service (default http://localhost:8080)
+    FLOAT_INSPECT_BATCH    links per bulk request (default 50)
+    FLOAT_INSPECT_COOLDOWN seconds the inspect service is skipped after a connection failure (default 300)
+    FLOAT_CACHE            'mongo' (float_cache collection, in-memory if MongoDB is down),
+                           'memory' or 'off' (default mongo)
+
+Usage:
+    resolver = get_float_resolver()
+    results = resolver.resolve_many([link1, link2])   # {link: FloatData}
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import requests
+
+from http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+INSPECT_ASSET_RE = re.compile(r'A(\d+)D(\d+)')
+INSPECT_KEY_RE = re.compile(r'([SM])(\d+)A(\d+)D(\d+)')
+
+
+@dataclass
+class FloatData:
+    float_value: Optional[float]
+    paint_seed: Optional[int]
+    inspect_link: Optional[str]
+    weapon_name: Optional[str] = None
+    skin_name: Optional[str] = None
+    wear_rating: Optional[str] = None
+    success: bool = False
+    error: Optional[str] = None
+
+
+def is_inspect_link(inspect_link: Optional[str]) -> bool:
+    """Whether the link is a complete steam:// inspect link (placeholders already filled in)"""
+    return bool(inspect_link) and 'steam://' in inspect_link and '%' not in inspect_link.replace('%20', '')
+
+
+def inspect_key(inspect_link: Optional[str]) -> Optional[str]:
+    """Asset identity of an inspect link ('S<owner>A<asset>D<d>' or 'M<listing>A<asset>D<d>')"""
+    if not is_inspect_link(inspect_link):
+        return None
+    match = INSPECT_KEY_RE.search(inspect_link)
+    return ''.join(match.groups()) if match else None
+
+
+def failed(inspect_link: str, error: str) -> FloatData:
+    return FloatData(float_value=None, paint_seed=None, inspect_link=inspect_link, success=False, error=error)
+
+
+class FloatResolver(ABC):
+    """Interface for float/paint seed backends"""
+
+    name = 'base'
+
+    def resolve(self, inspect_link: str) -> FloatData:
+        """Resolve a single inspect link"""
+        return self.resolve_many([inspect_link])[inspect_link]
+
+    @abstractmethod
+    def resolve_many(self, inspect_links: Iterable[str]) -> Dict[str, FloatData]:
+        """Resolve several inspect links; returns {inspect_link: FloatData}"""
+        pass
+
+    def get_float_data(self, inspect_link: str) -> FloatData:
+        """Same signature as ImprovedCSFloatScraper.get_float_data"""
+        return self.resolve(inspect_link)
+
+    def close(self):
+        """Release backend resources"""
+
+    def _cleanup(self):
+        self.close()
+
+
+class HttpInspectResolver(FloatResolver):
+    """Resolves inspect links through an HTTP/JSON inspect service"""
+
+    name = 'http'
+
+    def __init__(self, base_url: Optional[str] = None, batch_size: Optional[int] = None,
+                 max_concurrency: int = 4, timeout: float = 10):
+        """
+        Args:
+            base_url: Inspect service root, e.g. http://localhost:8080
+            batch_size: Links per POST /bulk request
+            max_concurrency: Bulk requests (or single lookups) in flight at once
+            timeout: Request timeout in seconds
+        """
+        self.base_url = (base_url or os.getenv('FLOAT_INSPECT_URL', 'http://localhost:8080')).rstrip('/')
+        self.batch_size = batch_size or int(os.getenv('FLOAT_INSPECT_BATCH', '50'))
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.bulk_supported = True
+        self.cooldown = float(os.getenv('FLOAT_INSPECT_COOLDOWN', '300'))
+        self._unavailable_until = 0.0
+
+    def _check_connection_error(self, error: Exception):
+        """Skip the service for a while if it could not be reached at all"""
+        if isinstance(error, requests.ConnectionError):
+            self._unavailable_until = time.time() + self.cooldown
+            logger.warning(f"[FloatResolver] Inspect service {self.base_url} unreachable, "
+                           f"skipping it for {self.cooldown:.0f}s")
+
+    @property
+    def available(self) -> bool:
+        return time.time() >= self._unavailable_until
+
+    @staticmethod
+    def _parse_item_info(inspect_link: str, info: Optional[Dict]) -> FloatData:
+        """Convert an inspect service 'iteminfo' object"""
+        if not info or info.get('floatvalue') is None:
+            error = (info or {}).get('error') if isinstance(info, dict) else None
+            return failed(inspect_link, error or 'No float data returned')
+        paint_seed = info.get('paintseed')
+        return FloatData(
+            float_value=float(info['floatvalue']),
+            paint_seed=int(paint_seed) if paint_seed is not None else None,
+            inspect_link=inspect_link,
+            weapon_name=info.get('weapon_type'),
+            skin_name=info.get('item_name'),
+            wear_rating=info.get('wear_name'),
+            success=True
+        )
+
+    def _resolve_single(self, inspect_link: str) -> FloatData:
+        if not self.available:
+            return failed(inspect_link, 'Inspect service unavailable')
+        try:
+            resp = http_client.get(f"{self.base_url}/", params={'url': inspect_link}, timeout=self.timeout)
+            if resp.status_code != 200:
+                return failed(inspect_link, f"Inspect service returned {resp.status_code}")
+            data = resp.json()
+            return self._parse_item_info(inspect_link, data.get('iteminfo', data))
+        except Exception as e:
+            self._check_connection_error(e)
+            return failed(inspect_link, f"Inspect service error: {e}")
+
+    def _resolve_batch(self, links: List[str]) -> Dict[str, FloatData]:
+        """One POST /bulk request; falls back to single lookups if the service has no bulk endpoint"""
+        if self.bulk_supported and len(links) > 1:
+            try:
+                resp = http_client.post(f"{self.base_url}/bulk", json={'links': [{'link': link} for link in links]},
+                                        timeout=self.timeout * 2)
+                if resp.status_code == 200:
+                    # Bulk responses are keyed by asset id
+                    data = resp.json()
+                    results = {}
+                    for link in links:
+                        match = INSPECT_ASSET_RE.search(link)
+                        results[link] = self._parse_item_info(link, data.get(match.group(1)) if match else None)
+                    return results
+                if resp.status_code in (404, 405):
+                    logger.info("[FloatResolver] Inspect service has no bulk endpoint, using single lookups")
+                    self.bulk_supported = False
+                else:
+                    logger.warning(f"[FloatResolver] Bulk inspect request returned {resp.status_code}")
+            except Exception as e:
+                self._check_connection_error(e)
+                logger.warning(f"[FloatResolver] Bulk inspect request failed: {e}")
+        return {link: self._resolve_single(link) for link in links}
+
+    def resolve_many(self, inspect_links: Iterable[str]) -> Dict[str, FloatData]:
+        links = list(dict.fromkeys(inspect_links))
+        results = {link: failed(link, 'Invalid inspect link format') for link in links if not is_inspect_link(link)}
+        valid = [link for link in links if link not in results]
+        if valid and not self.available:
+            results.update({link: failed(link, 'Inspect service unavailable') for link in valid})
+            return results
+        batches = [valid[i:i + self.batch_size] for i in range(0, len(valid), self.batch_size)]
+        if len(batches) == 1:
+            results.update(self._resolve_batch(batches[0]))
+        elif batches:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+                for batch_results in executor.map(self._resolve_batch, batches):
+                    results.update(batch_results)
+        resolved = sum(1 for data in results.values() if data.success)
+        logger.info(f"[FloatResolver] Resolved {resolved}/{len(links)} inspect links via {self.base_url}")
+        return results
+
+
+class SeleniumFloatResolver(FloatResolver):
+    """Resolves inspect links by driving csfloat.com in Chrome (one link at a time)"""
+
+    name = 'selenium'
+
+    def __init__(self, headless: bool = True):
+        self.headless = headless
+        self._scraper = None
+
+    def resolve_many(self, inspect_links: Iterable[str]) -> Dict[str, FloatData]:
+        results = {}
+        for link in dict.fromkeys(inspect_links):
+            if not is_inspect_link(link):
+                results[link] = failed(link, 'Invalid inspect link format')
+                continue
+            try:
+                if self._scraper is None:
+                    # Imported here so the HTTP backend works without selenium installed
+                    from .csfloat_scraper import ImprovedCSFloatScraper
+                    self._scraper = ImprovedCSFloatScraper(headless=self.headless)
+                results[link] = self._scraper.get_float_data(link)
+            except Exception as e:
+                logger.error(f"[FloatResolver] Selenium lookup failed: {e}")
+                results[link] = failed(link, str(e))
+        return results
+
+    def close(self):
+        if self._scraper is not None:
+            self._scraper.cleanup()
+            self._scraper = None
+
+
+class FallbackFloatResolver(FloatResolver):
+    """Primary backend first; links it could not resolve are retried on the fallback"""
+
+    def __init__(self, primary: FloatResolver, fallback: FloatResolver):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = f"{primary.name}+{fallback.name}"
+
+    def resolve_many(self, inspect_links: Iterable[str]) -> Dict[str, FloatData]:
+        results = self.primary.resolve_many(inspect_links)
+        retry = [link for link, data in results.items() if not data.success and is_inspect_link(link)]
+        if retry:
+            logger.info(f"[FloatResolver] Retrying {len(retry)} links with {self.fallback.name} backend")
+            for link, data in self.fallback.resolve_many(retry).items():
+                if data.success:
+                    results[link] = data
+        return results
+
+    def close(self):
+        self.primary.close()
+        self.fallback.close()
+
+
+class MemoryFloatStore:
+    """Process-local float cache store with the same interface as FloatCacheModel"""
+
+    def __init__(self):
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict]:
+        with self._lock:
+            return {key: self._entries[key] for key in keys if key in self._entries}
+
+    def save_many(self, entries: Dict[str, Dict]) -> int:
+        with self._lock:
+            self._entries.update(entries)
+        return len(entries)
+
+
+class CachedFloatResolver(FloatResolver):
+    """Answers from the permanent float cache and only sends misses to the wrapped backend"""
+
+    def __init__(self, resolver: FloatResolver, store):
+        """
+        Args:
+            resolver: Backend used for links that are not cached yet
+            store: Object with get_many(keys) and save_many({key: entry}), e.g. FloatCacheModel
+        """
+        self.resolver = resolver
+        self.store = store
+        self.name = f"cached({resolver.name})"
+        self.stats = {'hits': 0, 'misses': 0}
+
+    @staticmethod
+    def _from_entry(inspect_link: str, entry: Dict) -> FloatData:
+        return FloatData(
+            float_value=entry.get('float_value'),
+            paint_seed=entry.get('paint_seed'),
+            inspect_link=inspect_link,
+            weapon_name=entry.get('weapon_name'),
+            skin_name=entry.get('skin_name'),
+            wear_rating=entry.get('wear_rating'),
+            success=True
+        )
+
+    def prefetch(self, inspect_links: Iterable[str]) -> Dict[str, FloatData]:
+        """Cached results for the given links (one store query); links not in the cache are left out"""
+        keys = {link: inspect_key(link) for link in dict.fromkeys(inspect_links)}
+        entries = self.store.get_many([key for key in set(keys.values()) if key])
+        return {link: self._from_entry(link, entries[key]) for link, key in keys.items() if key in entries}
+
+    def resolve_many(self, inspect_links: Iterable[str]) -> Dict[str, FloatData]:
+        links = list(dict.fromkeys(inspect_links))
+        results = self.prefetch(links)
+        misses = [link for link in links if link not in results]
+        self.stats['hits'] += len(results)
+        self.stats['misses'] += len(misses)
+        if misses:
+            resolved = self.resolver.resolve_many(misses)
+            results.update(resolved)
+            entries = {}
+            for link, data in resolved.items():
+                key = inspect_key(link)
+                if key and data.success:
+                    entries[key] = {
+                        'float_value': data.float_value,
+                        'paint_seed': data.paint_seed,
+                        'weapon_name': data.weapon_name,
+                        'skin_name': data.skin_name,
+                        'wear_rating': data.wear_rating,
+                    }
+            self.store.save_many(entries)
+        logger.info(f"[FloatResolver] Float cache: {len(links) - len(misses)} hits, {len(misses)} misses")
+        return results
+
+    def close(self):
+        self.resolver.close()
+
+
+_memory_store = MemoryFloatStore()
+
+
+def get_float_store(kind: Optional[str] = None):
+    """Float cache store for 'mongo' (falls back to memory when MongoDB is unavailable), 'memory' or 'off'"""
+    kind = (kind or os.getenv('FLOAT_CACHE', 'mongo')).lower()
+    if kind == 'off':
+        return None
+    if kind == 'mongo':
+        try:
+            from database import float_cache_model
+            if float_cache_model is not None:
+                return float_cache_model
+        except Exception as e:
+            logger.warning(f"[FloatResolver] MongoDB float cache unavailable, using memory: {e}")
+    return _memory_store
+
+
+def get_float_resolver(backend: Optional[str] = None, headless: bool = True, cache: Optional[str] = None) -> FloatResolver:
+    """Build the configured float resolver ('http', 'selenium' or 'auto') behind the float cache"""
+    backend = (backend or os.getenv('FLOAT_RESOLVER', 'auto')).lower()
+    if backend == 'http':
+        resolver = HttpInspectResolver()
+    elif backend == 'selenium' or not os.getenv('FLOAT_INSPECT_URL'):
+        # Without a configured inspect service 'auto' would pay connection retries on every lookup
+        resolver = SeleniumFloatResolver(headless=headless)
+    else:
+        resolver = FallbackFloatResolver(HttpInspectResolver(), SeleniumFloatResolver(headless=headless))
+    store = get_float_store(cache)
+    return CachedFloatResolver(resolver, store) if store is not None else resolver
@@ -0,0 +1,142 @@
+"""
+Steam Inventory Cache
+On-disk cache of raw Steam inventory pages per (steam_id, app_id)
+
+Entries are gzip-compressed JSON holding the raw API pages, the time they were
+fetched, the {asset_id: description hash} map and a content hash over that map.
+The fetch time, map and hash are also written to a small uncompressed sidecar file,
+so the "unchanged since last sync" check never decompresses the raw pages.
+Within the freshness window the inventory is replayed from disk instead of asking
+Steam again; the content hash lets callers skip classification and database work
+when the inventory has not changed since their last sync.
+
+Configuration:
+    INVENTORY_CACHE_DIR      directory for cache files (default backend/.cache/inventories)
+    INVENTORY_CACHE_MAX_AGE  freshness window in seconds (default 300, 0 disables the cache)
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'inventories')
+SAFE_KEY_RE = re.compile(r'[^A-Za-z0-9_.-]')
+
+
+def inventory_content_hash(assets: Dict[str, str]) -> str:
+    """Hash of an {asset_id: description hash} map; equal maps mean an unchanged inventory"""
+    payload = json.dumps(sorted(assets.items()), separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class InventoryCache:
+    """Freshness-bounded on-disk cache of raw inventory pages"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_age: Optional[float] = None):
+        """
+        Args:
+            cache_dir: Directory holding one .json.gz file per inventory
+            max_age: Seconds an entry is served without contacting Steam
+        """
+        self.cache_dir = cache_dir or os.getenv('INVENTORY_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.max_age = float(os.getenv('INVENTORY_CACHE_MAX_AGE', '300')) if max_age is None else max_age
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0}
+
+    def _path(self, steam_id: str, app_id: str) -> str:
+        name = SAFE_KEY_RE.sub('_', f"{steam_id}_{app_id}")
+        return os.path.join(self.cache_dir, f"{name}.json.gz")
+
+    def _meta_path(self, steam_id: str, app_id: str) -> str:
+        name = SAFE_KEY_RE.sub('_', f"{steam_id}_{app_id}")
+        return os.path.join(self.cache_dir, f"{name}.meta.json")
+
+    def _load(self, steam_id: str, app_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with gzip.open(self._path(steam_id, app_id), 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[InventoryCache] Could not read cache for {steam_id}/{app_id}: {e}")
+            return None
+
+    def get(self, steam_id: str, app_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a fresh entry: {'fetched_at', 'content_hash', 'assets', 'pages'},
+        or None when missing, expired or the cache is disabled
+        """
+        if self.max_age <= 0:
+            return None
+        entry = self._load(steam_id, app_id)
+        if entry is None or time.time() - entry.get('fetched_at', 0) > self.max_age:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return entry
+
+    def get_meta(self, steam_id: str, app_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get {'fetched_at', 'content_hash', 'assets'} of a fresh entry from the sidecar file,
+        without reading the raw pages; None when missing, expired or the cache is disabled
+        """
+        if self.max_age <= 0:
+            return None
+        try:
+            with open(self._meta_path(steam_id, app_id), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[InventoryCache] Could not read cache metadata for {steam_id}/{app_id}: {e}")
+            return None
+        if time.time() - meta.get('fetched_at', 0) > self.max_age:
+            return None
+        return meta
+
+    def store(self, steam_id: str, app_id: str, pages: List[Dict], assets: Dict[str, str]) -> str:
+        """Write the raw pages of a complete inventory read and return its content hash"""
+        content_hash = inventory_content_hash(assets)
+        if self.max_age <= 0:
+            return content_hash
+        meta = {'fetched_at': time.time(), 'content_hash': content_hash, 'assets': assets}
+        path = self._path(steam_id, app_id)
+        meta_path = self._meta_path(steam_id, app_id)
+        try:
+            with self._lock:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                    json.dump({**meta, 'pages': pages}, f, separators=(',', ':'))
+                os.replace(tmp_path, path)
+                # Sidecar last, so it never describes pages that are not on disk yet
+                with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+                    json.dump(meta, f, separators=(',', ':'))
+                os.replace(f"{meta_path}.tmp", meta_path)
+            self.stats['stores'] += 1
+        except Exception as e:
+            logger.warning(f"[InventoryCache] Could not write cache for {steam_id}/{app_id}: {e}")
+        return content_hash
+
+    def invalidate(self, steam_id: str, app_id: str):
+        """Drop the cached inventory so the next read goes to Steam"""
+        for path in (self._meta_path(steam_id, app_id), self._path(steam_id, app_id)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'max_age': self.max_age, 'cache_dir': self.cache_dir}
+
+
+# Global cache instance
+inventory_cache = InventoryCache()
@@ -0,0 +1,113 @@
+"""
+Network Capture
+Reads a page's own XHR/fetch JSON responses from the Chrome performance log
+
+The browser must be started with the 'performance' logging preference (see the
+performance_log flag of the no_images_capture profile in browser_pool.BROWSER_PROFILES).
+Response metadata comes from Network.responseReceived / Network.loadingFinished log
+events and bodies are fetched with CDP Network.getResponseBody.
+
+Usage:
+    capture = NetworkCapture(driver, url_filter='skinsnipe')
+    capture.drain()                      # forget everything logged so far
+    search_input.send_keys(query)
+    result = capture.wait_for(lambda url, data: find_price(data), timeout=4)
+"""
+
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.1
+
+
+class NetworkCapture:
+    """Collects JSON responses received by one browser since the last drain()"""
+
+    def __init__(self, driver, url_filter: Optional[str] = None):
+        """
+        Args:
+            driver: WebDriver started with the performance log enabled
+            url_filter: Only responses whose URL contains this string are kept
+        """
+        self.driver = driver
+        self.url_filter = url_filter
+        self._pending: Dict[str, str] = {}
+        self.responses: List[Tuple[str, Any]] = []
+
+    @staticmethod
+    def available(driver) -> bool:
+        """Whether the browser records a performance log"""
+        try:
+            driver.get_log('performance')
+            return True
+        except Exception:
+            return False
+
+    def drain(self):
+        """Discard logged events and captured responses"""
+        try:
+            self.driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f"[NetworkCapture] Could not read performance log: {e}")
+        self._pending.clear()
+        self.responses = []
+
+    def _body(self, request_id: str) -> Optional[Any]:
+        try:
+            result = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except Exception as e:
+            logger.debug(f"[NetworkCapture] No body for request {request_id}: {e}")
+            return None
+        if result.get('base64Encoded'):
+            return None
+        try:
+            return json.loads(result.get('body', ''))
+        except ValueError:
+            return None
+
+    def poll(self) -> List[Tuple[str, Any]]:
+        """Read new log entries; returns the JSON responses that finished loading since the last poll"""
+        new = []
+        for entry in self.driver.get_log('performance'):
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.responseReceived':
+                response = params.get('response', {})
+                url = response.get('url', '')
+                if 'json' in response.get('mimeType', '') and (not self.url_filter or self.url_filter in url):
+                    self._pending[params.get('requestId')] = url
+            elif method == 'Network.loadingFinished':
+                url = self._pending.pop(params.get('requestId'), None)
+                if url is None:
+                    continue
+                data = self._body(params['requestId'])
+                if data is not None:
+                    new.append((url, data))
+        self.responses.extend(new)
+        return new
+
+    def wait_for(self, match: Callable[[str, Any], Any], timeout: float) -> Any:
+        """
+        Poll until match(url, data) returns something truthy for a captured response
+        (responses captured before the call are checked first). Returns None on timeout.
+        """
+        for url, data in self.responses:
+            result = match(url, data)
+            if result:
+                return result
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            for url, data in self.poll():
+                result = match(url, data)
+                if result:
+                    return result
+            time.sleep(POLL_INTERVAL)
+        return None
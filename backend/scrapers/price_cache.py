@@ -0,0 +1,349 @@
+"""
+Price Quote Cache
+Bounded, thread-safe TTL/LRU cache for upstream price quotes
+
+Entries are keyed by the upstream API URL and expire after a TTL that depends
+on the item category (cases move slowly, knives move fast). An optional SQLite
+backend keeps quotes across restarts.
+
+The SkinSnipe search cache uses the same LRU/TTL cache (and SQLite table, when
+persistence is enabled) so results are shared across scraper instances and processes.
+
+NegativeCache remembers keys that returned no price and backs off exponentially
+before they are checked upstream again.
+
+Usage:
+    cache = PriceCache(max_entries=5000, category_ttls={'knife': 300})
+    cache.set(api_url, {'price': 1.23}, category='knife')
+    quote = cache.get(api_url)
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds a quote stays valid per SkinSearch item category
+DEFAULT_CATEGORY_TTLS = {
+    'knife': 300,
+    'glove': 300,
+    'weapon': 900,
+    'sticker': 3600,
+    'charm': 3600,
+    'agent': 3600,
+    'music_kit': 3600,
+    'patch': 3600,
+    'pin': 3600,
+    'graffiti': 3600,
+    'capsule': 6 * 3600,
+    'case': 6 * 3600,
+    'souvenir_package': 6 * 3600,
+}
+
+
+class SQLiteCacheBackend:
+    """Persistent key/value store for cache entries"""
+
+    def __init__(self, path: str, table: str = 'price_cache'):
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def load(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, expires_at) for a key or None"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def store(self, key: str, value: Any, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at)
+            )
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+
+class PriceCache:
+    """Thread-safe LRU cache with per-category TTLs and hit/miss counters"""
+
+    def __init__(self, max_entries: int = 10000, default_ttl: int = 900,
+                 category_ttls: Optional[Dict[str, int]] = None,
+                 backend: Optional[SQLiteCacheBackend] = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.category_ttls = {**DEFAULT_CATEGORY_TTLS, **(category_ttls or {})}
+        self.backend = backend
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, category: Optional[str]) -> int:
+        """Get the TTL in seconds for an item category"""
+        return self.category_ttls.get(category or '', self.default_ttl)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        if self.backend is not None:
+            try:
+                stored = self.backend.load(key)
+            except Exception as e:
+                logger.warning(f"[PriceCache] Backend load failed for {key}: {e}")
+                stored = None
+            if stored is not None and stored[1] > now:
+                with self._lock:
+                    self._put(key, stored[0], stored[1])
+                    self.hits += 1
+                return stored[0]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any, category: Optional[str] = None, ttl: Optional[int] = None):
+        """Store a value with the TTL of its category (or an explicit TTL)"""
+        expires_at = time.time() + (ttl if ttl is not None else self.ttl_for(category))
+        with self._lock:
+            self._put(key, value, expires_at)
+        if self.backend is not None:
+            try:
+                self.backend.store(key, value, expires_at)
+            except Exception as e:
+                logger.warning(f"[PriceCache] Backend store failed for {key}: {e}")
+
+    def _put(self, key: str, value: Any, expires_at: float):
+        """Insert an entry and evict least recently used ones (lock must be held)"""
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.backend is not None:
+            self.backend.delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'persistent': self.backend is not None,
+            }
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter used as a fast membership pre-check"""
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class NegativeCache:
+    """Remembers keys without a price and re-checks them with exponential backoff"""
+
+    def __init__(self, base_interval: int = 1800, max_interval: int = 7 * 86400,
+                 max_entries: int = 50000, use_bloom: bool = True):
+        """
+        Args:
+            base_interval: Seconds before the first re-check after a miss
+            max_interval: Upper bound for the re-check interval
+            max_entries: Maximum number of remembered keys
+            use_bloom: Keep a Bloom filter in front of the entry table
+        """
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.max_entries = max_entries
+        self.bloom = BloomFilter(capacity=max_entries) if use_bloom else None
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.skipped = 0
+        # Keys forgotten since the Bloom filter was built; they still match it, so it is
+        # rebuilt from the live entries once they reach a quarter of max_entries
+        self._removed = 0
+        self._rebuild_after = max(1, max_entries // 4)
+
+    def _forgot_keys_locked(self, count: int = 1):
+        """Count removed keys and rebuild the Bloom filter when too many stale ones accumulate (lock held)"""
+        if self.bloom is None:
+            return
+        self._removed += count
+        if self._removed >= self._rebuild_after:
+            bloom = BloomFilter(capacity=self.max_entries)
+            for key in self._entries:
+                bloom.add(key)
+            self.bloom = bloom
+            self._removed = 0
+
+    def should_skip(self, key: str) -> bool:
+        """True while a key is inside its back-off window"""
+        bloom = self.bloom
+        if bloom is not None and key not in bloom:
+            return False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['next_check'] <= time.time():
+                return False
+            self.skipped += 1
+            return True
+
+    def record_failure(self, key: str, reason: str = 'no price found'):
+        """Register a miss and push the next re-check out exponentially"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key) or {'failures': 0, 'first_seen': now}
+            entry['failures'] += 1
+            interval = min(self.max_interval, self.base_interval * (2 ** (entry['failures'] - 1)))
+            entry.update({'last_seen': now, 'next_check': now + interval, 'reason': reason})
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if self.bloom is not None:
+                self.bloom.add(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            if evicted:
+                self._forgot_keys_locked(evicted)
+
+    def record_success(self, key: str):
+        """Forget a key once it returns a price"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._forgot_keys_locked()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self.bloom is not None:
+                self.bloom = BloomFilter(capacity=self.max_entries)
+                self._removed = 0
+
+    def snapshot(self, limit: int = 500) -> List[Dict[str, Any]]:
+        """Most recently failed entries, newest first"""
+        now = time.time()
+        with self._lock:
+            keys = list(reversed(self._entries))[:limit]
+            return [{
+                'key': key,
+                'failures': self._entries[key]['failures'],
+                'reason': self._entries[key]['reason'],
+                'first_seen': self._entries[key]['first_seen'],
+                'last_seen': self._entries[key]['last_seen'],
+                'next_check_in': max(0, round(self._entries[key]['next_check'] - now)),
+            } for key in keys]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'skipped_lookups': self.skipped,
+                'bloom_filter': self.bloom is not None,
+                'base_interval': self.base_interval,
+                'max_interval': self.max_interval,
+            }
+
+
+def _create_cache(table: str, max_entries: int, default_ttl: int = 900) -> PriceCache:
+    """Build a shared cache, persisted to SQLite when PRICE_CACHE_PATH is set"""
+    backend = None
+    path = os.getenv('PRICE_CACHE_PATH')
+    if path:
+        try:
+            backend = SQLiteCacheBackend(path, table=table)
+        except Exception as e:
+            logger.warning(f"[PriceCache] Could not open persistent cache at {path}: {e}")
+    return PriceCache(max_entries=max_entries, default_ttl=default_ttl, backend=backend)
+
+
+# Shared quote cache for all SkinSearch scraper instances
+quote_cache = _create_cache('price_cache', int(os.getenv('PRICE_CACHE_MAX_ENTRIES', '10000')))
+
+# Resolved Doppler phase per item identity; a phase never changes for a given item
+doppler_phase_memo = _create_cache('doppler_phases', 50000, default_ttl=90 * 86400)
+
+# SkinSnipe search results per normalized item name and condition
+skinsnipe_cache = _create_cache('skinsnipe_search', int(os.getenv('SKINSNIPE_CACHE_MAX_ENTRIES', '5000')),
+                                default_ttl=int(os.getenv('SKINSNIPE_CACHE_TTL', '1800')))
+
+# Item keys that returned no price, shared by all SkinSearch scraper instances
+negative_cache = NegativeCache()
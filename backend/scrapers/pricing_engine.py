@@ -0,0 +1,94 @@
+"""
+Async Pricing Engine
+Runs SkinSearch price lookups concurrently with a bounded concurrency limit,
+returning results in input order. Requests are paced per host by the shared
+host guards (adaptive rate limiting in resilience.py), not by the engine.
+
+Usage:
+    engine = AsyncPricingEngine(SkinSearchScraper(), max_concurrency=8)
+    results = engine.price_items(steam_items)
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from resilience import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PricingResult:
+    """Outcome of a single item lookup inside a batch"""
+    index: int
+    name: Optional[str]
+    price_info: Optional[Any]
+    elapsed: float
+    error: Optional[str] = None
+    # Upstream host whose circuit breaker rejected the lookup
+    tripped_host: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'index': self.index,
+            'name': self.name,
+            'price_info': self.price_info,
+            'elapsed': round(self.elapsed, 3),
+            'error': self.error,
+            'tripped_host': self.tripped_host,
+        }
+
+
+class AsyncPricingEngine:
+    """Concurrent batch pricing on top of SkinSearchScraper lookups"""
+
+    def __init__(self, scraper, max_concurrency: int = 8):
+        """
+        Args:
+            scraper: SkinSearchScraper instance used for mapping and price lookups
+            max_concurrency: Maximum number of items priced at the same time
+        """
+        self.scraper = scraper
+        self.max_concurrency = max(1, int(max_concurrency))
+
+    def _price_item_sync(self, index: int, item: Dict) -> PricingResult:
+        """Price one item in a worker thread, capturing timing and errors"""
+        name = item.get('name')
+        start = time.perf_counter()
+        try:
+            if self.scraper.should_skip_item(item):
+                return PricingResult(index, name, None, time.perf_counter() - start, 'skipped: not listed on SkinSearch')
+            price_info = self.scraper._scrape_steam_item(item)
+            error = None if price_info else 'no price found'
+            return PricingResult(index, name, price_info, time.perf_counter() - start, error)
+        except CircuitOpenError as e:
+            return PricingResult(index, name, None, time.perf_counter() - start, str(e), tripped_host=e.host)
+        except Exception as e:
+            logger.error(f"[PricingEngine] Error pricing {name}: {e}")
+            return PricingResult(index, name, None, time.perf_counter() - start, str(e))
+
+    async def price_items_async(self, items: List[Dict]) -> List[PricingResult]:
+        """Price all items concurrently; results keep the order of the input list"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(index: int, item: Dict) -> PricingResult:
+            async with semaphore:
+                return await asyncio.to_thread(self._price_item_sync, index, item)
+
+        return list(await asyncio.gather(*(run(i, item) for i, item in enumerate(items))))
+
+    def price_items(self, items: List[Dict]) -> List[PricingResult]:
+        """Synchronous entry point for Flask routes and the scraper manager"""
+        start = time.perf_counter()
+        results = asyncio.run(self.price_items_async(items))
+        elapsed = time.perf_counter() - start
+        priced = sum(1 for r in results if r.price_info)
+        logger.info(f"[PricingEngine] Priced {priced}/{len(results)} items in {elapsed:.2f}s "
+                    f"(concurrency={self.max_concurrency})")
+        tripped = {r.tripped_host for r in results if r.tripped_host}
+        if tripped:
+            logger.warning(f"[PricingEngine] Circuit open for {', '.join(sorted(tripped))}; affected items failed fast")
+        return results
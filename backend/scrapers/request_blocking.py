@@ -0,0 +1,84 @@
+"""
+Request Blocking
+Shared CDP request-blocking profile for the pooled headless browsers
+
+Requests for images, fonts, media, ads and analytics are blocked through CDP
+Network.setBlockedURLs. Categories are expanded to URL patterns (CDP has no
+resource-type filter), and each scraper has its own allow-list of categories or
+patterns that stay loaded because the scraper needs them.
+
+Configuration:
+    BROWSER_BLOCKING        comma separated categories to block (default image,font,media,ads,analytics;
+                            'off' disables blocking)
+    BROWSER_BLOCKED_URLS    extra comma separated URL patterns to block
+
+Usage:
+    apply_blocking(driver, 'CSFloat')   # block everything except the CSFloat allow-list
+    apply_blocking(driver, None)        # load everything again
+"""
+
+import logging
+import os
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# URL patterns per blockable category ('*' is the CDP wildcard)
+BLOCK_CATEGORIES: Dict[str, List[str]] = {
+    'image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico', '*.bmp'],
+    'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot', '*fonts.googleapis.com*', '*fonts.gstatic.com*'],
+    'media': ['*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav', '*.m3u8'],
+    'stylesheet': ['*.css'],
+    'ads': ['*doubleclick.net*', '*googlesyndication.com*', '*googleadservices.com*', '*adservice.google.*',
+            '*amazon-adsystem.com*', '*adnxs.com*', '*criteo.*', '*taboola.com*', '*outbrain.com*'],
+    'analytics': ['*google-analytics.com*', '*googletagmanager.com*', '*analytics.google.com*',
+                  '*hotjar.com*', '*connect.facebook.net*', '*clarity.ms*', '*segment.io*',
+                  '*mixpanel.com*', '*sentry.io*', '*cloudflareinsights.com*'],
+}
+
+DEFAULT_BLOCKED_CATEGORIES = 'image,font,media,ads,analytics'
+
+# What each scraper still needs: categories or URL patterns removed from the block list
+SCRAPER_ALLOW_LISTS: Dict[str, List[str]] = {
+    'TradingCards': [],
+    'SteamInventory': [],
+    # csfloat.com renders its lookup result next to the item image
+    'CSFloat': ['image'],
+    'SkinSnipe': [],
+}
+
+
+def blocked_categories() -> List[str]:
+    """Categories blocked by the shared profile"""
+    setting = os.getenv('BROWSER_BLOCKING', DEFAULT_BLOCKED_CATEGORIES).strip().lower()
+    if setting in ('', 'off', 'none', '0', 'false'):
+        return []
+    return [category.strip() for category in setting.split(',') if category.strip() in BLOCK_CATEGORIES]
+
+
+def blocked_urls(scraper: Optional[str]) -> List[str]:
+    """URL patterns to block for a scraper (the shared profile minus its allow-list); [] for None"""
+    if scraper is None:
+        return []
+    allow = set(SCRAPER_ALLOW_LISTS.get(scraper, []))
+    patterns = []
+    for category in blocked_categories():
+        if category not in allow:
+            patterns.extend(BLOCK_CATEGORIES[category])
+    extra = os.getenv('BROWSER_BLOCKED_URLS', '')
+    patterns.extend(pattern.strip() for pattern in extra.split(',') if pattern.strip())
+    return [pattern for pattern in dict.fromkeys(patterns) if pattern not in allow]
+
+
+def apply_blocking(driver, scraper: Optional[str]) -> List[str]:
+    """Set the browser's blocked URL patterns for the given scraper; returns the patterns in effect"""
+    patterns = blocked_urls(scraper)
+    if getattr(driver, 'blocked_urls', None) == patterns:
+        return patterns
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        driver.blocked_urls = patterns
+    except Exception as e:
+        logger.debug(f"[RequestBlocking] Could not set blocked URLs: {e}")
+    return patterns
@@ -5,6 +5,7 @@ Centralized management for all portfolio scrapers
 
 from typing import Dict, List, Any, Optional
 import logging
+import threading
 from datetime import datetime
 
 from .base_scraper import BaseScraper, ScraperError
@@ -31,22 +32,33 @@ class ScraperManager:
         self.api_keys = api_keys or {}
         self.logger = logging.getLogger(__name__)
         
-        # Initialize scrapers
-        self.scrapers: Dict[str, BaseScraper] = {
-            'cards': TradingCardsScraper(),
-            'steam': SteamInventoryScraper(),
-            'skinsearch': SkinSearchScraper(),
+        # Scraper classes; instances are created on first use so startup never launches a browser
+        self.scraper_classes = {
+            'cards': TradingCardsScraper,
+            'steam': SteamInventoryScraper,
+            'skinsearch': SkinSearchScraper,
         }
+        self.scrapers: Dict[str, BaseScraper] = {}
+        self._scrapers_lock = threading.Lock()
         
-        self.logger.info("ScraperManager initialized with scrapers: %s", list(self.scrapers.keys()))
+        self.logger.info("ScraperManager initialized with scrapers: %s", list(self.scraper_classes.keys()))
     
     def get_available_scrapers(self) -> List[str]:
         """Get list of available scraper types"""
-        return list(self.scrapers.keys())
+        return list(self.scraper_classes.keys())
     
     def get_scraper(self, scraper_type: str) -> Optional[BaseScraper]:
-        """Get scraper instance by type"""
-        return self.scrapers.get(scraper_type)
+        """Get scraper instance by type, creating it on first use"""
+        scraper = self.scrapers.get(scraper_type)
+        if scraper is not None or scraper_type not in self.scraper_classes:
+            return scraper
+        with self._scrapers_lock:
+            scraper = self.scrapers.get(scraper_type)
+            if scraper is None:
+                scraper = self.scraper_classes[scraper_type]()
+                self.scrapers[scraper_type] = scraper
+                self.logger.info(f"Created {scraper_type} scraper on first use")
+        return scraper
     
     def scrape_assets(self, scraper_type: str, **kwargs) -> List[Dict[str, Any]]:
         """
@@ -62,8 +74,8 @@ class ScraperManager:
         Raises:
             ScraperError: If scraper type is invalid or scraping fails
         """
-        if scraper_type not in self.scrapers:
-            available = ', '.join(self.scrapers.keys())
+        if scraper_type not in self.scraper_classes:
+            available = ', '.join(self.scraper_classes.keys())
             raise ScraperError(f"Invalid scraper type '{scraper_type}'. Available: {available}")
         
         # Special handling for scrapers with custom parameters
@@ -79,9 +91,9 @@ class ScraperManager:
             scraper = SteamInventoryScraper(headless=headless)
         elif scraper_type == 'skinsearch':
             # Always use the singleton instance for skinsearch so status is tracked globally
-            scraper = self.scrapers['skinsearch']
+            scraper = self.get_scraper('skinsearch')
         else:
-            scraper = self.scrapers[scraper_type]
+            scraper = self.get_scraper(scraper_type)
         
         try:
             self.logger.info(f"Starting {scraper_type} scraping with params: {kwargs}")
@@ -116,7 +128,9 @@ class ScraperManager:
     def get_scraper_status(self) -> Dict[str, Dict[str, Any]]:
         """Get status information for all scrapers, including running state"""
         status = {}
-        for scraper_type, scraper in self.scrapers.items():
+        for scraper_type in self.scraper_classes:
+            # Scrapers that have not been used yet are reported without creating them
+            scraper = self.scrapers.get(scraper_type)
             running = getattr(scraper, 'is_running', False)
             last_used = getattr(scraper, 'last_used', None)
             # Debug log for status reporting
@@ -124,6 +138,7 @@ class ScraperManager:
             status[scraper_type] = {
                 'name': getattr(scraper, 'name', scraper_type),
                 'available': True,
+                'initialized': scraper is not None,
                 'requires_api_key': self._requires_api_key(scraper_type),
                 'has_api_key': self._has_required_api_key(scraper_type),
                 'last_used': last_used,
@@ -1,26 +1,109 @@
-import requests
 import re
+import time
 import logging
 from bs4 import BeautifulSoup
 from datetime import datetime
-from dataclasses import dataclass
-from typing import Optional, Dict
+from dataclasses import dataclass, asdict
+import json
+from typing import Optional, Dict, List, Tuple
+from functools import lru_cache
+from collections import OrderedDict
+import threading
 # Playwright imports
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from playwright.sync_api import sync_playwright
 
+from fx_service import fx_service
+from http_client import http_client
+from resilience import CircuitOpenError
+from single_flight import SingleFlight
+from .pricing_engine import AsyncPricingEngine
+from .price_cache import quote_cache, doppler_phase_memo, negative_cache
+
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Shared across scraper instances so overlapping batches coalesce
+price_flight = SingleFlight('skinsearch')
+
+# Precompiled patterns used by the name -> URL resolver
+CONDITION_WORDS_RE = re.compile(r'\s*\b(factory new|minimal wear|field-tested|well-worn|battle-scarred|fn|mw|ft|ww|bs)\b', re.IGNORECASE)
+CONDITION_SUFFIX_RE = re.compile(r'_(factory_new|minimal_wear|field_tested|well_worn|battle_scarred|fn|mw|ft|ww|bs)$')
+TRAILING_PAREN_RE = re.compile(r'\s*\([^)]+\)$')
+API_URL_DISALLOWED_RE = re.compile(r"[^a-z0-9' _-]")
+DISPLAY_DISALLOWED_RE = re.compile(r"[^a-z0-9_' -]")
+MULTI_UNDERSCORE_RE = re.compile(r'__+')
+CSFLOAT_PRICE_RE = re.compile(r'"market":"csfloat","price":(\d+)')
+QUALITY_SEGMENT_RE = re.compile(r'/([A-Z]{2})(?:/|$)')
+STRIP_SYMBOLS = str.maketrans('', '', '™★|()')
+
+# Upper bound for memoized item -> URL resolutions
+RESOLVE_MEMO_SIZE = 20000
+
+# Doppler phase lookups in flight at once, shared by all items and pricing workers
+DOPPLER_PHASE_WORKERS = 3
+_doppler_executor = ThreadPoolExecutor(max_workers=DOPPLER_PHASE_WORKERS, thread_name_prefix='doppler')
+
+
+@lru_cache(maxsize=50000)
+def _normalize(s: str, remove_condition: bool = False, remove_prefix: str = None, for_api_url: bool = False) -> str:
+    s = s.lower()
+    
+    if for_api_url:
+        # For API URLs, preserve apostrophes and let URL encoding handle them
+        s = s.translate(STRIP_SYMBOLS)
+        # Remove non-alphanumeric except apostrophes, underscores, and hyphens
+        s = API_URL_DISALLOWED_RE.sub('', s)
+    else:
+        # Original normalization for display/comparison purposes
+        s = s.replace('"', '')
+        s = s.translate(STRIP_SYMBOLS)
+        # Only remove non-alphanumeric except _ and -
+        s = DISPLAY_DISALLOWED_RE.sub('', s)
+    
+    s = s.replace(' ', '_')  # Only replace spaces with underscores
+    # Do NOT replace hyphens
+    if remove_prefix and s.startswith(remove_prefix):
+        s = s[len(remove_prefix):]
+    # Remove condition suffix from skin/sticker names if needed
+    if remove_condition:
+        s = CONDITION_SUFFIX_RE.sub('', s)
+    s = MULTI_UNDERSCORE_RE.sub('_', s)
+    s = s.strip('_')
+    return s
+
+
 @dataclass
 class PriceInfo:
     price: Optional[float]
     currency: str = '€'
     url: Optional[str] = None
     market: Optional[str] = None
+    # Lowest EUR price per market from the same SkinSearch response
+    markets: Optional[Dict[str, float]] = None
+
+
+def summarize_market_prices(markets: Optional[Dict[str, float]]) -> Dict:
+    """Get the cheapest market and the median price from a market price vector"""
+    prices = sorted((price, market) for market, price in (markets or {}).items() if price and price > 0)
+    if not prices:
+        return {'cheapest': None, 'median': None, 'market_count': 0}
+    values = [price for price, _ in prices]
+    mid = len(values) // 2
+    median = values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+    return {
+        'cheapest': {'market': prices[0][1], 'price': prices[0][0]},
+        'median': round(median, 2),
+        'market_count': len(values),
+    }
 
 class SkinSearchScraper:
     name = "SkinSearch"
+    # Memoized item -> URL resolutions shared by all instances
+    _resolve_memo: "OrderedDict[tuple, tuple]" = OrderedDict()
+    _resolve_lock = threading.Lock()
+
     def __init__(self):
         self.is_running = False
         self.last_used = None
@@ -84,8 +167,8 @@ class SkinSearchScraper:
                     parts = clean_name.split('|')
                     weapon = self.norm(parts[0], remove_condition=True)
                     raw_skin = parts[1].strip()
-                    skin_no_cond = re.sub(r'\s*\b(factory new|minimal wear|field-tested|well-worn|battle-scarred|fn|mw|ft|ww|bs)\b', '', raw_skin, flags=re.IGNORECASE)
-                    skin_no_cond = re.sub(r'(_factory_new|_minimal_wear|_field_tested|_well_worn|_battle_scarred|_fn|_mw|_ft|_ww|_bs)$', '', skin_no_cond.lower())
+                    skin_no_cond = CONDITION_WORDS_RE.sub('', raw_skin)
+                    skin_no_cond = CONDITION_SUFFIX_RE.sub('', skin_no_cond.lower())
                     skin = self.norm(skin_no_cond, remove_condition=True)
                 else:
                     weapon = self.norm(clean_name, remove_condition=True)
@@ -103,8 +186,8 @@ class SkinSearchScraper:
                 parts = name.split('|')
                 glove_type = self.norm(parts[0], remove_condition=True)
                 raw_skin = parts[1].strip()
-                skin_no_cond = re.sub(r'\s*\([^)]+\)$', '', raw_skin)
-                skin_no_cond = re.sub(r'\s*\b(factory new|minimal wear|field-tested|well-worn|battle-scarred|fn|mw|ft|ww|bs)\b', '', skin_no_cond, flags=re.IGNORECASE)
+                skin_no_cond = TRAILING_PAREN_RE.sub('', raw_skin)
+                skin_no_cond = CONDITION_WORDS_RE.sub('', skin_no_cond)
                 skin = self.norm(skin_no_cond, remove_condition=True)
             else:
                 glove_type = self.norm(name, remove_condition=True)
@@ -176,24 +259,14 @@ class SkinSearchScraper:
 
     def get_eur_conversion_rate(self, from_currency: str = 'USD') -> float:
         """
-        Fetches the conversion rate from the given currency to EUR using CDN currency API.
-        Returns 1.0 if the API fails or the currency is already EUR.
+        Get the conversion rate from the given currency to EUR from the shared FX service.
+        Returns 1.0 if no rate is available or the currency is already EUR.
         """
-        if from_currency.upper() == 'EUR':
+        rate = fx_service.get_rate(from_currency, 'EUR')
+        if rate is None:
+            logger.warning(f"[SkinSearch] Using fallback conversion rate 1.0 for {from_currency}->EUR")
             return 1.0
-        try:
-            url = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/usd.json"
-            resp = requests.get(url, timeout=5)
-            if resp.status_code == 200:
-                data = resp.json()
-                rate = data.get('usd', {}).get('eur')
-                if rate:
-                    logger.info(f"[SkinSearch] Conversion rate USD->EUR: {rate}")
-                    return float(rate)
-        except Exception as e:
-            logger.warning(f"[SkinSearch] Error fetching EUR conversion rate: {e}")
-        logger.warning(f"[SkinSearch] Using fallback conversion rate 1.0 for USD->EUR")
-        return 1.0
+        return rate
     
     # Doppler phase mappings based on finish catalog IDs
     DOPPLER_PHASES = {
@@ -215,30 +288,7 @@ class SkinSearchScraper:
     }
 
     def norm(self, s: str, remove_condition: bool = False, remove_prefix: str = None, for_api_url: bool = False) -> str:
-        s = s.lower()
-        
-        if for_api_url:
-            # For API URLs, preserve apostrophes and let URL encoding handle them
-            s = s.replace('™', '').replace('★', '').replace('|', '').replace('(', '').replace(')', '')
-            # Remove non-alphanumeric except apostrophes, underscores, and hyphens
-            s = re.sub(r'[^a-z0-9\' _-]', '', s)
-        else:
-            # Original normalization for display/comparison purposes
-            s = s.replace('"', '')
-            s = s.replace('™', '').replace('★', '').replace('|', '').replace('(', '').replace(')', '')
-            # Only remove non-alphanumeric except _ and -
-            s = re.sub(r"[^a-z0-9_' -]", '', s)
-        
-        s = s.replace(' ', '_')  # Only replace spaces with underscores
-        # Do NOT replace hyphens
-        if remove_prefix and s.startswith(remove_prefix):
-            s = s[len(remove_prefix):]
-        # Remove condition suffix from skin/sticker names if needed
-        if remove_condition:
-            s = re.sub(r'_(factory_new|minimal_wear|field_tested|well_worn|battle_scarred|fn|mw|ft|ww|bs)$', '', s)
-        s = re.sub(r'__+', '_', s)
-        s = s.strip('_')
-        return s
+        return _normalize(s, remove_condition, remove_prefix, for_api_url)
 
     def is_doppler_item(self, item_name: str) -> tuple[bool, str]:
         """
@@ -367,10 +417,10 @@ class SkinSearchScraper:
                     skin = f"{self.norm(doppler_base)}/{self.norm(phase)}"
                 else:
                     # Remove condition suffix manually if present (e.g., _field-tested)
-                    skin = self.norm(re.sub(r'_(factory_new|minimal_wear|field_tested|well_worn|battle_scarred|fn|mw|ft|ww|bs)$', '', raw_skin.lower()), remove_condition=True)
+                    skin = self.norm(CONDITION_SUFFIX_RE.sub('', raw_skin.lower()), remove_condition=True)
             else:
                 # Remove condition suffix manually if present (e.g., _field-tested)
-                skin = self.norm(re.sub(r'_(factory_new|minimal_wear|field_tested|well_worn|battle_scarred|fn|mw|ft|ww|bs)$', '', raw_skin.lower()), remove_condition=True)
+                skin = self.norm(CONDITION_SUFFIX_RE.sub('', raw_skin.lower()), remove_condition=True)
             
             condition = kwargs.get('condition', 'FN')
             variant = kwargs.get('variant', 'normal')
@@ -505,98 +555,146 @@ class SkinSearchScraper:
         else:
             raise ValueError(f"Unknown item_type: {item_type}")
 
-    def fetch_price(self, item_type: str, url: str) -> Optional[PriceInfo]:
+    def build_api_url(self, item_type: str, url: str) -> str:
+        """Translate an item page URL into the SkinSearch price API URL"""
+        parts = url.split('/')
+        if item_type == 'weapon':
+            idx = parts.index('item') + 1
+            weapon = parts[idx]
+            skin = parts[idx+1] if len(parts) > idx+1 else ''
+            condition = parts[idx+2] if len(parts) > idx+2 else ''
+            variant = parts[idx+3] if len(parts) > idx+3 else 'normal'
+            api_url = f"{self.BASE_URL}/api/item/weapons/{weapon}/{skin}/{condition}/{variant}"
+        elif item_type == 'knife':
+            if 'weapons' in parts:
+                idx = parts.index('weapons') + 1
+                knife = parts[idx] if len(parts) > idx else ''
+                skin_parts = []
+                current_idx = idx + 1
+                if current_idx < len(parts) and parts[current_idx] in ['doppler', 'gamma_doppler']:
+                    doppler_base = parts[current_idx]
+                    current_idx += 1
+                    if current_idx < len(parts) and parts[current_idx] in ['phase_1', 'phase_2', 'phase_3', 'phase_4', 'ruby', 'sapphire', 'black_pearl', 'emerald']:
+                        phase = parts[current_idx]
+                        skin = f"{doppler_base}/{phase}"
+                        current_idx += 1
+                    else:
+                        skin = doppler_base
+                else:
+                    skin = parts[current_idx] if current_idx < len(parts) else ''
+                    current_idx += 1
+                condition = parts[current_idx] if current_idx < len(parts) else ''
+                variant = parts[current_idx + 1] if current_idx + 1 < len(parts) else 'normal'
+                api_url = f"{self.BASE_URL}/api/item/weapons/{knife}/{skin}/{condition}/{variant}"
+            else:
+                idx = parts.index('item') + 1
+                knife = parts[idx]
+                skin = parts[idx+1] if len(parts) > idx+1 else ''
+                condition = parts[idx+2] if len(parts) > idx+2 else ''
+                variant = parts[idx+3] if len(parts) > idx+3 else 'normal'
+                api_url = f"{self.BASE_URL}/api/item/weapons/{knife}/{skin}/{condition}/{variant}"
+        elif item_type == 'glove':
+            if 'weapons' in parts:
+                idx = parts.index('weapons') + 1
+                glove = parts[idx] if len(parts) > idx else ''
+                skin = parts[idx+1] if len(parts) > idx+1 else ''
+                condition = parts[idx+2] if len(parts) > idx+2 else ''
+                api_url = f"{self.BASE_URL}/api/item/weapons/{glove}/{skin}/{condition}/normal"
+            else:
+                idx = parts.index('item') + 1
+                glove = parts[idx] if len(parts) > idx else ''
+                skin = parts[idx+1] if len(parts) > idx+1 else ''
+                condition = parts[idx+2] if len(parts) > idx+2 else ''
+                api_url = f"{self.BASE_URL}/api/item/weapons/{glove}/{skin}/{condition}/normal"
+        elif item_type == 'music_kit':
+            idx = parts.index('music_kit') + 1
+            music_kit_name = parts[idx]
+            api_url = f"{self.BASE_URL}/api/item/music_kits/{music_kit_name}"
+        elif item_type == 'sticker':
+            idx = parts.index('sticker') + 1
+            sticker_name = parts[idx]
+            api_url = f"{self.BASE_URL}/api/item/stickers/{sticker_name}"
+        elif item_type == 'case' or item_type == 'souvenir_package':
+            idx = parts.index('crate') + 1
+            case_name = parts[idx]
+            api_url = f"{self.BASE_URL}/api/item/crates/{case_name}"
+        elif item_type == 'charm':
+            idx = parts.index('charm') + 1
+            charm_name = parts[idx]
+            api_url = f"{self.BASE_URL}/api/item/charms/{charm_name}"
+        elif item_type == 'agent':
+            idx = parts.index('agent') + 1
+            agent_name = parts[idx]
+            api_url = f"{self.BASE_URL}/api/item/agents/{agent_name}"
+        elif item_type == 'capsule':
+            idx = parts.index('capsule') + 1
+            capsule_name = parts[idx]
+            api_url = f"{self.BASE_URL}/api/item/capsules/{capsule_name}"
+        else:
+            api_url = url.replace('/item/', '/api/item/')
+        markets = ["csfloat","bitskins","csdeals","csmoney","skinport","skinbaron","dmarket","skinbid","buff163","tradeit","steam","pirateswap","skinsmonkey","skinvault"]
+        api_url += f"/?l=en_US&m={json.dumps(markets)}"
+        return api_url
+
+    def fetch_price(self, item_type: str, url: str,
+                    abandoned: Optional[threading.Event] = None) -> Optional[PriceInfo]:
+        """
+        Price one item URL. abandoned is set by callers that no longer need the result
+        (a competing Doppler phase won); remaining attempts are skipped and a miss is not recorded.
+        """
         # Retry logic: up to 3 attempts, 15s timeout per attempt
         max_attempts = 3
+        try:
+            api_url = self.build_api_url(item_type, url)
+        except Exception as e:
+            logger.error(f"[SkinSearch] Could not build API URL for {url}: {e}")
+            return None
+        cached = quote_cache.get(api_url)
+        if cached is not None:
+            logger.debug(f"[SkinSearch] Quote cache hit for {api_url}")
+            return PriceInfo(**cached)
+        if negative_cache.should_skip(api_url):
+            logger.debug(f"[SkinSearch] Skipping recently unpriced item: {api_url}")
+            return None
+        # Concurrent lookups of the same API URL share one upstream request
+        return price_flight.do(api_url, self._fetch_and_cache_price, item_type, url, api_url, max_attempts, abandoned)
+
+    def _fetch_and_cache_price(self, item_type: str, url: str, api_url: str, max_attempts: int,
+                               abandoned: Optional[threading.Event] = None) -> Optional[PriceInfo]:
+        price_info, miss_reason = self._fetch_price_uncached(item_type, url, api_url, max_attempts, abandoned)
+        if price_info is not None:
+            quote_cache.set(api_url, asdict(price_info), category=item_type)
+            negative_cache.record_success(api_url)
+        elif miss_reason and not (abandoned and abandoned.is_set()):
+            # Only a definite "no price" answer backs the item off; outages and throttling do not
+            negative_cache.record_failure(api_url, miss_reason)
+        return price_info
+
+    def _fetch_price_uncached(self, item_type: str, url: str, api_url: str, max_attempts: int,
+                              abandoned: Optional[threading.Event] = None) -> Tuple[Optional[PriceInfo], Optional[str]]:
+        """
+        Fetch a price from the API. Returns (price_info, None) on success, otherwise (None, reason)
+        where reason is set only when the last attempt got a 200 response without a usable price
+        """
         eur_rate = self.get_eur_conversion_rate('USD')
+        miss_reason = None
         for attempt in range(1, max_attempts + 1):
+            if abandoned is not None and abandoned.is_set():
+                logger.debug(f"[SkinSearch] Lookup no longer needed, stopping: {api_url}")
+                return None, None
+            miss_reason = None
             try:
-                # Build API endpoint from item URL
-                parts = url.split('/')
-                if item_type == 'weapon':
-                    idx = parts.index('item') + 1
-                    weapon = parts[idx]
-                    skin = parts[idx+1] if len(parts) > idx+1 else ''
-                    condition = parts[idx+2] if len(parts) > idx+2 else ''
-                    variant = parts[idx+3] if len(parts) > idx+3 else 'normal'
-                    api_url = f"{self.BASE_URL}/api/item/weapons/{weapon}/{skin}/{condition}/{variant}"
-                elif item_type == 'knife':
-                    if 'weapons' in parts:
-                        idx = parts.index('weapons') + 1
-                        knife = parts[idx] if len(parts) > idx else ''
-                        skin_parts = []
-                        current_idx = idx + 1
-                        if current_idx < len(parts) and parts[current_idx] in ['doppler', 'gamma_doppler']:
-                            doppler_base = parts[current_idx]
-                            current_idx += 1
-                            if current_idx < len(parts) and parts[current_idx] in ['phase_1', 'phase_2', 'phase_3', 'phase_4', 'ruby', 'sapphire', 'black_pearl', 'emerald']:
-                                phase = parts[current_idx]
-                                skin = f"{doppler_base}/{phase}"
-                                current_idx += 1
-                            else:
-                                skin = doppler_base
-                        else:
-                            skin = parts[current_idx] if current_idx < len(parts) else ''
-                            current_idx += 1
-                        condition = parts[current_idx] if current_idx < len(parts) else ''
-                        variant = parts[current_idx + 1] if current_idx + 1 < len(parts) else 'normal'
-                        api_url = f"{self.BASE_URL}/api/item/weapons/{knife}/{skin}/{condition}/{variant}"
-                    else:
-                        idx = parts.index('item') + 1
-                        knife = parts[idx]
-                        skin = parts[idx+1] if len(parts) > idx+1 else ''
-                        condition = parts[idx+2] if len(parts) > idx+2 else ''
-                        variant = parts[idx+3] if len(parts) > idx+3 else 'normal'
-                        api_url = f"{self.BASE_URL}/api/item/weapons/{knife}/{skin}/{condition}/{variant}"
-                elif item_type == 'glove':
-                    if 'weapons' in parts:
-                        idx = parts.index('weapons') + 1
-                        glove = parts[idx] if len(parts) > idx else ''
-                        skin = parts[idx+1] if len(parts) > idx+1 else ''
-                        condition = parts[idx+2] if len(parts) > idx+2 else ''
-                        api_url = f"{self.BASE_URL}/api/item/weapons/{glove}/{skin}/{condition}/normal"
-                    else:
-                        idx = parts.index('item') + 1
-                        glove = parts[idx] if len(parts) > idx else ''
-                        skin = parts[idx+1] if len(parts) > idx+1 else ''
-                        condition = parts[idx+2] if len(parts) > idx+2 else ''
-                        api_url = f"{self.BASE_URL}/api/item/weapons/{glove}/{skin}/{condition}/normal"
-                elif item_type == 'music_kit':
-                    idx = parts.index('music_kit') + 1
-                    music_kit_name = parts[idx]
-                    api_url = f"{self.BASE_URL}/api/item/music_kits/{music_kit_name}"
-                elif item_type == 'sticker':
-                    idx = parts.index('sticker') + 1
-                    sticker_name = parts[idx]
-                    api_url = f"{self.BASE_URL}/api/item/stickers/{sticker_name}"
-                elif item_type == 'case' or item_type == 'souvenir_package':
-                    idx = parts.index('crate') + 1
-                    case_name = parts[idx]
-                    api_url = f"{self.BASE_URL}/api/item/crates/{case_name}"
-                elif item_type == 'charm':
-                    idx = parts.index('charm') + 1
-                    charm_name = parts[idx]
-                    api_url = f"{self.BASE_URL}/api/item/charms/{charm_name}"
-                elif item_type == 'agent':
-                    idx = parts.index('agent') + 1
-                    agent_name = parts[idx]
-                    api_url = f"{self.BASE_URL}/api/item/agents/{agent_name}"
-                elif item_type == 'capsule':
-                    idx = parts.index('capsule') + 1
-                    capsule_name = parts[idx]
-                    api_url = f"{self.BASE_URL}/api/item/capsules/{capsule_name}"
-                else:
-                    api_url = url.replace('/item/', '/api/item/')
-                markets = ["csfloat","bitskins","csdeals","csmoney","skinport","skinbaron","dmarket","skinbid","buff163","tradeit","steam","pirateswap","skinsmonkey","skinvault"]
-                import json
-                api_url += f"/?l=en_US&m={json.dumps(markets)}"
                 logger.info(f"[SkinSearch] Fetching price for item_type: {item_type}, API URL: {api_url} (attempt {attempt})")
-                resp = requests.get(api_url, headers=self.HEADERS, timeout=15)
+                if attempt > 1:
+                    time.sleep(http_client.backoff_delay(attempt - 1))
+                # Transport retries are handled by the attempt loop, so the client does not retry itself
+                resp = http_client.get(api_url, headers=self.HEADERS, timeout=15, retries=0)
                 if resp.status_code != 200:
                     logger.warning(f"[SkinSearch] Non-200 response for API URL: {api_url} (attempt {attempt})")
                     continue
                 if not resp.text or resp.text.strip() == "":
                     logger.warning(f"[SkinSearch] Empty response for API URL: {api_url} (attempt {attempt})")
+                    miss_reason = 'empty response'
                     continue
                 market_url = None
                 resp_text = resp.text.strip()
@@ -604,16 +702,19 @@ class SkinSearchScraper:
                     try:
                         data = resp.json()
                     except Exception as e:
-                        import re
-                        match = re.search(r'"market":"csfloat","price":(\d+)', resp.text)
+                        match = CSFLOAT_PRICE_RE.search(resp.text)
                         if match:
                             price = int(match.group(1))
                             price_eur = round(price * eur_rate, 2)
-                            return PriceInfo(price=price_eur, url=None, market="csfloat")
+                            return PriceInfo(price=price_eur, url=None, market="csfloat"), None
                         logger.error(f"[SkinSearch] Error parsing JSON and extracting price: {e} (attempt {attempt})")
+                        miss_reason = 'unparseable response'
                         continue
                 else:
+                    miss_reason = 'unparseable response'
                     continue
+                price = None
+                market_prices = self._parse_market_prices(data, eur_rate)
                 if "item" in data and "listings" in data["item"]:
                     listings = data["item"].get("listings", [])
                     for entry in listings:
@@ -630,8 +731,7 @@ class SkinSearchScraper:
                         market_url = csfloat.get("url")
                         logger.info(f"[SkinSearch] Found csfloat price in markets: {price} for {api_url}")
                 if price is None and "prices" in data:
-                    import re
-                    m = re.search(r'/([A-Z]{2})(?:/|$)', url)
+                    m = QUALITY_SEGMENT_RE.search(url)
                     requested_quality = m.group(1) if m else None
                     for entry in data["prices"]:
                         if entry.get("quality") == requested_quality:
@@ -645,8 +745,9 @@ class SkinSearchScraper:
                         price = price / 100.0
                     price_eur = round(float(price) * eur_rate, 2)
                     logger.info(f"[SkinSearch] Successfully extracted price: {price_eur} EUR from {api_url}")
-                    return PriceInfo(price=price_eur, url=market_url, market="csfloat")
+                    return PriceInfo(price=price_eur, url=market_url, market="csfloat", markets=market_prices or None), None
                 logger.warning(f"[SkinSearch] No csfloat price found for API URL: {api_url} (attempt {attempt})")
+                miss_reason = 'no price in response'
                 logger.debug(f"[SkinSearch] API response structure for {api_url} (attempt {attempt}):")
                 logger.debug(f"[SkinSearch] - Has 'item' key: {'item' in data}")
                 logger.debug(f"[SkinSearch] - Has 'markets' key: {'markets' in data}")
@@ -656,97 +757,224 @@ class SkinSearchScraper:
                     available_markets = [entry.get("market", "unknown") for entry in listings[:5]]
                     logger.debug(f"[SkinSearch] - Available markets in listings (first 5): {available_markets}")
                 logger.debug(f"[SkinSearch] Full API response for {api_url} (attempt {attempt}):\n{resp.text[:1000]}...")
+            except CircuitOpenError:
+                # Upstream is marked down; fail fast instead of burning the remaining attempts
+                raise
             except Exception as e:
                 logger.error(f"[SkinSearch] Error fetching price: {e} (attempt {attempt})")
+                miss_reason = None
                 continue
-        return None
+        return None, miss_reason
+
+    @staticmethod
+    def _to_eur(price, eur_rate: float) -> Optional[float]:
+        """Convert a raw SkinSearch price (integer cents or float USD) to EUR"""
+        if price is None or isinstance(price, bool):
+            return None
+        try:
+            value = price / 100.0 if isinstance(price, int) else float(price)
+        except (TypeError, ValueError):
+            return None
+        return round(value * eur_rate, 2)
+
+    def _parse_market_prices(self, data: dict, eur_rate: float) -> Dict[str, float]:
+        """Collect the lowest EUR price for every market present in a SkinSearch response"""
+        market_prices: Dict[str, float] = {}
+
+        def add(market, price):
+            market = str(market or '').lower()
+            price_eur = self._to_eur(price, eur_rate)
+            if market and price_eur is not None and price_eur > 0:
+                if market not in market_prices or price_eur < market_prices[market]:
+                    market_prices[market] = price_eur
+
+        if isinstance(data, dict):
+            item = data.get("item")
+            if isinstance(item, dict):
+                for entry in item.get("listings") or []:
+                    if isinstance(entry, dict):
+                        add(entry.get("market"), entry.get("price"))
+            markets = data.get("markets")
+            if isinstance(markets, dict):
+                for market, entry in markets.items():
+                    if isinstance(entry, dict):
+                        add(market, entry.get("price"))
+        return market_prices
 
     def scrape_steam_item(self, item: dict) -> Optional[PriceInfo]:
         self.is_running = True
         self.last_used = datetime.now().isoformat()
         logger.info(f"[SkinSearch] Status set to running at {self.last_used}")
         try:
-            item_type, url_args = self.map_steam_item_to_skinsearch_args(item)
-            if item_type and url_args:
-                # Check if this is a Doppler item that needs fallback handling
-                if url_args.get('_doppler_fallback'):
-                    result = self._scrape_doppler_with_fallback(item, item_type, url_args)
-                    return result
-                url = self.build_url(item_type, **url_args)
-                if url is None:
-                    logger.info(f"[SkinSearch] Skipping item due to missing or N/A segments: {item}")
-                    return None
-                result = self.fetch_price(item_type, url)
-                return result
-            return None
+            return self._scrape_steam_item(item)
         finally:
             self.is_running = False
             self.last_used = datetime.now().isoformat()
             logger.info(f"[SkinSearch] Status set to idle at {self.last_used}")
 
+    def resolve_item(self, item: dict) -> Tuple[Optional[str], Optional[dict], Optional[str]]:
+        """
+        Resolve a steam item to (item_type, url_args, url).
+
+        Results are memoized by (name, item_category, item_type, condition) and shared
+        across scraper instances. Doppler items are not memoized because their phase
+        detection depends on per-asset data.
+        """
+        name = item.get('name', '')
+        key = (name, item.get('item_category', ''), item.get('item_type', ''), item.get('condition', 'FN'))
+        memoizable = 'doppler' not in name.lower()
+        if memoizable:
+            with self._resolve_lock:
+                cached = self._resolve_memo.get(key)
+                if cached is not None:
+                    self._resolve_memo.move_to_end(key)
+                    return cached
+
+        item_type, url_args = self.map_steam_item_to_skinsearch_args(item)
+        url = None
+        if item_type and url_args and not url_args.get('_doppler_fallback'):
+            url = self.build_url(item_type, **url_args)
+        resolved = (item_type, url_args, url)
+
+        if memoizable:
+            with self._resolve_lock:
+                self._resolve_memo[key] = resolved
+                if len(self._resolve_memo) > RESOLVE_MEMO_SIZE:
+                    self._resolve_memo.popitem(last=False)
+        return resolved
+
+    def resolve_items(self, items: List[dict]) -> List[Tuple[Optional[str], Optional[dict], Optional[str]]]:
+        """Resolve a list of steam items in one call; items sharing a name resolve once"""
+        return [self.resolve_item(item) for item in items]
+
+    def _scrape_steam_item(self, item: dict) -> Optional[PriceInfo]:
+        """Map, build and fetch the price for one item without touching the running status"""
+        item_key = f"item:{item.get('name', '')}"
+        if negative_cache.should_skip(item_key):
+            logger.debug(f"[SkinSearch] Skipping recently unmappable item: {item.get('name')}")
+            return None
+        item_type, url_args, url = self.resolve_item(item)
+        if item_type and url_args:
+            # Check if this is a Doppler item that needs fallback handling
+            if url_args.get('_doppler_fallback'):
+                return self._scrape_doppler_with_fallback(item, item_type, url_args)
+            if url is None:
+                logger.info(f"[SkinSearch] Skipping item due to missing or N/A segments: {item}")
+                negative_cache.record_failure(item_key, 'missing or N/A URL segments')
+                return None
+            return self.fetch_price(item_type, url)
+        negative_cache.record_failure(item_key, 'no SkinSearch mapping')
+        return None
+
+    def should_skip_item(self, item: dict) -> bool:
+        """Return True for items that are known not to be listed on SkinSearch"""
+        item_type, _, _ = self.resolve_item(item)
+        # Skip patch packs (not present on SkinSearch)
+        if item_type == 'capsule' and 'patch_pack' in item.get('item_type', '').lower():
+            logger.info(f"[SkinSearch] Skipping patch pack (not present on SkinSearch): {item.get('name')}")
+            return True
+        return False
+
+    def _doppler_memo_key(self, item: dict, base_url_args: dict) -> Optional[str]:
+        """Identity used to remember the resolved phase of a Doppler item"""
+        classid, instanceid = item.get('classid'), item.get('instanceid')
+        if classid and instanceid:
+            identity = f"class:{classid}_{instanceid}"
+        elif item.get('paint_index') is not None:
+            identity = f"paint:{item['paint_index']}"
+        else:
+            return None
+        weapon_or_knife = base_url_args.get('weapon') or base_url_args.get('knife_type')
+        return f"{identity}|{weapon_or_knife}|{base_url_args.get('condition', 'FN')}|{base_url_args.get('variant', 'normal')}"
+
     def _scrape_doppler_with_fallback(self, item: dict, item_type: str, base_url_args: dict) -> Optional[PriceInfo]:
         """
-        Handle Doppler items when phase detection failed by trying all possible phases
+        Handle Doppler items when phase detection failed.
+        Uses the remembered phase for this item if known, otherwise fetches every
+        candidate phase concurrently and takes the first one with a price.
         """
         doppler_type = base_url_args.get('_doppler_type', 'doppler')
         weapon_or_knife = base_url_args.get('weapon') or base_url_args.get('knife_type')
         condition = base_url_args.get('condition', 'FN')
-        variant = base_url_args.get('variant', 'normal')
-        
+        # Create clean url_args without the fallback markers
+        clean_args = {k: v for k, v in base_url_args.items() if not k.startswith('_')}
+        memo_key = self._doppler_memo_key(item, base_url_args)
+
+        known_phase = doppler_phase_memo.get(memo_key) if memo_key else None
+        if known_phase:
+            url = self.build_url(item_type, **{**clean_args, 'skin': known_phase})
+            if url:
+                logger.info(f"[SkinSearch] Using remembered Doppler phase {known_phase} for {weapon_or_knife}")
+                price_info = self.fetch_price(item_type, url)
+                if price_info:
+                    return price_info
+
         logger.info(f"[SkinSearch] Trying Doppler fallback for {weapon_or_knife} ({doppler_type})")
         
-        # Get all possible phase variants to try
-        phase_variants = self.get_doppler_skin_variants(weapon_or_knife, condition, doppler_type)
-        
-        # Try each phase variant until we find one with a price
-        for phase_skin in phase_variants:
+        # Build URLs for all possible phase variants
+        candidates = []
+        for phase_skin in self.get_doppler_skin_variants(weapon_or_knife, condition, doppler_type):
             try:
-                # Create clean url_args without the fallback markers
-                clean_args = {k: v for k, v in base_url_args.items() if not k.startswith('_')}
-                clean_args['skin'] = phase_skin
-                
-                url = self.build_url(item_type, **clean_args)
+                url = self.build_url(item_type, **{**clean_args, 'skin': phase_skin})
                 if url:
-                    logger.info(f"[SkinSearch] Trying Doppler phase: {phase_skin}")
-                    price_info = self.fetch_price(item_type, url)
-                    if price_info:
-                        logger.info(f"[SkinSearch] Found price for Doppler phase {phase_skin}: {price_info.price} EUR")
-                        return price_info
-                    else:
-                        logger.debug(f"[SkinSearch] No price found for phase: {phase_skin}")
+                    candidates.append((phase_skin, url))
             except Exception as e:
-                logger.warning(f"[SkinSearch] Error trying Doppler phase {phase_skin}: {e}")
-                continue
+                logger.warning(f"[SkinSearch] Error building URL for Doppler phase {phase_skin}: {e}")
+        if not candidates:
+            return None
+
+        # Fetch phases concurrently on the shared, bounded Doppler executor; the first phase in
+        # candidate order with a price wins, matching the order the sequential fallback used
+        abandoned = threading.Event()
+        futures = [
+            (phase_skin, _doppler_executor.submit(self.fetch_price, item_type, url, abandoned=abandoned))
+            for phase_skin, url in candidates
+        ]
+        try:
+            for phase_skin, future in futures:
+                try:
+                    price_info = future.result()
+                except CircuitOpenError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"[SkinSearch] Error trying Doppler phase {phase_skin}: {e}")
+                    continue
+                if price_info:
+                    logger.info(f"[SkinSearch] Found price for Doppler phase {phase_skin}: {price_info.price} EUR")
+                    if memo_key:
+                        doppler_phase_memo.set(memo_key, phase_skin)
+                    return price_info
+                logger.debug(f"[SkinSearch] No price found for phase: {phase_skin}")
+        finally:
+            # Phases still queued are dropped; phases in flight stop before their next attempt
+            abandoned.set()
+            for _, future in futures:
+                future.cancel()
         
         logger.warning(f"[SkinSearch] No price found for any Doppler phase of {weapon_or_knife}")
         return None
 
-    def batch_update_steam_prices(self, steam_items):
+    def batch_update_steam_prices(self, steam_items, max_concurrency: int = 8):
+        """
+        Price a batch of steam items concurrently. Request pacing per host comes from
+        the host guards' adaptive rate limiters (resilience.py).
+
+        Returns one entry per input item, in input order:
+        {'name', 'price_info', 'elapsed', 'error', 'index', 'tripped_host'}
+        """
         self.is_running = True
         self.last_used = datetime.now().isoformat()
         logger.info(f"[SkinSearch] Status set to running at {self.last_used}")
-        results = []
         try:
-            for item in steam_items:
-                # Log the raw item
-                logger.info(f"[SkinSearch] Processing item: {item}")
-                # Log mapping result
-                item_type, url_args = self.map_steam_item_to_skinsearch_args(item)
-                logger.info(f"[SkinSearch] Mapping result: item_type={item_type}, url_args={url_args}")
-                # Skip patch packs (not present on SkinSearch)
-                if item_type == 'capsule' and 'patch_pack' in item.get('item_type', '').lower():
-                    logger.info(f"[SkinSearch] Skipping patch pack (not present on SkinSearch): {item['name']}")
-                    print(f"{item['name']} | Skipped (patch pack)")
-                    continue
-                price_info = self.scrape_steam_item(item)
-                print(f"{item['name']} | Price: {price_info}")
-                results.append({'name': item.get('name'), 'price_info': price_info})
-                # Here you could update the database with price_info.price
+            engine = AsyncPricingEngine(self, max_concurrency=max_concurrency)
+            results = [result.to_dict() for result in engine.price_items(list(steam_items))]
+            for result in results:
+                logger.debug(f"[SkinSearch] {result['name']} | Price: {result['price_info']} | {result['elapsed']}s")
+            return results
         finally:
             self.is_running = False
             self.last_used = datetime.now().isoformat()
             logger.info(f"[SkinSearch] Status set to idle at {self.last_used}")
-        return results
 
 # Example usage
 def test_skinsearch_scraper():
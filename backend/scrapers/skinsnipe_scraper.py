@@ -3,16 +3,15 @@
 SkinSnipe.com Scraper - CS2 skin price aggregator
 """
 
+import os
 import time
 import random
 import re
 import logging
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import (
     TimeoutException, 
     NoSuchElementException, 
@@ -20,18 +19,48 @@ from selenium.common.exceptions import (
     WebDriverException
 )
 
+from .browser_pool import browser_pool
+from .network_capture import NetworkCapture
+from .price_cache import skinsnipe_cache
+from .wait_engine import WaitEngine
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Seconds a cached search result stays fresh enough for batch pricing
+BATCH_MAX_AGE = float(os.getenv('SKINSNIPE_BATCH_MAX_AGE', '300'))
+
+# 'network' reads prices from the site's own JSON responses (DOM scraping as fallback), 'dom' scrapes only.
+# Off by default: the response schema is matched generically and not verified against the live site.
+CAPTURE_MODE = os.getenv('SKINSNIPE_CAPTURE', 'dom').strip().lower()
+# Seconds to wait for a matching JSON response after typing the query / opening the item page
+CAPTURE_TIMEOUT = float(os.getenv('SKINSNIPE_CAPTURE_TIMEOUT', '3'))
+# Consecutive DOM fallbacks after which capture is switched off for the rest of the session
+CAPTURE_MAX_MISSES = int(os.getenv('SKINSNIPE_CAPTURE_MAX_MISSES', '3'))
+
+# JSON fields looked at when reading prices out of captured responses
+JSON_NAME_KEYS = ('market_hash_name', 'marketHashName', 'fullName', 'full_name', 'name', 'title')
+JSON_PRICE_KEYS = ('lowestPrice', 'lowest_price', 'minPrice', 'min_price', 'bestPrice', 'best_price',
+                   'cheapest', 'price')
+JSON_CENT_KEYS = ('priceCents', 'price_cents', 'lowestPriceCents', 'lowest_price_cents')
+JSON_CONDITION_KEYS = ('wear', 'exterior', 'condition', 'quality')
+
 class SkinSnipeScraper:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, capture_mode=None):
         self.headless = headless
         self.driver = None
+        self.wait = None  # WaitEngine bound to the leased driver
+        self.capture_mode = (capture_mode or CAPTURE_MODE).lower()
+        self.capture = None  # NetworkCapture on the leased driver (network mode only)
+        self.capture_enabled = False  # Cleared after CAPTURE_MAX_MISSES consecutive fallbacks
+        self.capture_hits = 0
+        self.capture_fallbacks = 0
+        self.capture_misses = 0  # Consecutive fallbacks
         self.base_url = "https://www.skinsnipe.com"
         self.session_active = False
         self.max_retries = 2
-        self.search_cache = {}
+        self.search_cache = skinsnipe_cache  # Bounded LRU+TTL cache shared by all instances
         self.last_request_time = 0
         self.request_count = 0
         
@@ -93,55 +122,26 @@ class SkinSnipeScraper:
         ]
         
     def setup_driver(self):
-        """Initialize Chrome WebDriver with optimized options"""
+        """Lease a Chrome WebDriver (no images, automation flags hidden) from the shared browser pool"""
         try:
-            chrome_options = Options()
-            
-            if self.headless:
-                chrome_options.add_argument("--headless")
-                chrome_options.add_argument("--window-size=1920,1080")
-            else:
-                chrome_options.add_argument("--window-size=1920,1080")
-            
-            # Performance optimizations
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--disable-images")
-            chrome_options.add_argument("--disable-plugins")
-            chrome_options.add_argument("--disable-extensions")
-            chrome_options.add_argument("--disable-web-security")
-            
-            # Anti-detection measures
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # Random user agent
-            user_agents = [
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
-            ]
-            selected_ua = random.choice(user_agents)
-            chrome_options.add_argument(f"--user-agent={selected_ua}")
-            
-            # Disable image loading for faster performance
-            prefs = {
-                "profile.managed_default_content_settings.images": 2,
-                "profile.default_content_setting_values.notifications": 2,
-                "profile.default_content_settings.popups": 0
-            }
-            chrome_options.add_experimental_option("prefs", prefs)
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            
-            # Hide automation indicators
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            self.driver.implicitly_wait(5)
+            # Only the capture profile records the performance log
+            profile = 'no_images_capture' if self.capture_mode == 'network' else 'no_images'
+            self.driver = browser_pool.lease(profile=profile, headless=self.headless, implicit_wait=5,
+                                             blocking='SkinSnipe')
+            self.wait = WaitEngine(self.driver, 'SkinSnipe', implicit_wait=5)
+            self.capture = None
+            self.capture_enabled = False
+            if self.capture_mode == 'network':
+                if NetworkCapture.available(self.driver):
+                    self.capture = NetworkCapture(self.driver, url_filter='skinsnipe')
+                    self.capture.drain()  # Events left over from the browser's previous lease
+                    self.capture_enabled = True
+                    self.capture_misses = 0
+                else:
+                    logger.warning("Performance log unavailable - SkinSnipe prices will be scraped from the DOM")
             self.session_active = True
             
-            logger.info(f"Chrome WebDriver initialized for SkinSnipe scraping")
+            logger.info(f"Chrome WebDriver leased for SkinSnipe scraping")
             return True
             
         except Exception as e:
@@ -302,13 +302,137 @@ class SkinSnipeScraper:
         logger.debug(f"Expected variant text for '{condition}' (StatTrak: {is_stattrak}) from original item '{original_item_name}': '{variant_text}'")
         return variant_text
     
-    def search_item(self, item_name, condition=None, unique_id=None, force_fresh=False):
+    @staticmethod
+    def cache_key(item_name, condition=None):
+        """Search cache key from the normalized item name and condition"""
+        name = ' '.join(item_name.replace('™', '').split()).lower()
+        return f"skinsnipe:{name}|{(condition or '').strip().lower()}"
+    
+    @staticmethod
+    def _normalize_json_name(text):
+        """Lowercase name without ™/★ and with collapsed whitespace, for comparing JSON names"""
+        text = str(text).replace('™', '').replace('★', '')
+        return ' '.join(text.split()).lower()
+    
+    def _json_price(self, entry):
+        """Price in USD from a JSON object, or 0.0"""
+        for key in JSON_CENT_KEYS:
+            if isinstance(entry.get(key), (int, float)) and entry[key] > 0:
+                return entry[key] / 100
+        for key in JSON_PRICE_KEYS:
+            value = entry.get(key)
+            if isinstance(value, bool) or value is None:
+                continue
+            if isinstance(value, (int, float)):
+                price = float(value)
+            elif isinstance(value, str):
+                price = self.parse_price(value)
+            elif isinstance(value, dict):
+                # e.g. {"price": {"amount": 1.23, "currency": "USD"}}
+                price = self._json_price({'price': value.get('amount', value.get('value'))})
+            else:
+                continue
+            if price > 0:
+                return price
+        return 0.0
+    
+    def _split_wear(self, item_name, condition):
+        """(base name, wear) of an item; only a known wear suffix like '(Field-Tested)' is split off"""
+        name = self._normalize_json_name(item_name)
+        wear = condition if condition and condition != 'N/A' else None
+        for known in self.condition_mapping:
+            suffix = f" ({known.lower()})"
+            if known != 'N/A' and name.endswith(suffix):
+                return name[:-len(suffix)], wear or known
+        return name, wear
+    
+    def _json_match_rank(self, entry, item_name, condition):
+        """
+        How well a JSON object describes the item: 2 for the exact full market name,
+        1 for the base name plus a matching wear field, 0 for no match
+        """
+        names = [entry[key] for key in JSON_NAME_KEYS if isinstance(entry.get(key), str)]
+        if not names:
+            return 0
+        base, wear = self._split_wear(item_name, condition)
+        full_name = f"{base} ({wear.lower()})" if wear else base
+        rank = 0
+        for name in names:
+            name = self._normalize_json_name(name)
+            if name == full_name:
+                return 2
+            if wear and name == base:
+                entry_wear = next((entry[key] for key in JSON_CONDITION_KEYS if isinstance(entry.get(key), str)), None)
+                if entry_wear and entry_wear.replace(' ', '').lower() in (
+                        wear.replace(' ', '').lower(), self.condition_mapping.get(wear, '').lower()):
+                    rank = 1
+        return rank
+    
+    def _price_from_json(self, data, item_name, condition):
+        """
+        Price of the best matching object in a JSON document; None when nothing matches
+        or the best matches disagree on the price (the page is scraped instead)
+        """
+        best_rank, prices = 0, set()
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                rank = self._json_match_rank(node, item_name, condition)
+                price = self._json_price(node) if rank >= best_rank and rank else 0.0
+                if price > 0:
+                    if rank > best_rank:
+                        best_rank, prices = rank, set()
+                    prices.add(price)
+                stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+            elif isinstance(node, list):
+                stack.extend(value for value in node if isinstance(value, (dict, list)))
+        if len(prices) > 1:
+            logger.debug(f"Ambiguous network prices for {item_name}: {sorted(prices)}")
+            return None
+        return prices.pop() if prices else None
+    
+    def _price_from_responses(self, item_name, condition, search_start_time, timeout):
+        """Result built from captured JSON responses (cached like a DOM result), or None"""
+        if self.capture is None or not self.capture_enabled:
+            return None
+        try:
+            price = self.capture.wait_for(lambda url, data: self._price_from_json(data, item_name, condition),
+                                          timeout=timeout)
+        except Exception as e:
+            logger.debug(f"Network capture failed: {e}")
+            return None
+        if not price:
+            return None
+        
+        result = {
+            'item_name': item_name,
+            'found_name': item_name,
+            'source': 'skinsnipe.com',
+            'timestamp': time.time(),
+            'price': price,
+            'condition': condition,
+            'currency': 'USD',
+            'method': 'network'
+        }
+        self.search_cache.set(self.cache_key(item_name, condition), result)
+        self.capture_hits += 1
+        self.capture_misses = 0
+        logger.info(f"TOTAL search time for {item_name}: {time.time() - search_start_time:.2f} seconds")
+        logger.info(f"Found price for {item_name} in network response: ${price}")
+        return result
+    
+    def search_item(self, item_name, condition=None, unique_id=None, force_fresh=False, max_age=None):
         """
         Search for an item on SkinSnipe.com
         
         Args:
             item_name (str): Name of the CS2 item
             condition (str): Condition filter - optional
+            unique_id: Kept for callers that price duplicate items separately; identical
+                       name/condition pairs share one cached price
+            force_fresh (bool): Ignore cached results
+            max_age (float): Only reuse cached results younger than this many seconds
             
         Returns:
             dict: Item data with price information
@@ -334,13 +458,12 @@ class SkinSnipeScraper:
             }
         
         try:
-            # Check cache first (allow bypass for batch mode or unique items)
-            cache_key = f"{item_name}_{condition}"
-            if unique_id is not None:
-                cache_key += f"_{unique_id}"
-            if not force_fresh and cache_key in self.search_cache:
+            # Check cache first (bypassed with force_fresh, limited to recent entries with max_age)
+            cache_key = self.cache_key(item_name, condition)
+            cached = None if force_fresh else self.search_cache.get(cache_key)
+            if cached is not None and (max_age is None or time.time() - cached.get('timestamp', 0) <= max_age):
                 logger.info(f"Using cached result for: {item_name} (cache key: {cache_key})")
-                return self.search_cache[cache_key]
+                return cached
             if not self.driver or not self.session_active:
                 if not self.setup_driver():
                     logger.error("Failed to setup driver")
@@ -361,7 +484,7 @@ class SkinSnipeScraper:
                 try:
                     # Wait for the search input to be present
                     wait.until(EC.presence_of_element_located((By.XPATH, "/html/body/app-root/app-header/header/div/div[1]/div[1]/input")))
-                    time.sleep(1.5)  # Wait for JavaScript to load
+                    self.wait.ready(fixed=1.5, label='home')  # Wait for JavaScript to load
                     logger.debug("Page loaded successfully")
                 except TimeoutException:
                     logger.warning("Page did not load properly")
@@ -374,28 +497,35 @@ class SkinSnipeScraper:
                 
                 # Make sure the input is interactable by scrolling to it
                 self.driver.execute_script("arguments[0].scrollIntoView(true);", search_input)
-                time.sleep(0.5)
+                self.wait.until(lambda driver: search_input.is_displayed() and search_input.is_enabled(),
+                                fixed=0.5, label='search_input')
                 
                 # Clear and type the search term
                 search_input.clear()
-                time.sleep(0.3)
+                if self.capture is not None:
+                    # Only responses triggered by this search count; also keeps the log from growing
+                    self.capture.drain()
                 search_input.send_keys(formatted_name)
-                logger.info(f"Typed search query: {formatted_name}")                    # Wait for search suggestions to load
-                time.sleep(1)
+                logger.info(f"Typed search query: {formatted_name}")
+                
+                # The suggestion request may already carry the price
+                result = self._price_from_responses(item_name, condition, search_start_time, timeout=CAPTURE_TIMEOUT / 2)
+                if result:
+                    return result
                 
                 # Wait for search results dropdown to appear
                 try:
-                    # Wait a bit for dropdown to populate
-                    time.sleep(0.8)
-                    
-                    # Try to find search results dropdown
                     dropdown_selectors = [
                         "/html/body/app-root/app-header/header/div/div[1]/div[2]/div/div[2]/div/a",  # Your exact path
                         "/html/body/app-root/app-header/header/div/div[1]/div[2]//a",  # More flexible
                         "//app-header//div[contains(@class, 'dropdown')]//a",  # Generic dropdown
                         "//app-header//a[contains(@href, '/')]"  # Any link in header
                     ]
+                    # Wait for the search suggestions to populate
+                    self.wait.any_element([(By.XPATH, selector) for selector in dropdown_selectors[:3]],
+                                          fixed=1.8, label='dropdown')
                     
+                    # Try to find search results dropdown
                     first_result = None
                     for selector in dropdown_selectors:
                         try:
@@ -529,7 +659,7 @@ class SkinSnipeScraper:
                     
                     # Click the first result
                     self.driver.execute_script("arguments[0].scrollIntoView(true);", first_result)
-                    time.sleep(0.3)
+                    self.wait.until(lambda driver: first_result.is_displayed(), fixed=0.3, label='first_result')
                     
                     try:
                         first_result.click()
@@ -540,7 +670,7 @@ class SkinSnipeScraper:
                         logger.info("Clicked first search result with JavaScript click")
                     
                     # Wait for the item page to load
-                    time.sleep(2)
+                    self.wait.navigation(first_result, fixed=2, label='item_page')
                     
                     # Now handle condition selection and price extraction
                     return self.extract_price_from_page(item_name, condition, search_start_time)
@@ -573,8 +703,21 @@ class SkinSnipeScraper:
     def extract_price_from_page(self, item_name, condition, search_start_time):
         """Extract price from the current page, handling condition variants if needed"""
         try:
+            # The item page's own API response has the prices before they are rendered
+            result = self._price_from_responses(item_name, condition, search_start_time, timeout=CAPTURE_TIMEOUT)
+            if result:
+                return result
+            if self.capture is not None and self.capture_enabled:
+                self.capture_fallbacks += 1
+                self.capture_misses += 1
+                logger.info(f"No matching network response for {item_name} - falling back to the page")
+                if self.capture_misses >= CAPTURE_MAX_MISSES:
+                    self.capture_enabled = False
+                    logger.warning(f"{self.capture_misses} network capture misses in a row - "
+                                   f"scraping SkinSnipe prices from the DOM for the rest of this session")
+            
             # Wait for page to load
-            time.sleep(1.5)
+            self.wait.ready(fixed=1.5, label='item_page_render')
             
             # Check if there are condition variants to choose from
             if condition:
@@ -593,7 +736,7 @@ class SkinSnipeScraper:
                 
                 # Scroll to the price element to ensure it's visible
                 self.driver.execute_script("arguments[0].scrollIntoView(true);", price_element)
-                time.sleep(0.5)
+                self.wait.until(lambda driver: price_element.is_displayed(), fixed=0.5, label='price_element')
                 
                 price_text = price_element.text.strip()
                 logger.debug(f"Found price text: '{price_text}'")
@@ -619,8 +762,7 @@ class SkinSnipeScraper:
                             'currency': 'USD'  # SkinSnipe shows prices in dollars
                         }
                         
-                        cache_key = f"{item_name}_{condition}"
-                        self.search_cache[cache_key] = result
+                        self.search_cache.set(self.cache_key(item_name, condition), result)
                         
                         search_end_time = time.time()
                         logger.info(f"TOTAL search time for {item_name}: {search_end_time - search_start_time:.2f} seconds")
@@ -731,17 +873,17 @@ class SkinSnipeScraper:
                     if norm_variant == norm_expected:
                         logger.info(f"Found EXACT normalized match: '{variant_text}' == '{expected_variant}'")
                         self.driver.execute_script("arguments[0].scrollIntoView(true);", link)
-                        time.sleep(0.5)
+                        self.wait.until(lambda driver: link.is_displayed(), fixed=0.5, label='variant_link')
                         try:
                             link.click()
                             logger.info(f"✅ Successfully clicked exact variant: '{variant_text}'")
-                            time.sleep(2)
+                            self.wait.ready(fixed=2, label='variant_page')
                             return True
                         except Exception as click_e:
                             logger.debug(f"Regular click failed, trying JavaScript: {click_e}")
                             self.driver.execute_script("arguments[0].click();", link)
                             logger.info(f"✅ Successfully clicked exact variant with JS: '{variant_text}'")
-                            time.sleep(1.5)
+                            self.wait.ready(fixed=1.5, label='variant_page')
                             return True
 
                 # 2. Partial normalized match
@@ -749,17 +891,17 @@ class SkinSnipeScraper:
                     if norm_expected in norm_variant or norm_variant in norm_expected:
                         logger.info(f"Found PARTIAL normalized match: '{variant_text}' ~ '{expected_variant}'")
                         self.driver.execute_script("arguments[0].scrollIntoView(true);", link)
-                        time.sleep(0.5)
+                        self.wait.until(lambda driver: link.is_displayed(), fixed=0.5, label='variant_link')
                         try:
                             link.click()
                             logger.info(f"✅ Successfully clicked partial variant: '{variant_text}'")
-                            time.sleep(2)
+                            self.wait.ready(fixed=2, label='variant_page')
                             return True
                         except Exception as click_e:
                             logger.debug(f"Regular click failed, trying JavaScript: {click_e}")
                             self.driver.execute_script("arguments[0].click();", link)
                             logger.info(f"✅ Successfully clicked partial variant with JS: '{variant_text}'")
-                            time.sleep(1.5)
+                            self.wait.ready(fixed=1.5, label='variant_page')
                             return True
 
                 logger.warning(f"❌ No matching variant found for condition: '{condition}' (expected: '{expected_variant}')")
@@ -825,8 +967,13 @@ class SkinSnipeScraper:
             logger.debug(f"Error parsing price '{price_text}': {e}")
             return 0.0
     
-    def scrape_item_prices(self, items_data):
-        """Scrape prices for multiple items, allowing duplicate items to each get a price."""
+    def scrape_item_prices(self, items_data, max_age=None):
+        """
+        Scrape prices for multiple items, allowing duplicate items to each get a price.
+        Cached results younger than max_age seconds (default SKINSNIPE_BATCH_MAX_AGE) are reused.
+        """
+        if max_age is None:
+            max_age = BATCH_MAX_AGE
         results = []
         skipped_count = 0
         try:
@@ -841,8 +988,8 @@ class SkinSnipeScraper:
                 if not item_name:
                     continue
                 try:
-                    # Always force fresh scrape for each item in batch mode
-                    result = self.search_item(item_name, condition, unique_id=unique_id, force_fresh=True)
+                    # Batch mode only reuses results fresher than max_age
+                    result = self.search_item(item_name, condition, unique_id=unique_id, max_age=max_age)
                     if result:
                         results.append(result)
                         if result.get('skipped', False):
@@ -882,19 +1029,26 @@ class SkinSnipeScraper:
         return results
     
     def cleanup(self):
-        """Close the WebDriver and clear session state"""
+        """Return the WebDriver to the browser pool and clear session state"""
+        if self.wait is not None and self.wait.waits:
+            logger.info(f"Waits: {self.wait.summary()}")
+        if self.capture is not None:
+            logger.info(f"Network capture: {self.capture_hits} prices from JSON responses, "
+                        f"{self.capture_fallbacks} DOM fallbacks")
         if self.driver:
             try:
-                self.driver.quit()
-                logger.info("Chrome WebDriver closed")
+                browser_pool.release(self.driver)
+                logger.info("Chrome WebDriver returned to browser pool")
             except Exception as e:
                 logger.debug(f"Error closing driver: {e}")
             finally:
                 self.driver = None
+                self.wait = None
+                self.capture = None
                 self.session_active = False
     
     def clear_cache(self):
-        """Clear the search cache"""
+        """Clear the shared search cache"""
         self.search_cache.clear()
         logger.info("Search cache cleared")
     
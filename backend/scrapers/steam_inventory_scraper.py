@@ -4,8 +4,10 @@ Handles scraping of Steam inventory data for Counter-Strike 2 items
 
 Features:
 - Extracts basic item information (name, rarity, condition, category)
-- Steam inventory API integration
-- Item categorization and type detection
+- Steam inventory API integration with paging (count/start_assetid) for large inventories
+- Items are processed as pages stream in; pass on_batch to persist them incrementally
+- Raw pages cached on disk per (steam_id, app_id) within a freshness window (see inventory_cache)
+- Item categorization and type detection (precompiled rules in cs2_classifier)
 - Image URL extraction
 - Clean, simple implementation without pricing or float values
 
@@ -14,16 +16,18 @@ Usage:
     items = scraper.scrape(steam_id="76561198123456789")
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 import requests
+import hashlib
 import json
+import queue
+import threading
 from datetime import datetime
-from scrapers.skinsearch_scraper import SkinSearchScraper
+from scrapers.skinsearch_scraper import SkinSearchScraper, PriceInfo
+from http_client import http_client
+from resilience import CircuitOpenError
 import time
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -31,20 +35,20 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from bs4 import BeautifulSoup
 
 from .base_scraper import BaseScraper, ScraperError, ValidationError
+from .cs2_classifier import cs2_classifier
+from .inventory_cache import inventory_cache, inventory_content_hash
+from .browser_pool import browser_pool
+from .float_resolver import get_float_resolver
 
-# Import CSFloat scraper for float and pattern data
-try:
-    from .csfloat_scraper import CSFloatScraper
-    CSFLOAT_AVAILABLE = True
-except ImportError:
-    CSFLOAT_AVAILABLE = False
-
-# Try to import webdriver_manager, fallback if not available
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    WEBDRIVER_MANAGER_AVAILABLE = True
-except ImportError:
-    WEBDRIVER_MANAGER_AVAILABLE = False
+# Steam inventory paging: items per request and pause between page requests
+INVENTORY_PAGE_SIZE = 2000
+INVENTORY_PAGE_DELAY = 1.5
+# Seconds the prefetch thread blocks on a full buffer before checking whether the consumer is gone
+PREFETCH_PUT_TIMEOUT = 1.0
+# Processed items handed to the on_batch callback at a time
+STREAM_BATCH_SIZE = 100
+# Description fields that feed the derived item fields; a change triggers reclassification
+DESCRIPTION_HASH_FIELDS = ('classid', 'instanceid', 'market_hash_name', 'type', 'icon_url', 'tags', 'actions')
 
 
 # Removed SteamMarketPricer class - no pricing functionality
@@ -55,41 +59,35 @@ class SteamInventoryScraper(BaseScraper):
     
     def __init__(self, headless: bool = True):
         super().__init__("SteamInventory")
-        self.driver = None
+        # A pooled Chrome is only leased when something actually uses the driver
+        self._driver = None
+        self._driver_unavailable = False
+        self.float_resolver = None  # Created on the first float lookup
         self.headless = headless
         self.steam_api_base = "https://steamcommunity.com/inventory"
         self.is_running = False
         self.last_used = None
-        self._setup_driver()
-        
+
+    @property
+    def driver(self):
+        """Chrome WebDriver, leased from the shared browser pool on first use"""
+        if self._driver is None and not self._driver_unavailable:
+            self._setup_driver()
+        return self._driver
+
+    @driver.setter
+    def driver(self, value):
+        self._driver = value
+
     def _setup_driver(self):
-        """Setup Chrome WebDriver for CS2 inventory inspection"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument('--headless')
-        
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-        
+        """Lease a Chrome WebDriver for CS2 inventory inspection from the shared browser pool"""
         try:
-            if WEBDRIVER_MANAGER_AVAILABLE:
-                service = Service(ChromeDriverManager().install())
-            else:
-                service = Service()
-            
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.implicitly_wait(10)
-            
+            self.driver = browser_pool.lease(profile='default', headless=self.headless, implicit_wait=10,
+                                             blocking=self.name)
         except Exception as e:
-            try:
-                self.driver = webdriver.Chrome(options=chrome_options)
-                self.driver.implicitly_wait(10)
-            except Exception as e2:
-                self.logger.warning(f"Could not initialize WebDriver: {e2}. Float values and pattern index will not be available.")
-                self.driver = None
+            self.logger.warning(f"Could not initialize WebDriver: {e}. Float values and pattern index will not be available.")
+            self.driver = None
+            self._driver_unavailable = True
         
     def validate_input(self, **kwargs) -> bool:
         """Validate input parameters for Steam inventory scraping"""
@@ -132,34 +130,41 @@ class SteamInventoryScraper(BaseScraper):
             include_floats = kwargs.get('include_floats', False)
             include_prices = kwargs.get('include_prices', False)  # Include prices is optional
             user_id = kwargs.get('user_id')  # Extract user_id parameter
+            on_batch = kwargs.get('on_batch')  # Optional callback receiving processed items while later pages download
+            use_cache = kwargs.get('use_cache', True)  # Replay a fresh on-disk copy instead of asking Steam
             items = []
             skinsearch = SkinSearchScraper()
             # Extract Steam ID from URL if provided
             steam_id = self._extract_steam_id_from_url(steam_id)
-            # Get inventory data
-            inventory_data = self._get_inventory(steam_id, app_id)
-            self.logger.info(f"Found {len(inventory_data)} items in inventory")
-            # Process each CS2 item
-            for i, item_data in enumerate(inventory_data):
+            batch = []
+            # Classification results per classid_instanceid, shared by stacked assets
+            descriptions = {}
+            # Process each CS2 item as inventory pages arrive
+            for i, item_data in enumerate(self._prefetch_inventory(steam_id, app_id, use_cache)):
                 try:
                     item_name = item_data.get('market_hash_name', 'Unknown')
+                    desc_key = f"{item_data.get('classid')}_{item_data.get('instanceid')}"
+                    description = descriptions.get(desc_key)
+                    if description is None:
+                        description = self._describe_item(item_data)
+                        descriptions[desc_key] = description
                     # Only process CS2 items
-                    if self._is_cs2_item(item_data):
-                        item = self._process_cs2_item(item_data, steam_id, include_floats, user_id)
+                    if description['is_cs2']:
+                        item = self._process_cs2_item(item_data, steam_id, user_id, description)
                         if item:
                             # Fetch price info from SkinSearchScraper if requested
                             if include_prices:
                                 price_result = skinsearch.scrape_steam_item(item)
-                                if price_result and isinstance(price_result, dict):
-                                    if price_result.get('success') and price_result.get('cheapest_price'):
-                                        item['current_price'] = price_result['cheapest_price']['price']
-                                        item['price_currency'] = price_result['cheapest_price']['currency']
-                                        item['price_details'] = price_result['prices']
-                                        item['skinsearch_url'] = price_result.get('url')
+                                if isinstance(price_result, PriceInfo):
+                                    if price_result.price and price_result.price > 0:
+                                        item['current_price'] = price_result.price
+                                        item['price_currency'] = price_result.currency
+                                        item['price_source'] = 'skinsearch.com'
+                                        item['market_prices'] = price_result.markets or {}
                                     else:
                                         item['current_price'] = 0
-                                        item['price_details'] = []
-                                        item['skinsearch_url'] = price_result.get('url') if price_result.get('url') else None
+                                    item['price_details'] = []
+                                    item['skinsearch_url'] = price_result.url
                                 else:
                                     item['current_price'] = 0
                                     item['price_details'] = []
@@ -170,19 +175,24 @@ class SteamInventoryScraper(BaseScraper):
                                 item['price_details'] = []
                                 item['skinsearch_url'] = None
                             items.append(item)
-                            self.logger.info(f"Processed item {i+1}/{len(inventory_data)}: {item.get('name', 'Unknown')} (Category: {item.get('item_category', 'unknown')})")
+                            batch.append(item)
+                            self.logger.info(f"Processed item {i+1}: {item.get('name', 'Unknown')} (Category: {item.get('item_category', 'unknown')})")
                         else:
                             self.logger.warning(f"Failed to process CS2 item: {item_name}")
                     else:
                         self.logger.debug(f"Skipped non-CS2 item: {item_name}")
-                    # Rate limiting to avoid being blocked
-                    if include_floats and self.driver:
-                        time.sleep(1)  # Slower when fetching float values
-                    else:
+                    # Rate limiting to avoid being blocked, only needed after a network call
+                    if include_prices and description['is_cs2']:
                         time.sleep(0.1)
                 except Exception as e:
                     self.logger.error(f"Error processing item {item_data.get('market_hash_name', 'Unknown')}: {e}")
                     continue
+                if len(batch) >= STREAM_BATCH_SIZE:
+                    self._flush_batch(batch, include_floats, on_batch)
+                    batch = []
+            if batch:
+                self._flush_batch(batch, include_floats, on_batch)
+            self.logger.info(f"Found {len(items)} CS2 items in inventory ({len(descriptions)} unique descriptions)")
             self.log_scraping_complete(len(items))
             return items
         except Exception as e:
@@ -192,6 +202,88 @@ class SteamInventoryScraper(BaseScraper):
             self.is_running = False
             self._cleanup()
     
+    def sync_inventory(self, steam_id: str, known_assets: Dict[str, Optional[str]], app_id: str = '730',
+                       include_floats: bool = False, include_prices: bool = False,
+                       user_id: str = None, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Incremental inventory sync against the assets seen previously.
+
+        Args:
+            known_assets: {asset_id: description hash} of assets already stored; a None hash
+                          means the asset is known but its hash is not (treated as unchanged)
+
+        Only new assets and assets whose description changed are classified (and priced).
+        Returns {'steam_id', 'assets', 'content_hash', 'added', 'changed', 'removed', 'unchanged'}
+        where 'assets' is the new {asset_id: description hash} snapshot.
+        """
+        self.is_running = True
+        self.last_used = datetime.now().isoformat()
+        try:
+            steam_id = self._extract_steam_id_from_url(steam_id)
+            descriptions = {}
+            assets = {}
+            added, changed = [], []
+            for item_data in self.iter_inventory(steam_id, app_id, use_cache=use_cache):
+                asset_id = str(item_data.get('assetid'))
+                desc_key = f"{item_data.get('classid')}_{item_data.get('instanceid')}"
+                desc_hash = item_data['description_hash']
+                assets[asset_id] = desc_hash
+
+                known = asset_id in known_assets
+                if known and known_assets[asset_id] in (None, desc_hash):
+                    continue
+                try:
+                    description = descriptions.get(desc_key)
+                    if description is None:
+                        description = descriptions[desc_key] = self._describe_item(item_data)
+                    if not description['is_cs2']:
+                        continue
+                    item = self._process_cs2_item(item_data, steam_id, user_id, description)
+                    if item:
+                        (changed if known else added).append(item)
+                except Exception as e:
+                    self.logger.error(f"Error processing item {item_data.get('market_hash_name', 'Unknown')}: {e}")
+
+            removed = [asset_id for asset_id in known_assets if asset_id not in assets]
+            if include_floats and (added or changed):
+                self._apply_floats(added + changed)
+            if include_prices and (added or changed):
+                self._apply_prices(added + changed)
+
+            self.logger.info(f"Inventory sync for {steam_id}: {len(assets)} assets, {len(added)} added, "
+                             f"{len(changed)} changed, {len(removed)} removed")
+            return {
+                'steam_id': steam_id,
+                'assets': assets,
+                'content_hash': inventory_content_hash(assets),
+                'added': added,
+                'changed': changed,
+                'removed': removed,
+                'unchanged': len(assets) - len(added) - len(changed),
+            }
+        except Exception as e:
+            self.log_error(e)
+            raise ScraperError(f"Steam inventory sync failed: {e}")
+        finally:
+            self.is_running = False
+            self._cleanup()
+
+    @staticmethod
+    def _description_hash(item_data: Dict) -> str:
+        """Stable hash of the description fields an item's derived data depends on"""
+        fields = {field: item_data.get(field) for field in DESCRIPTION_HASH_FIELDS}
+        return hashlib.sha1(json.dumps(fields, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def _apply_prices(self, items: List[Dict[str, Any]]):
+        """Price items through the concurrent SkinSearch batch and store the results on them"""
+        results = SkinSearchScraper().batch_update_steam_prices(items)
+        for item, result in zip(items, results):
+            price_info = result.get('price_info')
+            if price_info and price_info.price and price_info.price > 0:
+                item['current_price'] = price_info.price
+                item['price_source'] = 'skinsearch.com'
+                item['market_prices'] = price_info.markets or {}
+
     def _extract_steam_id_from_url(self, steam_input: str) -> str:
         """Extract Steam ID from various formats"""
         if steam_input.startswith('http'):
@@ -209,157 +301,198 @@ class SteamInventoryScraper(BaseScraper):
         return steam_input
     
     def _get_inventory(self, steam_id: str, app_id: str) -> List[Dict]:
-        """Get inventory data from Steam API"""
+        """Get the complete inventory from Steam API (all pages)"""
+        return list(self.iter_inventory(steam_id, app_id))
+
+    def iter_inventory(self, steam_id: str, app_id: str, page_size: int = INVENTORY_PAGE_SIZE,
+                       use_cache: bool = True) -> Iterator[Dict]:
+        """
+        Yield inventory items (asset merged with its description) page by page,
+        following more_items/last_assetid until the whole inventory is read.
+        A fresh on-disk copy is replayed instead of contacting Steam; complete
+        reads from Steam are written back to the cache.
+        """
+        cached = inventory_cache.get(steam_id, app_id) if use_cache else None
+        if cached:
+            self.logger.info(f"Using cached inventory for {steam_id} ({len(cached['assets'])} assets)")
+            pages = iter(cached['pages'])
+        else:
+            pages = self._fetch_inventory_pages(steam_id, app_id, page_size)
+
+        desc_lookup = {}
+        raw_pages = []
+        assets_seen = {}
+        for data in pages:
+            if not cached:
+                raw_pages.append(data)
+
+            # Descriptions are only sent on the page where a classid first appears
+            descriptions = data.get('descriptions', [])
+            for desc, classification in zip(descriptions, cs2_classifier.classify_many(descriptions)):
+                desc_lookup[f"{desc['classid']}_{desc['instanceid']}"] = {
+                    **desc,
+                    'cs2_classification': classification,
+                    'description_hash': self._description_hash(desc),
+                }
+
+            for asset in data.get('assets', []):
+                desc = desc_lookup.get(f"{asset['classid']}_{asset['instanceid']}")
+                if desc:
+                    assets_seen[str(asset.get('assetid'))] = desc['description_hash']
+                    yield {**asset, **desc}
+
+        if not cached:
+            inventory_cache.store(steam_id, app_id, raw_pages, assets_seen)
+
+    def _fetch_inventory_pages(self, steam_id: str, app_id: str, page_size: int) -> Iterator[Dict]:
+        """Yield raw inventory pages from Steam, pacing the page requests"""
+        url = f"{self.steam_api_base}/{steam_id}/{app_id}/2"
+        start_assetid = None
+        page = 0
+        while True:
+            params = {'l': 'english', 'count': page_size}
+            if start_assetid:
+                params['start_assetid'] = start_assetid
+            if page:
+                # Steam rate limits inventory requests aggressively, so pace the pages
+                time.sleep(INVENTORY_PAGE_DELAY)
+            data = self._get_inventory_page(url, params)
+            page += 1
+            self.logger.info(f"Fetched inventory page {page}: {len(data.get('assets', []))} assets "
+                             f"(total {data.get('total_inventory_count', '?')})")
+            yield data
+
+            start_assetid = data.get('last_assetid')
+            if not data.get('more_items') or not start_assetid:
+                return
+
+    def cached_inventory(self, steam_id: str, app_id: str = '730') -> Optional[Dict[str, Any]]:
+        """
+        Content hash and {asset_id: description hash} of a fresh cached inventory,
+        without contacting Steam or decompressing the raw pages. None when there is no fresh copy.
+        """
+        meta = inventory_cache.get_meta(self._extract_steam_id_from_url(steam_id), app_id)
+        if not meta:
+            return None
+        return {'content_hash': meta['content_hash'], 'assets': meta['assets'], 'fetched_at': meta['fetched_at']}
+
+    def _get_inventory_page(self, url: str, params: Dict) -> Dict:
+        """Fetch one inventory page"""
         try:
-            # Steam inventory endpoint
-            url = f"{self.steam_api_base}/{steam_id}/{app_id}/2"
-            
-            # Make request without problematic parameters
-            response = requests.get(url, timeout=30)
+            response = http_client.get(url, params=params, timeout=30)
             response.raise_for_status()
-            
             data = response.json()
-            
             if not data.get('success'):
                 raise ScraperError("Steam API returned unsuccessful response")
-            
-            # Combine assets and descriptions
-            assets = data.get('assets', [])
-            descriptions = data.get('descriptions', [])
-            
-            # Create lookup for descriptions
-            desc_lookup = {}
-            for desc in descriptions:
-                key = f"{desc['classid']}_{desc['instanceid']}"
-                desc_lookup[key] = desc
-            
-            # Combine assets with descriptions
-            inventory_items = []
-            for asset in assets:
-                key = f"{asset['classid']}_{asset['instanceid']}"
-                if key in desc_lookup:
-                    item_data = {**asset, **desc_lookup[key]}
-                    inventory_items.append(item_data)
-            
-            return inventory_items
-            
+            return data
+        except CircuitOpenError as e:
+            raise ScraperError(f"Steam inventory temporarily unavailable: {e}")
         except requests.RequestException as e:
             raise ScraperError(f"Failed to fetch Steam inventory: {e}")
         except json.JSONDecodeError as e:
             raise ScraperError(f"Invalid JSON response from Steam API: {e}")
+
+    def _prefetch_inventory(self, steam_id: str, app_id: str, use_cache: bool = True) -> Iterator[Dict]:
+        """
+        Run iter_inventory in a background thread so later pages keep downloading
+        while the caller processes the items that already arrived
+        """
+        buffer = queue.Queue(maxsize=INVENTORY_PAGE_SIZE * 2)
+        done = object()
+        failure = []
+        stop = threading.Event()  # Set when the consumer stops iterating (finished, break or exception)
+
+        def put(value) -> bool:
+            """Queue a value unless the consumer has gone away"""
+            while not stop.is_set():
+                try:
+                    buffer.put(value, timeout=PREFETCH_PUT_TIMEOUT)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def producer():
+            try:
+                for item_data in self.iter_inventory(steam_id, app_id, use_cache=use_cache):
+                    if not put(item_data):
+                        return
+            except Exception as e:
+                failure.append(e)
+            finally:
+                put(done)
+
+        threading.Thread(target=producer, name='steam-inventory-pages', daemon=True).start()
+        try:
+            while True:
+                item_data = buffer.get()
+                if item_data is done:
+                    break
+                yield item_data
+        finally:
+            stop.set()
+        if failure:
+            raise failure[0]
     
     def _is_cs2_item(self, item_data: Dict) -> bool:
         """Check if item is a CS2 item (includes all relevant item types)"""
-        name = item_data.get('market_hash_name', '').lower()
-        item_type = item_data.get('type', '').lower()
-        
-        # Check for CS2 item types based on tags
-        tags = item_data.get('tags', [])
-        
-        # Look for CS2-specific item categories
-        cs2_categories = [
-            'weapon',           # Weapon skins
-            'knife',            # Knives
-            'gloves',           # Gloves
-            'agent',            # Agent skins
-            'sticker',          # Stickers
-            'container',        # Cases
-            'tool',             # Keys, name tags, etc.
-            'graffiti',         # Sprays/graffiti
-            'musickit',         # Music kits
-            'collectible',      # Coins, charms
-            'base',             # Default items
-        ]
-        
-        # Check tags for CS2 item types
-        for tag in tags:
-            tag_category = tag.get('category', '').lower()
-            tag_name = tag.get('internal_name', '').lower()
-            tag_localized = tag.get('localized_tag_name', '').lower()
-            
-            # Check if it's a CS2 item category
-            if tag_category in ['type', 'itemset', 'quality', 'exterior']:
-                if any(cs2_cat in tag_name or cs2_cat in tag_localized for cs2_cat in cs2_categories):
-                    return True
-            
-            # Special checks for specific item types that might be missed
-            if 'key' in tag_name or 'key' in tag_localized:
-                return True
-            if 'gloves' in tag_name or 'gloves' in tag_localized or 'glove' in tag_name:
-                return True
-        
-        # Additional checks for specific item types
-        cs2_item_indicators = [
-            # Weapons with conditions
-            'factory new', 'minimal wear', 'field-tested', 'well-worn', 'battle-scarred',
-            # Weapon types
-            'ak-47', 'awp', 'm4a4', 'm4a1-s', 'glock', 'usp', 'deagle', 'knife', 'karambit', 'bayonet',
-            # Item types
-            'sticker', 'key', 'case', 'capsule', 'music kit', 'graffiti', 'spray', 'agent',
-            'charm', 'coin', 'gloves', 'pin',
-            # CS2 specific terms
-            'souvenir', 'stattrak', 'operation'
-        ]
-        
-        # Check if name contains CS2 indicators
-        if any(indicator in name for indicator in cs2_item_indicators):
-            return True
-        
-        # Check item type for CS2 categories
-        if any(cs2_cat in item_type for cs2_cat in cs2_categories):
-            return True
-        
-        # Default to including items if we're unsure (better to include too many than miss items)
-        return True
+        return cs2_classifier.is_cs2_item(item_data)
     
-    def _process_cs2_item(self, item_data: Dict, steam_id: str, include_floats: bool = True, user_id: str = None) -> Optional[Dict[str, Any]]:
-        """Process a single CS2 inventory item with optional float data"""
-        try:
-            # Extract basic item info
-            name = item_data.get('market_hash_name', 'Unknown Item')
-            item_type = item_data.get('type', '')
-            
+    def _describe_item(self, item_data: Dict) -> Dict[str, Any]:
+        """
+        Derive the fields that depend only on the item description.
+        Assets sharing a classid_instanceid share a description, so this is computed once per description.
+        """
+        name = item_data.get('market_hash_name', 'Unknown Item')
+
+        # Get image URL
+        image_url = item_data.get('icon_url', '')
+        if image_url:
+            image_url = f"https://community.akamai.steamstatic.com/economy/image/{image_url}"
+
+        # Pages from iter_inventory arrive pre-classified
+        classification = item_data.get('cs2_classification') or cs2_classifier.classify(item_data)
+        return {
+            'is_cs2': classification['is_cs2'],
+            'name': self.clean_text(name),
+            'market_hash_name': name,
+            'item_type': item_data.get('type', ''),
             # Extract CS2-specific data
-            rarity = self._extract_cs2_rarity(item_data)
-            condition = self._extract_condition(name)
-            
-            # Determine item category
-            item_category = self._get_item_category(item_data, name)
-            
-            # Get image URL
-            image_url = item_data.get('icon_url', '')
-            if image_url:
-                image_url = f"https://community.akamai.steamstatic.com/economy/image/{image_url}"
-            
-            # Initialize float and pattern data
-            float_value = None
-            paint_seed = None
-            
-            # Get float data if requested and available
-            if include_floats and CSFLOAT_AVAILABLE and self._has_inspect_link(item_data):
-                float_data = self._get_csfloat_data(item_data)
-                if float_data and float_data.success:
-                    float_value = float_data.float_value
-                    paint_seed = float_data.paint_seed
-                    self.logger.info(f"CSFloat data for {name}: Float={float_value}, Pattern={paint_seed}")
+            'rarity': self._extract_cs2_rarity(item_data),
+            'condition': self._extract_condition(name),
+            'item_category': classification['item_category'],
+            'image_url': image_url,
+            'inspectable': self._has_inspect_link(item_data),
+        }
+
+    def _process_cs2_item(self, item_data: Dict, steam_id: str, user_id: str = None,
+                          description: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Process a single CS2 inventory item; float data is filled in per batch by _apply_floats"""
+        try:
+            if description is None:
+                description = self._describe_item(item_data)
+            name = description['market_hash_name']
             
             # Build the item data
             item_result = {
                 'type': 'steam',
-                'name': self.clean_text(name),
-                'rarity': rarity,
-                'condition': condition or 'N/A',
-                'float_value': float_value,
-                'paint_seed': paint_seed,
+                'name': description['name'],
+                'rarity': description['rarity'],
+                'condition': description['condition'] or 'N/A',
+                'float_value': None,
+                'paint_seed': None,
+                'inspect_link': self._get_inspect_link(item_data, steam_id) if description['inspectable'] else None,
                 'current_price': 0.0,
                 'price_bought': 0.0,
                 'quantity': int(item_data.get('amount', 1)),
                 'game': 'Counter-Strike 2',
                 'asset_id': item_data.get('assetid'),
-                'image_url': image_url,
+                'classid': item_data.get('classid'),
+                'instanceid': item_data.get('instanceid'),
+                'image_url': description['image_url'],
                 'market_hash_name': name,
-                'item_category': item_category,
-                'item_type': item_type,
+                'item_category': description['item_category'],
+                'item_type': description['item_type'],
                 'steam_id': steam_id,
                 'user_id': user_id,  # Add user_id to the scraped item
                 'last_updated': self.format_timestamp()
@@ -460,19 +593,22 @@ class SteamInventoryScraper(BaseScraper):
         return None
     
     def _cleanup(self):
-        """Clean up WebDriver resources"""
-        if hasattr(self, 'driver') and self.driver:
+        """Return the WebDriver to the browser pool and release the float resolver"""
+        # Check the backing field so cleanup never leases a browser
+        if getattr(self, '_driver', None):
             try:
-                self.driver.quit()
+                browser_pool.release(self._driver)
             except Exception as e:
                 self.logger.warning(f"Error during driver cleanup: {e}")
+            self._driver = None
         
-        # Clean up CSFloat scraper if it exists
-        if hasattr(self, 'csfloat_scraper') and self.csfloat_scraper is not None:
+        # Release the float resolver (and its browser, if the Selenium fallback was used)
+        if getattr(self, 'float_resolver', None) is not None:
             try:
-                self.csfloat_scraper._cleanup()
+                self.float_resolver.close()
             except Exception as e:
-                self.logger.warning(f"Error during CSFloat scraper cleanup: {e}")
+                self.logger.warning(f"Error during float resolver cleanup: {e}")
+            self.float_resolver = None
     
     def _has_inspect_link(self, item_data: Dict) -> bool:
         """Check if the item has an inspect link available"""
@@ -482,37 +618,43 @@ class SteamInventoryScraper(BaseScraper):
                 return True
         return False
     
-    def _get_inspect_link(self, item_data: Dict) -> Optional[str]:
-        """Extract inspect link from item actions"""
+    def _get_inspect_link(self, item_data: Dict, steam_id: Optional[str] = None) -> Optional[str]:
+        """Extract the inspect link from item actions, filling in the owner and asset placeholders"""
         actions = item_data.get('actions', [])
         for action in actions:
             if 'inspect' in action.get('name', '').lower():
-                return action.get('link', '')
+                link = action.get('link', '')
+                if steam_id:
+                    link = link.replace('%owner_steamid%', str(steam_id))
+                if item_data.get('assetid'):
+                    link = link.replace('%assetid%', str(item_data['assetid']))
+                return link
         return None
     
-    def _get_csfloat_data(self, item_data: Dict) -> Optional[Any]:
-        """Get float and pattern data from CSFloat"""
-        if not CSFLOAT_AVAILABLE:
-            self.logger.warning("CSFloat scraper not available")
-            return None
-        
-        inspect_link = self._get_inspect_link(item_data)
-        if not inspect_link:
-            self.logger.debug(f"No inspect link found for item: {item_data.get('market_hash_name', 'Unknown')}")
-            return None
-        
+    def _apply_floats(self, items: List[Dict[str, Any]]):
+        """Resolve float values and paint seeds for all inspectable items in one resolver call"""
+        inspectable = [item for item in items if item.get('inspect_link')]
+        if not inspectable:
+            return
         try:
-            # Create CSFloat scraper instance (will reuse driver if possible)
-            if not hasattr(self, 'csfloat_scraper') or self.csfloat_scraper is None:
-                self.csfloat_scraper = CSFloatScraper(headless=self.headless)
-            
-            # Get float data
-            float_data = self.csfloat_scraper.get_float_data(inspect_link)
-            return float_data
-            
+            if self.float_resolver is None:
+                self.float_resolver = get_float_resolver(headless=self.headless)
+            results = self.float_resolver.resolve_many(item['inspect_link'] for item in inspectable)
         except Exception as e:
-            self.logger.error(f"Error getting CSFloat data: {e}")
-            return None
+            self.logger.error(f"Error resolving float data: {e}")
+            return
+        for item in inspectable:
+            float_data = results.get(item['inspect_link'])
+            if float_data and float_data.success:
+                item['float_value'] = float_data.float_value
+                item['paint_seed'] = float_data.paint_seed
+    
+    def _flush_batch(self, batch: List[Dict[str, Any]], include_floats: bool, on_batch=None):
+        """Finish a batch of processed items (floats) and hand it to the on_batch callback"""
+        if include_floats:
+            self._apply_floats(batch)
+        if on_batch:
+            on_batch(batch)
     
     def __del__(self):
         """Destructor to ensure cleanup"""
@@ -520,104 +662,6 @@ class SteamInventoryScraper(BaseScraper):
     
     def _get_item_category(self, item_data: Dict, name: str) -> str:
         """Determine the category of a CS2 item"""
-        name_lower = name.lower()
-        item_type = item_data.get('type', '').lower()
-        
-        # Check tags for more accurate categorization
-        tags = item_data.get('tags', [])
-        for tag in tags:
-            tag_category = tag.get('category', '').lower()
-            tag_name = tag.get('internal_name', '').lower()
-            tag_localized = tag.get('localized_tag_name', '').lower()
-            
-            # Direct category matches
-            if 'weapon' in tag_name or 'weapon' in tag_localized:
-                return 'weapon'
-            elif 'knife' in tag_name or 'knife' in tag_localized:
-                return 'knife'
-            elif 'gloves' in tag_name or 'gloves' in tag_localized:
-                return 'gloves'
-            elif 'agent' in tag_name or 'agent' in tag_localized:
-                return 'agent'
-            elif 'sticker' in tag_name or 'sticker' in tag_localized:
-                return 'sticker'
-            elif 'container' in tag_name or 'container' in tag_localized:
-                return 'case'
-            elif 'tool' in tag_name or 'tool' in tag_localized:
-                if 'key' in name_lower:
-                    return 'key'
-                elif 'charm' in name_lower:
-                    return 'charm'
-                return 'tool'
-            elif 'graffiti' in tag_name or 'graffiti' in tag_localized:
-                return 'spray'
-            elif 'musickit' in tag_name or 'music kit' in tag_localized:
-                return 'music_kit'
-            elif 'collectible' in tag_name or 'collectible' in tag_localized:
-                if 'coin' in name_lower:
-                    return 'coin'
-                elif 'charm' in name_lower:
-                    return 'charm'
-                elif 'pin' in name_lower:
-                    return 'pin'
-                return 'collectible'
-            elif 'patch' in tag_name or 'patch' in tag_localized:
-                return 'patch'
-        
-        # Enhanced fallback to name-based detection with all categories
-        if 'knife' in name_lower or 'karambit' in name_lower or 'bayonet' in name_lower:
-            return 'knife'
-        elif 'gloves' in name_lower or 'glove' in name_lower or 'wraps' in name_lower:
-            return 'gloves'
-        elif 'sticker' in name_lower:
-            return 'sticker'
-        elif 'case' in name_lower and ('weapon case' in name_lower or 'container' in name_lower):
-            return 'case'
-        elif 'capsule' in name_lower:
-            if 'sticker capsule' in name_lower:
-                return 'sticker_capsule'
-            elif 'autograph capsule' in name_lower:
-                return 'autograph_capsule'
-            elif 'collectible capsule' in name_lower:
-                return 'collectible_capsule'
-            return 'capsule'
-        elif 'souvenir package' in name_lower:
-            return 'souvenir_package'
-        elif 'collection package' in name_lower:
-            return 'collection_package'
-        elif 'patch pack' in name_lower:
-            return 'patch_pack'
-        elif 'graffiti box' in name_lower:
-            return 'graffiti_box'
-        elif 'music kit box' in name_lower:
-            return 'music_kit_box'
-        elif 'key' in name_lower or ' key' in name_lower:
-            return 'key'
-        elif 'music kit' in name_lower:
-            return 'music_kit'
-        elif 'graffiti' in name_lower or 'spray' in name_lower:
-            return 'spray'
-        elif 'agent' in name_lower:
-            return 'agent'
-        elif 'coin' in name_lower:
-            return 'coin'
-        elif 'charm' in name_lower:
-            return 'charm'
-        elif 'patch' in name_lower:
-            return 'patch'
-        elif 'pin' in name_lower:
-            return 'pin'
-        elif 'pass' in name_lower:
-            return 'pass'
-        elif 'gift' in name_lower:
-            return 'gift'
-        elif 'collectible' in name_lower:
-            return 'collectible'
-        elif 'tag' in name_lower:
-            return 'tag'
-        elif any(weapon in name_lower for weapon in ['ak-47', 'awp', 'm4a4', 'm4a1-s', 'glock', 'usp', 'deagle']):
-            return 'weapon'
-        
-        return 'unknown'
+        return cs2_classifier.category(item_data, name)
     
     # Removed _estimate_float_from_condition method - no float estimation
@@ -4,25 +4,16 @@ Handles scraping of trading card data from CardMarket
 """
 
 from typing import List, Dict, Any
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from bs4 import BeautifulSoup
-import time
 import re
 
 from .base_scraper import BaseScraper, ScraperError, ValidationError
-
-# Try to import webdriver_manager, fallback if not available
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    WEBDRIVER_MANAGER_AVAILABLE = True
-except ImportError:
-    WEBDRIVER_MANAGER_AVAILABLE = False
+from .browser_pool import browser_pool, BrowserPoolError
+from .wait_engine import WaitEngine
 
 
 class TradingCardsScraper(BaseScraper):
@@ -30,38 +21,31 @@ class TradingCardsScraper(BaseScraper):
     
     def __init__(self, headless: bool = True):
         super().__init__("TradingCards")
-        self.driver = None
+        # A pooled Chrome is only leased when a scrape first uses the driver
+        self._driver = None
+        self.wait = None  # WaitEngine for the current scrape
         self.headless = headless
-        self._setup_driver()
-    
-    def _setup_driver(self):
-        """Setup Chrome WebDriver with optimal settings"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument('--headless')
         self.is_running = False
         self.last_used = None
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-        
+
+    @property
+    def driver(self):
+        """Chrome WebDriver, leased from the shared browser pool on first use"""
+        if self._driver is None:
+            self._setup_driver()
+        return self._driver
+
+    @driver.setter
+    def driver(self, value):
+        self._driver = value
+
+    def _setup_driver(self):
+        """Lease a Chrome WebDriver from the shared browser pool"""
         try:
-            if WEBDRIVER_MANAGER_AVAILABLE:
-                service = Service(ChromeDriverManager().install())
-            else:
-                service = Service()
-            
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.implicitly_wait(10)
-            
-        except Exception as e:
-            try:
-                self.driver = webdriver.Chrome(options=chrome_options)
-                self.driver.implicitly_wait(10)
-            except Exception as e2:
-                raise ScraperError(f"Failed to initialize Chrome WebDriver: {e2}")
+            self.driver = browser_pool.lease(profile='default', headless=self.headless, implicit_wait=10,
+                                             blocking=self.name)
+        except BrowserPoolError as e:
+            raise ScraperError(str(e))
     
     def validate_input(self, **kwargs) -> bool:
         """Validate input parameters for trading cards scraping"""
@@ -122,7 +106,8 @@ class TradingCardsScraper(BaseScraper):
             url = f"https://www.cardmarket.com/en/{tcg}/Products/Search?category=-1"
             self.logger.info(f"Navigating to: {url}")
             self.driver.get(url)
-            time.sleep(2)
+            self.wait = WaitEngine(self.driver, self.name, implicit_wait=10)
+            self.wait.ready(fixed=2, label='search_page')
             
             # Select expansion using original logic
             try:
@@ -142,7 +127,7 @@ class TradingCardsScraper(BaseScraper):
                 search_buttons = self.driver.find_elements(By.XPATH, "//input[contains(@class, 'btn btn-primary')]")
                 if search_buttons:
                     search_buttons[0].click()
-                    time.sleep(2)
+                    self.wait.navigation(search_buttons[0], fixed=2, label='expansion_results')
                 else:
                     self.logger.warning("Could not find search button")
                     return cards
@@ -162,7 +147,8 @@ class TradingCardsScraper(BaseScraper):
                     
                     # Navigate back to search page
                     self.driver.get(spec_url)
-                    time.sleep(1)
+                    self.wait.until(lambda driver: len(driver.find_elements(By.NAME, "searchString")) > 1,
+                                    fixed=1, label='search_input')
                     
                     # Enter card number in search
                     search_inputs = self.driver.find_elements(By.NAME, "searchString")
@@ -177,7 +163,7 @@ class TradingCardsScraper(BaseScraper):
                     search_buttons = self.driver.find_elements(By.XPATH, "//input[contains(@class, 'btn btn-primary')]")
                     if search_buttons:
                         search_buttons[0].click()
-                        time.sleep(2)
+                        self.wait.navigation(search_buttons[0], fixed=2, label='card_results')
                     else:
                         self.logger.warning(f"Could not find search button for card {number}")
                         continue
@@ -195,6 +181,7 @@ class TradingCardsScraper(BaseScraper):
                     continue
             
             self.log_scraping_complete(len(cards))
+            self.logger.info(f"Waits: {self.wait.summary()}")
             return cards
             
         except Exception as e:
@@ -254,18 +241,22 @@ class TradingCardsScraper(BaseScraper):
             
             # Extract current price
             if card_language == "Western":
-                time.sleep(1)
-                self.driver.find_elements(By.XPATH, "//div[contains(@class, 'table-body')]//div//div[contains(@class, 'col')]//div[contains(@class, 'row g-0')]//a")[0].click()
-                time.sleep(1)
+                product_xpath = "//div[contains(@class, 'table-body')]//div//div[contains(@class, 'col')]//div[contains(@class, 'row g-0')]//a"
+                self.wait.element(By.XPATH, product_xpath, fixed=1, label='product_link')
+                product_link = self.driver.find_elements(By.XPATH, product_xpath)[0]
+                product_link.click()
+                self.wait.navigation(product_link, fixed=1, label='product_page')
                 self.driver.execute_script("document.body.style.zoom='50%'")
 
                 # Ensure language filter is applied
                 if not self.driver.find_elements(By.XPATH, "//input[contains(@name, 'language[1]')]")[0].is_selected():
                     self.driver.find_elements(By.XPATH, "//a[contains(@aria-controls, 'articleFilterProductLanguage')]")[0].click()
-                    time.sleep(1)
+                    self.wait.element(By.XPATH, "//input[contains(@name, 'language[1]')]", fixed=1,
+                                      label='language_filter', visible=True)
                     self.driver.find_elements(By.XPATH, "//input[contains(@name, 'language[1]')]")[0].click()
-                    self.driver.find_elements(By.XPATH, "//input[contains(@title, 'Filter')]")[0].click()
-                    time.sleep(1)
+                    filter_button = self.driver.find_elements(By.XPATH, "//input[contains(@title, 'Filter')]")[0]
+                    filter_button.click()
+                    self.wait.navigation(filter_button, fixed=1, label='filtered_offers')
                     self.driver.execute_script("document.body.style.zoom='50%'")
 
                 price_elements = self.driver.find_elements(By.XPATH, "//dd")
@@ -309,12 +300,14 @@ class TradingCardsScraper(BaseScraper):
             return None
     
     def _cleanup(self):
-        """Clean up WebDriver resources"""
-        if self.driver:
+        """Return the WebDriver to the browser pool"""
+        # Check the backing field so cleanup never leases a browser
+        if getattr(self, '_driver', None):
             try:
-                self.driver.quit()
+                browser_pool.release(self._driver)
             except Exception as e:
                 self.logger.warning(f"Error during driver cleanup: {e}")
+            self._driver = None
     
     def __del__(self):
         """Destructor to ensure cleanup"""
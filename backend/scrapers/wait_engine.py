@@ -0,0 +1,269 @@
+"""
+Wait Engine
+Event-driven waits for the Selenium scrapers, replacing fixed time.sleep() calls
+
+Features:
+- Waits end as soon as an explicit DOM condition holds (element present/visible,
+  document ready, old page gone after a click)
+- Network-idle detection: a CDP-injected hook counts in-flight fetch/XHR requests,
+  combined with readyState and a stable Resource Timing entry count. Beacons and
+  long-lived requests (long polling, streams) are ignored, and an idle wait never
+  takes longer than the sleep it replaced, so pages that poll constantly cost no more
+- Adaptive timeouts learned per (scraper, wait label) from observed page timings,
+  including waits that timed out, so labels whose condition rarely holds wait less
+- Every wait records the fixed sleep it replaced, so scrapers can report the time saved
+
+Usage:
+    wait = WaitEngine(self.driver, 'TradingCards', implicit_wait=10)
+    wait.ready(fixed=2, label='search_page')
+    wait.element(By.NAME, 'searchString', fixed=1, label='search_input')
+    self.logger.info(wait.summary())
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Injected into every new document: records start times of fetch/XHR requests that have not finished yet
+NETWORK_HOOK_SCRIPT = """
+(() => {
+    if (window.__waitInflight !== undefined) return;
+    window.__waitInflight = new Map();
+    let nextId = 0;
+    const track = () => { const id = nextId++; window.__waitInflight.set(id, performance.now()); return id; };
+    const done = (id) => { window.__waitInflight.delete(id); };
+    const originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function (...args) {
+            const id = track();
+            return originalFetch.apply(this, args).finally(() => done(id));
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        const id = track();
+        this.addEventListener('loadend', () => done(id));
+        return originalSend.apply(this, args);
+    };
+})();
+"""
+
+# Requests in flight for longer than this are treated as long-lived (long polling, streams)
+LONG_REQUEST_MS = 2000
+
+NETWORK_STATE_SCRIPT = """
+const now = performance.now();
+let pending = 0;
+if (window.__waitInflight) {
+    for (const started of window.__waitInflight.values()) {
+        if (now - started < %d) pending++;
+    }
+}
+const resources = performance.getEntriesByType('resource').filter(r => r.initiatorType !== 'beacon').length;
+return [document.readyState, pending, resources];
+""" % LONG_REQUEST_MS
+
+POLL_INTERVAL = 0.1
+# Network counts as idle once nothing changed for this long
+NETWORK_IDLE_WINDOW = 0.5
+# Timings kept per wait label, and how many are needed before the timeout is learned
+TIMING_SAMPLES = 50
+MIN_SAMPLES = 5
+MIN_TIMEOUT = 1.0
+
+
+class AdaptiveTimeouts:
+    """Per-label wait timeouts learned from how long conditions actually took"""
+
+    def __init__(self):
+        self._samples: Dict[Tuple[str, str], deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: Tuple[str, str], elapsed: float, met: bool = True):
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=TIMING_SAMPLES)).append((elapsed, met))
+
+    def timeout(self, key: Tuple[str, str], fixed: float, ceiling: Optional[float] = None) -> float:
+        """
+        Timeout for a wait that replaced a fixed sleep: the ceiling (default twice the sleep)
+        until enough waits are known, then twice the p95 of the waits whose condition held,
+        never above the ceiling. When most recent waits timed out, waiting longer rarely helps,
+        so the timeout shrinks towards MIN_TIMEOUT instead of staying at the ceiling.
+        """
+        default = ceiling if ceiling is not None else max(fixed * 2, MIN_TIMEOUT)
+        with self._lock:
+            samples = list(self._samples.get(key, ()))
+        if len(samples) < MIN_SAMPLES:
+            return default
+        met = sorted(elapsed for elapsed, ok in samples if ok)
+        mostly_timeouts = len(met) * 2 < len(samples)
+        if not met:
+            return min(default, MIN_TIMEOUT)
+        if len(met) < MIN_SAMPLES and not mostly_timeouts:
+            return default
+        p95 = met[min(len(met) - 1, int(len(met) * 0.95))]
+        return min(default, max(MIN_TIMEOUT, p95 * 2))
+
+
+class WaitStats:
+    """Time spent waiting per scraper, compared with the fixed sleeps that were replaced"""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, scraper: str, fixed: float, elapsed: float, met: bool):
+        with self._lock:
+            stats = self._stats.setdefault(scraper, {'waits': 0, 'timeouts': 0, 'waited': 0.0, 'fixed': 0.0})
+            stats['waits'] += 1
+            stats['timeouts'] += 0 if met else 1
+            stats['waited'] += elapsed
+            stats['fixed'] += fixed
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                scraper: {
+                    'waits': stats['waits'],
+                    'timeouts': stats['timeouts'],
+                    'waited_seconds': round(stats['waited'], 2),
+                    'fixed_sleep_seconds': round(stats['fixed'], 2),
+                    'saved_seconds': round(stats['fixed'] - stats['waited'], 2),
+                }
+                for scraper, stats in self._stats.items()
+            }
+
+
+class WaitEngine:
+    """Condition based waits bound to one driver"""
+
+    def __init__(self, driver, scraper: str, implicit_wait: float = 0):
+        """
+        Args:
+            driver: WebDriver (or pooled driver) to wait on
+            scraper: Name used for adaptive timeouts and savings statistics
+            implicit_wait: The driver's implicit wait; disabled while polling so absent
+                           elements do not block each poll
+        """
+        self.driver = driver
+        self.scraper = scraper
+        self.implicit_wait = implicit_wait
+        self.waits = 0
+        self.waited = 0.0
+        self.fixed = 0.0
+        self._install_network_hook()
+
+    def _install_network_hook(self):
+        """Register the fetch/XHR counter for all documents this browser loads (once per browser)"""
+        if getattr(self.driver, '_wait_hook_installed', False):
+            return
+        try:
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': NETWORK_HOOK_SCRIPT})
+            self.driver._wait_hook_installed = True
+        except Exception as e:
+            logger.debug(f"[WaitEngine] Network hook unavailable, using readyState and resource timing only: {e}")
+
+    def until(self, condition: Callable[[Any], Any], fixed: float, label: str,
+              timeout: Optional[float] = None) -> Any:
+        """
+        Wait until condition(driver) returns something truthy; replaces time.sleep(fixed).
+        timeout caps the learned timeout (default twice the fixed sleep).
+        Returns the condition's result, or None when the timeout passed first.
+        """
+        key = (self.scraper, label)
+        limit = _timeouts.timeout(key, fixed, timeout)
+        start = time.perf_counter()
+        result = None
+        if self.implicit_wait:
+            self.driver.implicitly_wait(0)
+        try:
+            while True:
+                try:
+                    result = condition(self.driver)
+                except Exception:
+                    result = None
+                if result or time.perf_counter() - start >= limit:
+                    break
+                time.sleep(POLL_INTERVAL)
+        finally:
+            if self.implicit_wait:
+                self.driver.implicitly_wait(self.implicit_wait)
+        elapsed = time.perf_counter() - start
+        met = bool(result)
+        _timeouts.record(key, elapsed, met)
+        if not met:
+            logger.debug(f"[WaitEngine] {self.scraper}/{label} not met after {elapsed:.2f}s")
+        self.waits += 1
+        self.waited += elapsed
+        self.fixed += fixed
+        _wait_stats.record(self.scraper, fixed, elapsed, met)
+        return result if met else None
+
+    def ready(self, fixed: float, label: str, idle_window: float = NETWORK_IDLE_WINDOW,
+              timeout: Optional[float] = None) -> bool:
+        """
+        Document loaded and no network activity (fetch/XHR, new resources) for idle_window seconds.
+        Never waits longer than the fixed sleep it replaces (unless timeout says otherwise).
+        """
+        state = {'last': None, 'since': 0.0}
+
+        def network_idle(driver):
+            ready_state, pending, resources = driver.execute_script(NETWORK_STATE_SCRIPT)
+            now = time.perf_counter()
+            snapshot = (ready_state, pending, resources)
+            if snapshot != state['last']:
+                state['last'], state['since'] = snapshot, now
+                return False
+            return ready_state == 'complete' and pending == 0 and now - state['since'] >= idle_window
+
+        return bool(self.until(network_idle, fixed, label, timeout if timeout is not None else fixed))
+
+    def element(self, by: str, selector: str, fixed: float, label: str, visible: bool = False,
+                timeout: Optional[float] = None):
+        """First element matching the locator (and displayed, if visible is set)"""
+        return self.any_element([(by, selector)], fixed, label, visible, timeout)
+
+    def any_element(self, locators: Iterable[Tuple[str, str]], fixed: float, label: str, visible: bool = False,
+                    timeout: Optional[float] = None):
+        """First element matching any of the locators, checked in order"""
+        locators = list(locators)
+
+        def find(driver):
+            for by, selector in locators:
+                for element in driver.find_elements(by, selector):
+                    if not visible or element.is_displayed():
+                        return element
+            return None
+
+        return self.until(find, fixed, label, timeout)
+
+    def navigation(self, old_element, fixed: float, label: str) -> bool:
+        """After a click that loads a new page: the old element is gone and the new page is idle"""
+        def stale(driver):
+            try:
+                old_element.is_enabled()
+                return False
+            except Exception:
+                return True
+
+        if old_element is not None:
+            self.until(stale, fixed / 2, f"{label}:unload")
+            return self.ready(fixed / 2, label)
+        return self.ready(fixed, label)
+
+    def summary(self) -> str:
+        return (f"{self.waits} waits took {self.waited:.1f}s instead of {self.fixed:.1f}s "
+                f"of fixed sleeps ({self.fixed - self.waited:.1f}s saved)")
+
+
+def get_wait_stats() -> Dict[str, Dict[str, float]]:
+    """Wait time and savings per scraper since startup"""
+    return _wait_stats.get_stats()
+
+
+_timeouts = AdaptiveTimeouts()
+_wait_stats = WaitStats()
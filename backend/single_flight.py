@@ -0,0 +1,78 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers asking for the same key share one in-flight upstream call
+
+Usage:
+    flight = SingleFlight('skinsearch')
+    price = flight.do(api_url, fetch_fn, api_url)
+"""
+
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+_registry: List['SingleFlight'] = []
+_registry_lock = threading.Lock()
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls for the same key"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+        with _registry_lock:
+            _registry.append(self)
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) for key, or wait for the call already in flight for key.
+        Exceptions raised by the leading call are re-raised in every waiting caller.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is None:
+                future = Future()
+                self._in_flight[key] = future
+                self.executed += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            logger.debug(f"[SingleFlight:{self.name}] Waiting on in-flight call for {key}")
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get coalescing counters"""
+        with self._lock:
+            return {
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._in_flight),
+            }
+
+
+def get_single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """Get coalescing counters for every single-flight group in the process"""
+    with _registry_lock:
+        return {flight.name: flight.stats() for flight in _registry}
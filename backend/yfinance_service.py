@@ -9,14 +9,21 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import time
 
+from fx_service import fx_service
+from single_flight import SingleFlight
+from resilience import CircuitOpenError, get_host_guard
+
 logger = logging.getLogger(__name__)
 
+YAHOO_FINANCE_HOST = 'query1.finance.yahoo.com'
+
 class YFinanceService:
     """Service for fetching financial data using yfinance"""
     
     def __init__(self):
         self.cache = {}
         self.cache_timeout = 300  # 5 minutes cache
+        self.flight = SingleFlight('yfinance')
     
     def _get_cache_key(self, symbol: str) -> str:
         """Generate cache key for symbol"""
@@ -54,14 +61,20 @@ class YFinanceService:
         Returns:
             Dictionary with asset information or None if not found
         """
+        cache_key = self._get_cache_key(symbol)
+        cached_data = self._get_from_cache(cache_key)
+        
+        if cached_data:
+            logger.debug(f"Returning cached data for {symbol}")
+            return cached_data
+        
+        # Concurrent requests for the same symbol share one Yahoo Finance lookup
+        return self.flight.do(f"{symbol.upper()}:{asset_type}", self._fetch_asset_info, symbol, asset_type)
+    
+    def _fetch_asset_info(self, symbol: str, asset_type: str) -> Optional[Dict]:
+        """Fetch asset information from Yahoo Finance and cache it"""
         try:
             cache_key = self._get_cache_key(symbol)
-            cached_data = self._get_from_cache(cache_key)
-            
-            if cached_data:
-                logger.debug(f"Returning cached data for {symbol}")
-                return cached_data
-            
             logger.info(f"Fetching data for {symbol} ({asset_type})")
             
             # Handle crypto symbols - ensure they have the right suffix
@@ -69,11 +82,19 @@ class YFinanceService:
                 if not symbol.upper().endswith("-USD"):
                     symbol = f"{symbol.upper()}-USD"
             
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            
-            # Get recent price data
-            hist = ticker.history(period="5d", interval="1d")
+            # yfinance manages its own HTTP session, so guard the calls here
+            guard = get_host_guard(YAHOO_FINANCE_HOST)
+            guard.before_call()
+            try:
+                ticker = yf.Ticker(symbol)
+                info = ticker.info
+                
+                # Get recent price data
+                hist = ticker.history(period="5d", interval="1d")
+            except Exception:
+                guard.record_failure()
+                raise
+            guard.record_success()
             
             if hist.empty:
                 logger.warning(f"No price data found for {symbol}")
@@ -88,54 +109,11 @@ class YFinanceService:
                 if previous_price > 0:
                     change_24h = ((current_price - previous_price) / previous_price) * 100
 
-            import requests
-            def convert_to_eur(price: float, currency: str) -> float:
-                if currency == "EUR":
-                    logger.info(f"No conversion needed for EUR. Price: {price}")
-                    return price
-                if currency == "USD":
-                    logger.info(f"Converting price from USD to EUR. Price: {price}")
-                    try:
-                        resp = requests.get("https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/usd.json", timeout=5)
-                        if resp.ok:
-                            data = resp.json()
-                            eur_rate = data.get("usd", {}).get("eur", None)
-                            if eur_rate:
-                                logger.info(f"Fetched USD/EUR rate: {eur_rate}")
-                                converted = price * float(eur_rate)
-                                logger.info(f"Converted price: {converted}")
-                                return converted
-                            else:
-                                logger.warning("No EUR rate found in response.")
-                        else:
-                            logger.warning(f"Currency API request failed. Status: {resp.status_code}")
-                    except Exception as e:
-                        logger.error(f"Currency conversion failed: {e}")
-                    # Fallback to secondary API
-                    try:
-                        resp2 = requests.get("https://latest.currency-api.pages.dev/v1/currencies/usd.json", timeout=5)
-                        if resp2.ok:
-                            data2 = resp2.json()
-                            eur_rate2 = data2.get("usd", {}).get("eur", None)
-                            if eur_rate2:
-                                logger.info(f"Fetched fallback USD/EUR rate: {eur_rate2}")
-                                converted2 = price * float(eur_rate2)
-                                logger.info(f"Converted price (fallback): {converted2}")
-                                return converted2
-                            else:
-                                logger.warning("No EUR rate found in fallback response.")
-                        else:
-                            logger.warning(f"Fallback currency API request failed. Status: {resp2.status_code}")
-                    except Exception as e2:
-                        logger.error(f"Fallback currency conversion failed: {e2}")
-                    logger.warning(f"Falling back to original USD price (no conversion possible). Currency: {currency}, Price: {price}")
-                    return price  # fallback: no conversion
-                # If not EUR or USD, just return price
-                logger.info(f"Currency {currency} not supported for conversion. Returning original price: {price}")
-                return price
-
             currency = info.get('currency', 'USD')
-            eur_price = convert_to_eur(current_price, currency)
+            eur_price = fx_service.convert(current_price, currency, 'EUR')
+            if eur_price is None:
+                logger.warning(f"Falling back to original price (no conversion possible). Currency: {currency}, Price: {current_price}")
+                eur_price = current_price
             asset_data = {
                 'symbol': symbol.upper(),
                 'name': info.get('longName', info.get('shortName', symbol)),
@@ -176,6 +154,9 @@ class YFinanceService:
             logger.info(f"Successfully fetched data for {symbol}: ${current_price:.2f}")
             return asset_data
             
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping {symbol}: {e}")
+            return None
         except Exception as e:
             logger.error(f"Error fetching data for {symbol}: {e}")
             return None
@@ -69,6 +69,7 @@ export interface SteamItem extends BaseAsset {
   market_hash_name?: string;
   steam_id?: string;
   overpay?: number;
+  market_prices?: Record<string, number>; // Lowest EUR price per market
 }
 
 // Union type for all assets